@@ -1,23 +1,36 @@
 import sys
 import json
 import os
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QLabel, QFileDialog, 
                              QScrollArea, QTabWidget, QSlider, QLineEdit, QTextEdit,
-                             QGridLayout, QFrame, QDialog, QComboBox, QLayout, QSizePolicy,
-                             QCheckBox, QGroupBox)
+                             QGridLayout, QFrame, QComboBox, QLayout, QSizePolicy,
+                             QCheckBox, QMenu, QMessageBox)
 from PyQt6.QtCore import Qt, QPoint, QRect, QTimer, pyqtSignal, QMimeData, QSize
-from PyQt6.QtGui import QPixmap, QPainter, QColor, QFont, QDrag, QPalette, QPen
+from PyQt6.QtGui import QFont, QDrag, QPalette, QShortcut, QKeySequence
 
 # Import config and styles from new location
 from config.settings import config
 
-# Import custom widgets
-from widgets import CardDetailsDialog
+# Dialogs and overlays are imported where they are opened: they stay off the startup path
+# Import core services
+from core import (SessionJournal, FolderWatcher, FolderScanner, FolderSplitter, ScoreStore,
+                  image_memory, image_store, content_hasher, normalize_path, is_image_file,
+                  match_checkpoint, scoring, format_score, normalize_score, CardOrder, SORT_MODES,
+                  SortMetadataReader, PairwiseRanker, UndoHistory, FileIndexBuilder, ContactSheetExporter,
+                  SheetTile, HtmlExporter, tracer, traced)
+from core.image_store import image_key
+from core.perceptual_hash import perceptual_hasher, group_near_duplicates
 
-CRITERIA_LIST = ["beauty", "noErrors", "loras", "Pos prompt", "Neg prompt"]
+# Criteria, weights and value ranges come from settings (renaming criteria needs a restart)
+scoring.configure(config.get('criteria'))
+CRITERIA_LIST = list(scoring.names)
+
+PARKING_MARGIN = 100  # Pooled card shells wait above/left of the grid's visible area
 
 # Get styles dynamically
 def get_styles():
@@ -25,125 +38,6 @@ def get_styles():
     return config.get_styles()
 
 
-class OptionsDialog(QDialog):
-    """Dialog for application options"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle(config.get_text('options_title'))
-        self.setModal(True)
-        self.setMinimumSize(400, 300)
-        
-        layout = QVBoxLayout()
-        
-        # Language selection
-        lang_group = QGroupBox(config.get_text('options_language'))
-        lang_layout = QHBoxLayout()
-        
-        self.lang_fr = QCheckBox("Français")
-        self.lang_en = QCheckBox("English")
-        
-        # Set current language
-        current_lang = config.get('language')
-        if current_lang == 'fr':
-            self.lang_fr.setChecked(True)
-        else:
-            self.lang_en.setChecked(True)
-        
-        # Make them mutually exclusive
-        self.lang_fr.toggled.connect(lambda checked: self.lang_en.setChecked(not checked) if checked else None)
-        self.lang_en.toggled.connect(lambda checked: self.lang_fr.setChecked(not checked) if checked else None)
-        
-        lang_layout.addWidget(self.lang_fr)
-        lang_layout.addWidget(self.lang_en)
-        lang_layout.addStretch()
-        lang_group.setLayout(lang_layout)
-        
-        # Theme selection
-        theme_group = QGroupBox(config.get_text('options_theme'))
-        theme_layout = QHBoxLayout()
-        
-        self.theme_dark = QCheckBox(config.get_text('options_theme_dark'))
-        self.theme_light = QCheckBox(config.get_text('options_theme_light'))
-        
-        # Set current theme
-        try:
-            current_theme = config.get('theme')
-        except:
-            current_theme = 'dark'
-
-        if current_theme == 'dark':
-            self.theme_dark.setChecked(True)
-        else:
-            self.theme_light.setChecked(True)
-
-        # Make them mutually exclusive
-        self.theme_dark.toggled.connect(lambda checked: self.theme_light.setChecked(not checked) if checked else None)
-        self.theme_light.toggled.connect(lambda checked: self.theme_dark.setChecked(not checked) if checked else None)
-        
-        theme_layout.addWidget(self.theme_dark)
-        theme_layout.addWidget(self.theme_light)
-        theme_layout.addStretch()
-        theme_group.setLayout(theme_layout)
-        
-        # Import mode
-        import_group = QGroupBox(config.get_text('options_import_mode'))
-        import_layout = QHBoxLayout()
-        
-        self.import_replace = QCheckBox(config.get_text('options_import_replace'))
-        self.import_add = QCheckBox(config.get_text('options_import_add'))
-        
-        current_mode = config.get('import_mode')
-        if current_mode == 'add':
-            self.import_add.setChecked(True)
-        else:
-            self.import_replace.setChecked(True)
-        
-        # Make them mutually exclusive
-        self.import_replace.toggled.connect(lambda checked: self.import_add.setChecked(not checked) if checked else None)
-        self.import_add.toggled.connect(lambda checked: self.import_replace.setChecked(not checked) if checked else None)
-        
-        import_layout.addWidget(self.import_add)
-        import_layout.addWidget(self.import_replace)
-        import_layout.addStretch()
-        import_group.setLayout(import_layout)
-        
-        # Close button
-        close_btn = QPushButton(config.get_text('options_close'))
-        close_btn.clicked.connect(self.save_and_close)
-        
-        layout.addWidget(lang_group)
-        layout.addWidget(theme_group)
-        layout.addWidget(import_group)
-        layout.addStretch()
-        layout.addWidget(close_btn)
-        
-        self.setLayout(layout)
-    
-    def save_and_close(self):
-        # Save language
-        if self.lang_fr.isChecked():
-            config.set_language('fr')
-        else:
-            config.set_language('en')
-        # Save theme
-        if self.theme_dark.isChecked():
-            config.set_theme('dark')
-        else:
-            config.set_theme('light')
-        # Save import mode
-        if self.import_replace.isChecked():
-            config.set_import_mode('replace')
-        else:
-            config.set_import_mode('add')
-        
-        # Notify parent to refresh UI
-        if isinstance(self.parent(), MainWindow):
-            self.parent().refresh_ui_texts()
-            self.parent().apply_styles()  # Apply new theme styles
-        
-        self.accept()
-
-
 class FlowLayout(QLayout):
     """Layout that arranges widgets in a flow like HTML divs"""
     def __init__(self, parent=None, margin=0, spacing=-1):
@@ -152,6 +46,7 @@ class FlowLayout(QLayout):
             self.setContentsMargins(margin, margin, margin, margin)
         self.setSpacing(spacing)
         self.item_list = []
+        self.cached_hfw = (-1, 0)  # (width, height) of the last heightForWidth() query
 
     def __del__(self):
         item = self.takeAt(0)
@@ -160,6 +55,7 @@ class FlowLayout(QLayout):
 
     def addItem(self, item):
         self.item_list.append(item)
+        self.cached_hfw = (-1, 0)
 
     def count(self):
         return len(self.item_list)
@@ -171,9 +67,14 @@ class FlowLayout(QLayout):
 
     def takeAt(self, index):
         if 0 <= index < len(self.item_list):
+            self.cached_hfw = (-1, 0)
             return self.item_list.pop(index)
         return None
 
+    def invalidate(self):
+        self.cached_hfw = (-1, 0)
+        super().invalidate()
+
     def expandingDirections(self):
         return Qt.Orientation(0)
 
@@ -181,8 +82,10 @@ class FlowLayout(QLayout):
         return True
 
     def heightForWidth(self, width):
-        height = self._do_layout(QRect(0, 0, width, 0), True)
-        return height
+        # Queried for every card on each grid relayout: only lay out again for a new width
+        if self.cached_hfw[0] != width:
+            self.cached_hfw = (width, self._do_layout(QRect(0, 0, width, 0), True))
+        return self.cached_hfw[1]
 
     def setGeometry(self, rect):
         super().setGeometry(rect)
@@ -239,6 +142,7 @@ class ImageCard(QFrame):
         self.source_json = source_json  # Track which JSON file this card came from
         self.criteria = {c: 0 for c in CRITERIA_LIST}
         self.total_score = 0
+        self.score_row = None  # Row of this image in the tab's ScoreStore
         
         self.setFrameStyle(QFrame.Shape.Box)
         self.setLineWidth(2)
@@ -258,6 +162,12 @@ class ImageCard(QFrame):
         # Details popup
         self.details_popup = None
         
+        # Thumbnail accounting for the global pixmap budget
+        self.image_size = 210
+        self.thumbnail_ticket = None  # Reference held on the shared image store
+        self.pixmap_released = False
+        self.border_color = None  # Last border applied, restyling is skipped when unchanged
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -282,7 +192,19 @@ class ImageCard(QFrame):
         self.score_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.update_score_display()
         
+        # Shown when content dedup flags this image as a copy of another card
+        self.duplicate_label = QLabel("⧉")
+        self.duplicate_label.setStyleSheet(get_styles().checkpoint_label())
+        self.duplicate_label.setVisible(False)
+        
+        # Number of near-identical images collapsed behind this card
+        self.similar_label = QLabel()
+        self.similar_label.setStyleSheet(get_styles().checkpoint_label())
+        self.similar_label.setVisible(False)
+        
         top_layout.addWidget(self.close_btn)
+        top_layout.addWidget(self.duplicate_label)
+        top_layout.addWidget(self.similar_label)
         top_layout.addStretch()
         top_layout.addWidget(self.checkpoint_label)
         top_layout.addStretch()
@@ -338,12 +260,50 @@ class ImageCard(QFrame):
         self.setMinimumWidth(max(210, 2 * button_width + 15))
         
     def load_image(self, size):
-        pixmap = QPixmap(self.image_path)
+        """Request the shared thumbnail for this size; it may arrive asynchronously"""
+        self.image_size = size
+        min_size = max(size, 210)
+        previous_ticket = self.thumbnail_ticket
+        self.thumbnail_ticket = image_store.request_thumbnail(self.image_path, min_size, self.set_thumbnail)
+        # The previous thumbnail stays displayed until the new one arrives
+        if previous_ticket is not None:
+            image_store.release(previous_ticket, self.set_thumbnail)
+        if self.image_label.pixmap().isNull():
+            self.image_label.setMinimumSize(min_size, min_size)
+        image_memory.register(self)
+    
+    def set_thumbnail(self, pixmap):
+        """Image store callback once the thumbnail is decoded"""
+        self.image_label.setMinimumSize(0, 0)
         if not pixmap.isNull():
-            min_size = max(size, 210)
-            scaled = pixmap.scaled(min_size, min_size, Qt.AspectRatioMode.KeepAspectRatio, 
-                                  Qt.TransformationMode.SmoothTransformation)
-            self.image_label.setPixmap(scaled)
+            self.image_label.setPixmap(pixmap)
+        self.pixmap_released = False
+    
+    def release_thumbnail(self):
+        if self.thumbnail_ticket is not None:
+            image_store.release(self.thumbnail_ticket, self.set_thumbnail)
+            self.thumbnail_ticket = None
+    
+    def release_pixmaps(self):
+        """Called by the memory manager: drop the thumbnail, keep its size"""
+        pixmap = self.image_label.pixmap()
+        if not pixmap.isNull():
+            self.image_label.setMinimumSize(pixmap.size())
+        self.image_label.clear()
+        self.release_thumbnail()
+        self.pixmap_released = True
+    
+    def release_resources(self):
+        """Drop the image references of a card that is being destroyed"""
+        self.release_thumbnail()
+        image_memory.unregister(self)
+    
+    def ensure_pixmap(self):
+        """Re-fetch the thumbnail after an eviction, or mark it as just displayed"""
+        if self.pixmap_released:
+            self.load_image(self.image_size)
+        else:
+            image_memory.touch(self)
             
     def resize_image(self, size):
         self.load_image(size)
@@ -352,29 +312,49 @@ class ImageCard(QFrame):
         
     def toggle_criterion(self, criterion):
         current = self.criteria[criterion]
-        new_value = (current + 2) % 3 - 1
+        self.set_criterion(criterion, scoring.next_value(criterion, current))
+    
+    def set_criterion(self, criterion, new_value):
+        old_value = self.criteria[criterion]
         self.criteria[criterion] = new_value
         self.update_criterion_button(self.criteria_buttons[criterion], new_value)
         self.calculate_score()
+        grid_tab = self.get_grid_tab()
+        if grid_tab:
+            grid_tab.history.push(('set', self.image_path, criterion, old_value, new_value))
+            grid_tab.score_store.set_value(self.score_row, criterion, new_value)
+            grid_tab.record_session('set', path=self.image_path, criterion=criterion, value=new_value,
+                                    total=self.total_score)
+            grid_tab.reorder_card(self)
         self.positionChanged.emit()
         
     def update_criterion_button(self, btn, value):
+        state = (value > 0) - (value < 0)
+        if btn.property('ratingState') == state:
+            return  # Restyling is costly, skip it when the color doesn't change
+        btn.setProperty('ratingState', state)
         if value == 0:
             btn.setStyleSheet(get_styles().criterion_button_neutral())
-        elif value == 1:
+        elif value > 0:
             btn.setStyleSheet(get_styles().criterion_button_green())
         else:
             btn.setStyleSheet(get_styles().criterion_button_red())
             
     def calculate_score(self):
-        self.total_score = sum(self.criteria.values())
+        self.total_score = scoring.score(self.criteria)
         self.update_score_display()
         
     def update_score_display(self):
-        self.score_label.setText(str(self.total_score))
-        self.score_label.setStyleSheet(get_styles().score_label())
+        self.score_label.setText(format_score(self.total_score))
+        style = get_styles().score_label()
+        if self.score_label.styleSheet() != style:
+            self.score_label.setStyleSheet(style)
         
+    @traced()
     def set_border_color(self, color):
+        if color == self.border_color:
+            return
+        self.border_color = color
         if color == "green":
             self.setStyleSheet(get_styles().card_border_green())
         elif color == "red":
@@ -382,11 +362,31 @@ class ImageCard(QFrame):
         else:
             self.setStyleSheet(get_styles().card_style())
     
+    def set_similar_count(self, count):
+        """Show how many similar images are collapsed behind this card"""
+        self.similar_label.setText(f"+{count}")
+        self.similar_label.setToolTip(f"{count} similar image(s) collapsed")
+        self.similar_label.setVisible(count > 0)
+    
+    def request_perceptual_hash(self, callback):
+        """dHash of this image, computed in the background from the displayed thumbnail"""
+        pixmap = self.image_label.pixmap()
+        source = self.image_path if pixmap.isNull() else pixmap.toImage()
+        perceptual_hasher.request(image_key(self.image_path), source, callback)
+    
+    def set_duplicate_of(self, original):
+        """Flag this card as having the same content as original"""
+        self.duplicate_label.setToolTip(f"Duplicate of {original.image_path}")
+        self.duplicate_label.setVisible(True)
+    
     def delete_card(self):
         grid_tab = self.get_grid_tab()
         if grid_tab:
+            # Back to the card pool; the undo history keeps its data
             grid_tab.remove_card(self)
-        self.deleteLater()
+        else:
+            self.release_resources()
+            self.deleteLater()
             
     def image_clicked(self, event):
         grid_tab = self.get_grid_tab()
@@ -403,7 +403,7 @@ class ImageCard(QFrame):
     
     def is_click_on_image(self, pos):
         """Check if click position is on the image label"""
-        if self.image_label and self.image_label.pixmap():
+        if self.image_label and (self.image_label.pixmap() or self.pixmap_released):
             image_rect = self.image_label.geometry()
             return image_rect.contains(pos)
         return False
@@ -432,6 +432,7 @@ class ImageCard(QFrame):
                 pass
         
         # Create and show new dialog
+        from widgets import CardDetailsDialog
         dialog = CardDetailsDialog(self, self.window())
         grid_tab.active_details_dialog = dialog
         dialog.show_near_card()
@@ -471,6 +472,7 @@ class ImageCard(QFrame):
         if event.mimeData().hasText():
             event.acceptProposedAction()
             self.setStyleSheet("ImageCard { border: 3px solid blue; }")
+            self.border_color = "blue"
             
     def dragLeaveEvent(self, event):
         self.set_border_color(None)
@@ -492,29 +494,153 @@ class ImageCard(QFrame):
             "totalScore": self.total_score
         }
     
+    def get_session_data(self):
+        """Card data as stored in the session journal"""
+        data = self.get_data()
+        if self.source_json:
+            data["sourceJson"] = self.source_json
+        return data
+    
+    @traced()
+    def bind(self, image_path, checkpoint_name, source_json=None, size=210):
+        """Point a pooled card at another image, resetting its ratings and flags"""
+        self.image_path = image_path
+        self.checkpoint_name = checkpoint_name
+        self.source_json = source_json
+        self.checkpoint_label.setText(checkpoint_name)
+        self.criteria = {c: 0 for c in CRITERIA_LIST}
+        for btn in self.criteria_buttons.values():
+            self.update_criterion_button(btn, 0)
+        self.total_score = 0
+        self.update_score_display()
+        self.score_row = None
+        self.details_popup = None
+        self.drag_start_pos = None
+        self.long_press_started = False
+        self.duplicate_label.setVisible(False)
+        self.set_similar_count(0)
+        # The border is left to the tab's next update_borders: most cards keep theirs
+        self.pixmap_released = False
+        if size != self.image_size:
+            self.resize_image(size)
+        else:
+            self.load_image(size)
+    
+    def recycle(self):
+        """Drop the image and connections of a card going back to the pool"""
+        self.release_resources()
+        self.image_label.clear()
+        self.press_timer.stop()
+        try:
+            self.positionChanged.disconnect()
+        except TypeError:
+            pass
+        # Parked out of sight rather than hidden: showing thousands of widgets
+        # again would cost more than binding them
+        self.move(-self.width() - PARKING_MARGIN, -self.height() - PARKING_MARGIN)
+    
+    @traced()
     def apply_styles(self):
         """Apply current theme styles to card widgets"""
         styles = get_styles()
         self.setStyleSheet(styles.card_style())
+        self.border_color = None
         self.close_btn.setStyleSheet(styles.close_button())
         self.checkpoint_label.setStyleSheet(styles.checkpoint_label())
         self.score_label.setStyleSheet(styles.score_label())
         
         # Update all criterion buttons
         for criterion, btn in self.criteria_buttons.items():
+            btn.setProperty('ratingState', None)
             self.update_criterion_button(btn, self.criteria[criterion])
         
         # Update border based on score
         self.set_border_color(None)
 
 
+class CardPool:
+    """
+    Released ImageCard shells waiting to be bound to another image
+    
+    Building a card (buttons, layouts, FlowLayout, font measurement) costs far
+    more than binding a shell to new data. Shells stay children of the grid
+    that released them, so reusing one there needs neither reparenting nor show().
+    """
+    
+    def __init__(self, capacity=2000):
+        self.capacity = capacity
+        self.shells = {}  # Parent widget -> cards released under it
+        self.count = 0
+    
+    def acquire(self, image_path, checkpoint_name, parent, source_json=None, size=210):
+        """A card bound to image_path: a recycled shell when available, else a new card"""
+        shells = self.shells.get(parent)
+        if not shells:
+            # Borrow from another grid (reparenting hides the card until the layout shows it)
+            shells = max(self.shells.values(), key=len, default=None)
+        if shells:
+            card = shells.pop()
+            self.count -= 1
+            if card.parent() is not parent:
+                card.setParent(parent)
+            card.bind(image_path, checkpoint_name, source_json, size)
+            return card
+        card = ImageCard(image_path, checkpoint_name, parent, source_json=source_json)
+        if size != 210:
+            card.resize_image(size)
+        return card
+    
+    def release(self, card):
+        card.recycle()
+        if self.count >= self.capacity:
+            card.deleteLater()
+            return
+        self.shells.setdefault(card.parent(), []).append(card)
+        self.count += 1
+    
+    def forget(self, parent):
+        """Drop the shells of a grid being destroyed (Qt deletes them with it)"""
+        self.count -= len(self.shells.pop(parent, []))
+
+
+# Shared by all tabs, sized from settings at startup
+card_pool = CardPool(config.get('card_pool_size'))
+
+
 class GridTab(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, score_store, parent=None):
         super().__init__(parent)
+        self.score_store = score_store  # Ratings of every tab of the session
         self.cards = []
         self.checkpoints_list = []
         self.card_size = 210
         self.active_details_dialog = None  # Track active card details dialog
+        self.session_id = None  # Identifies this tab in the session journal
+        self.content_hashes = {}  # Content digest -> first card with that content
+        self.duplicate_cards = []  # Content duplicates waiting to be removed
+        self.collapsed_cards = set()  # Near-duplicates hidden behind their group's first card
+        self.similar_generation = 0  # Invalidates pending hash results of older groupings
+        self.dormant_images = None  # Card data of a tab whose widgets are not built
+        self.last_refresh_ms = None  # Duration of the last full grid layout, shown by the perf HUD
+        self.dormant_rows = None  # Score store rows of the dormant images
+        self.folder_watcher = None  # Appends images written into a watched folder
+        self.grid_cols = 0  # Column count of the last grid layout
+        self.grid_cells = {}  # Card / group header -> (row, col, ...) it occupies in the grid layout
+        self.group_headers = {}  # Checkpoint -> section label, in display order
+        self.card_order = CardOrder()  # Sort mode, grouping and key index of self.cards
+        self.sort_reader = None  # Background read of the file dates or seeds the sort mode needs
+        self.pairwise = PairwiseRanker()  # Elo ratings from the A/B votes of this tab
+        self.history = UndoHistory(config.get('undo_limit'))
+        self.folder_scanners = []  # Running background walks of dropped folders
+        self.scan_paths = None  # Normalized paths of the tab while folder scans run
+        self.scan_added = 0
+        self.scan_duplicates = 0
+        self.scan_cancelled = False
+        self.scan_queue = deque()  # Paths found by folder scans, waiting for their cards
+        self.scan_chunk = 16  # Cards built per ingest tick, adapted to the time slice
+        self.scan_tick_end = 0.0  # When the last ingest tick returned to the event loop
+        self.folder_splitter = None  # Running split of a folder into tabs
+        self.relocation = None  # (index builder, JSON path, grid data, missing images) while a folder is indexed
         
         self.setup_ui()
         self.apply_theme()
@@ -541,22 +667,63 @@ class GridTab(QWidget):
         self.load_checkpoints_txt_btn.clicked.connect(self.load_checkpoints_txt)
         
         self.export_btn = QPushButton(config.get_text('btn_export'))
-        self.export_btn.clicked.connect(self.export_grid)
+        export_menu = QMenu(self.export_btn)
+        self.export_actions = {}
+        export_handlers = (
+            ('grid_json', self.export_grid),
+            ('contact_sheet', self.export_contact_sheet),
+            ('html_tab', lambda: self.export_html(all_tabs=False)),
+            ('html_all', lambda: self.export_html(all_tabs=True)),
+        )
+        for key, handler in export_handlers:
+            action = export_menu.addAction(config.get_text(f'export_{key}'))
+            action.triggered.connect(handler)
+            self.export_actions[key] = action
+        self.export_btn.setMenu(export_menu)
+        self.sheet_exporter = None
+        self.html_exporter = None
         
         self.import_btn = QPushButton(config.get_text('btn_import'))
         self.import_btn.clicked.connect(self.import_grid)
         
+        self.watch_btn = QPushButton(config.get_text('btn_watch_folder'))
+        self.watch_btn.setCheckable(True)
+        self.watch_btn.toggled.connect(self.toggle_watch_folder)
+        
+        self.split_btn = QPushButton(config.get_text('btn_split_folder'))
+        split_menu = QMenu(self.split_btn)
+        self.split_actions = {}
+        for key in ('checkpoint', 'seed', 'prompt'):
+            action = split_menu.addAction(config.get_text(f'split_by_{key}'))
+            action.triggered.connect(lambda checked, k=key: self.split_folder(k))
+            self.split_actions[key] = action
+        self.split_btn.setMenu(split_menu)
+        
         self.clear_btn = QPushButton(config.get_text('btn_clear'))
         self.clear_btn.setStyleSheet(get_styles().clear_button())
         self.clear_btn.clicked.connect(self.clear_grid)
         
+        self.leaderboard_btn = QPushButton(config.get_text('btn_leaderboard'))
+        self.leaderboard_btn.clicked.connect(self.open_leaderboard)
+        
+        self.pairwise_btn = QPushButton(config.get_text('btn_pairwise'))
+        self.pairwise_btn.clicked.connect(self.open_pairwise)
+        
+        self.xy_grid_btn = QPushButton(config.get_text('btn_xy_grid'))
+        self.xy_grid_btn.clicked.connect(self.open_xy_grid)
+        
         controls1.addWidget(self.close_tab_btn)
         controls1.addWidget(self.options_btn)
         controls1.addWidget(self.load_checkpoints_btn)
         controls1.addWidget(self.load_checkpoints_txt_btn)
         controls1.addWidget(self.export_btn)
         controls1.addWidget(self.import_btn)
+        controls1.addWidget(self.watch_btn)
+        controls1.addWidget(self.split_btn)
         controls1.addWidget(self.clear_btn)
+        controls1.addWidget(self.leaderboard_btn)
+        controls1.addWidget(self.pairwise_btn)
+        controls1.addWidget(self.xy_grid_btn)
         controls1.addStretch()
         
         # Controls row 2 - Log and Size slider
@@ -569,6 +736,10 @@ class GridTab(QWidget):
         self.log_label.setStyleSheet("color: gray;")
         self.log_label.setMinimumWidth(300)
         
+        self.cancel_scan_btn = QPushButton(config.get_text('btn_cancel_scan'))
+        self.cancel_scan_btn.clicked.connect(self.cancel_folder_scans)
+        self.cancel_scan_btn.hide()
+        
         self.size_label = QLabel(config.get_text('slider_label') + ":")
         
         self.size_slider = QSlider(Qt.Orientation.Horizontal)
@@ -578,9 +749,25 @@ class GridTab(QWidget):
         self.size_slider.setFixedWidth(150)
         self.size_slider.sliderReleased.connect(self.on_slider_released)
         
+        self.collapse_similar_cb = QCheckBox(config.get_text('collapse_similar'))
+        self.collapse_similar_cb.toggled.connect(self.set_collapse_similar)
+        
+        self.sort_label = QLabel(config.get_text('sort_label') + ":")
+        self.sort_combo = QComboBox()
+        for mode in SORT_MODES:
+            self.sort_combo.addItem(config.get_text(f'sort_{mode}'), mode)
+        self.sort_combo.currentIndexChanged.connect(self.on_order_changed)
+        self.group_checkpoint_cb = QCheckBox(config.get_text('group_by_checkpoint'))
+        self.group_checkpoint_cb.toggled.connect(self.on_order_changed)
+        
         controls2.addWidget(log_label)
         controls2.addWidget(self.log_label)
+        controls2.addWidget(self.cancel_scan_btn)
         controls2.addStretch()
+        controls2.addWidget(self.sort_label)
+        controls2.addWidget(self.sort_combo)
+        controls2.addWidget(self.group_checkpoint_cb)
+        controls2.addWidget(self.collapse_similar_cb)
         controls2.addWidget(self.size_label)
         controls2.addWidget(self.size_slider)
         
@@ -598,6 +785,20 @@ class GridTab(QWidget):
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.verticalScrollBar().valueChanged.connect(self.close_active_dialog)
         self.scroll_area.horizontalScrollBar().valueChanged.connect(self.close_active_dialog)
+        
+        # Build the cards of scanned folders in time slices between GUI events
+        self.ingest_timer = QTimer(self)
+        self.ingest_timer.setSingleShot(True)
+        self.ingest_timer.setInterval(0)
+        self.ingest_timer.timeout.connect(self.ingest_scan_queue)
+        
+        # Re-fetch evicted thumbnails once scrolling settles
+        self.visible_pixmaps_timer = QTimer(self)
+        self.visible_pixmaps_timer.setSingleShot(True)
+        self.visible_pixmaps_timer.setInterval(80)
+        self.visible_pixmaps_timer.timeout.connect(self.ensure_visible_pixmaps)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.visible_pixmaps_timer.start)
+        self.scroll_area.horizontalScrollBar().valueChanged.connect(self.visible_pixmaps_timer.start)
         self.scroll_widget = QWidget()
         self.grid_layout = QGridLayout()
         self.grid_layout.setSpacing(10)
@@ -611,11 +812,50 @@ class GridTab(QWidget):
         main_layout.addWidget(self.scroll_area)
         
         self.setLayout(main_layout)
+        
+        for sequence, slot in ((QKeySequence.StandardKey.Undo, self.undo),
+                               (QKeySequence.StandardKey.Redo, self.redo)):
+            shortcut = QShortcut(QKeySequence(sequence), self)
+            shortcut.setContext(Qt.ShortcutContext.WidgetWithChildrenShortcut)
+            shortcut.activated.connect(slot)
     
     def open_options(self):
         """Open options dialog"""
+        from widgets import OptionsDialog
         dialog = OptionsDialog(self.get_main_window())
         dialog.exec()
+    
+    def open_leaderboard(self):
+        main_window = self.get_main_window()
+        if main_window:
+            main_window.show_leaderboard()
+    
+    def open_xy_grid(self):
+        main_window = self.get_main_window()
+        if main_window:
+            main_window.show_xy_grid(self.card_size)
+    
+    def open_pairwise(self):
+        """Vote between pairs of images in fullscreen"""
+        pair = self.pairwise.next_pair(self.cards)
+        if pair is None:
+            self.log(config.get_text('msg_pairwise_need_two'))
+            return
+        from widgets import PairwiseDialog
+        dialog = PairwiseDialog(self, pair)
+        dialog.exec()
+    
+    def record_duel(self, winner, loser):
+        """Count a pairwise vote between two cards of this tab"""
+        self.pairwise.record((winner.image_path, winner.checkpoint_name),
+                             (loser.image_path, loser.checkpoint_name))
+        self.record_session('duel', winner=winner.image_path, loser=loser.image_path)
+    
+    def record_session(self, op, **fields):
+        """Append an edit of this tab to the session journal"""
+        main_window = self.get_main_window()
+        if main_window and self.session_id is not None:
+            main_window.journal.record(op, tab=self.session_id, **fields)
         
     def log(self, message, persistent_callback=None):
         """
@@ -672,13 +912,16 @@ class GridTab(QWidget):
     def drop_zone_drop(self, event):
         files = []
         json_files = []
+        folders = []
         
         for url in event.mimeData().urls():
             file_path = url.toLocalFile()
-            if file_path.lower().endswith(('.png', '.jpg', '.jpeg', '.webp')):
+            if is_image_file(file_path):
                 files.append(file_path)
             elif file_path.lower().endswith('.json'):
                 json_files.append(file_path)
+            elif file_path and os.path.isdir(file_path):
+                folders.append(file_path)
         
         # Handle JSON import first (only one JSON file at a time)
         if json_files:
@@ -686,8 +929,11 @@ class GridTab(QWidget):
                 self.log("⚠️ Multiple JSON files detected. Importing only the first one.")
             self.import_from_file(json_files[0])
         # Then handle images
-        elif files:
-            self.load_images_from_paths(files)
+        else:
+            if files:
+                self.load_images_from_paths(files)
+            if folders:
+                self.scan_folders(folders)
         
         event.acceptProposedAction()
         
@@ -718,6 +964,12 @@ class GridTab(QWidget):
         if tab_widget and tab_widget.count() > 1:
             current_index = tab_widget.indexOf(self)
             if current_index >= 0:
+                self.record_session('untab')
+                self.score_store.remove_tab(self.session_id)
+                self.shutdown()
+                main_window = self.get_main_window()
+                if main_window and self in main_window.recent_tabs:
+                    main_window.recent_tabs.remove(self)
                 tab_widget.removeTab(current_index)
                 self.deleteLater()
         elif tab_widget and tab_widget.count() == 1:
@@ -727,6 +979,16 @@ class GridTab(QWidget):
         if tab_widget and tab_widget.count() == 1:
             tab_widget.setTabText(0, "A")
     
+    def shutdown(self):
+        """Stop the watcher and scans and return the cards to the pool before the tab is removed"""
+        card_pool.forget(self.scroll_widget)
+        self.stop_watching()
+        self.cancel_folder_scans()
+        if self.sort_reader is not None:
+            self.sort_reader.cancel()
+        if self.relocation is not None:
+            self.relocation[0].cancel()
+    
     def load_checkpoints_txt(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Select checkpoints.txt", "", config.get_text('file_filter_txt')
@@ -738,6 +1000,7 @@ class GridTab(QWidget):
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 self.checkpoints_list = [line.strip() for line in f if line.strip()]
+            self.record_session('checkpoints', list=self.checkpoints_list)
             self.log(f"Loaded {len(self.checkpoints_list)} checkpoints from txt")
             self.update_existing_card_names()
         except Exception as e:
@@ -761,31 +1024,31 @@ class GridTab(QWidget):
                 for cp in checkpoints:
                     f.write(cp + '\n')
             self.checkpoints_list = checkpoints
+            self.record_session('checkpoints', list=self.checkpoints_list)
             self.log(f"Loaded {len(checkpoints)} checkpoints, saved to {txt_path}")
             self.update_existing_card_names()
         else:
             self.log("No checkpoints found")
             
     def extract_checkpoint_from_filename(self, filename):
-        if not self.checkpoints_list:
-            return "unknown"
-        for checkpoint in self.checkpoints_list:
-            if checkpoint in filename:
-                return checkpoint
-        return "unknown"
+        return match_checkpoint(filename, self.checkpoints_list)
     
     def update_existing_card_names(self):
         """Update checkpoint names of existing cards after loading checkpoint list"""
-        updated = 0
+        renamed = {}
         for card in self.cards:
             filename = os.path.basename(card.image_path)
             new_checkpoint = self.extract_checkpoint_from_filename(filename)
             if new_checkpoint != card.checkpoint_name:
                 card.checkpoint_name = new_checkpoint
                 card.checkpoint_label.setText(new_checkpoint)
-                updated += 1
-        if updated > 0:
-            self.log(f"Updated {updated} card name(s)")
+                self.score_store.set_checkpoint(card.score_row, new_checkpoint)
+                renamed[card.image_path] = new_checkpoint
+        if renamed:
+            self.record_session('rename', names=renamed)
+            if self.card_order.depends_on_checkpoint:
+                self.sort_cards()
+            self.log(f"Updated {len(renamed)} card name(s)")
         
     def load_images(self):
         files, _ = QFileDialog.getOpenFileNames(
@@ -796,61 +1059,567 @@ class GridTab(QWidget):
         if files:
             self.load_images_from_paths(files)
             
+    def toggle_watch_folder(self, checked):
+        if not checked:
+            self.stop_watching()
+            return
+        folder = QFileDialog.getExistingDirectory(self, config.get_text('dialog_watch_folder'))
+        if folder:
+            self.start_watching(folder)
+        else:
+            self.watch_btn.blockSignals(True)
+            self.watch_btn.setChecked(False)
+            self.watch_btn.blockSignals(False)
+    
+    def start_watching(self, folder):
+        """Load the images of folder, then append new ones as they are written"""
+        self.stop_watching()
+        self.folder_watcher = FolderWatcher(
+            folder,
+            config.get('watch_debounce_ms'),
+            config.get('watch_settle_ms'),
+            self
+        )
+        self.folder_watcher.files_ready.connect(self.on_watched_files)
+        self.folder_watcher.start()
+        self.watch_btn.setToolTip(folder)
+        self.log(f"Watching {folder}")
+    
+    def stop_watching(self):
+        if self.folder_watcher is None:
+            return
+        self.folder_watcher.stop()
+        self.folder_watcher.deleteLater()
+        self.folder_watcher = None
+        self.watch_btn.setToolTip("")
+        if self.watch_btn.isChecked():
+            self.watch_btn.blockSignals(True)
+            self.watch_btn.setChecked(False)
+            self.watch_btn.blockSignals(False)
+    
+    def on_watched_files(self, paths):
+        self.ensure_materialized()
+        self.load_images_from_paths(paths)
+    
+    def scan_folders(self, folders):
+        """Add the images below folders progressively, as a background walk finds them"""
+        if self.scan_paths is None:
+            self.scan_paths = {normalize_path(card.image_path) for card in self.cards}
+            self.scan_added = 0
+            self.scan_duplicates = 0
+            self.scan_cancelled = False
+        scanner = FolderScanner(folders)
+        scanner.batch_found.connect(self.on_scan_batch)
+        scanner.finished.connect(self.on_scan_finished)
+        self.folder_scanners.append(scanner)
+        self.cancel_scan_btn.show()
+        self.show_info_persistent("Scanning...")
+        scanner.start()
+    
+    def split_folder(self, key):
+        """Partition a folder's images into new tabs by checkpoint, seed or prompt"""
+        if self.folder_splitter is not None:
+            self.log("A folder split is already running")
+            return
+        folder = QFileDialog.getExistingDirectory(self, config.get_text('dialog_split_folder'))
+        if not folder:
+            return
+        self.folder_splitter = FolderSplitter(folder, key, self.checkpoints_list, config.get('decode_workers'))
+        self.folder_splitter.progress.connect(self.on_split_progress)
+        self.folder_splitter.finished.connect(self.on_split_finished)
+        self.cancel_scan_btn.show()
+        self.show_info_persistent(f"Reading {folder}...")
+        self.folder_splitter.start()
+    
+    def on_split_progress(self, splitter, count):
+        if splitter is self.folder_splitter:
+            self.show_info_persistent(f"Reading... {count} images")
+    
+    def on_split_finished(self, splitter, groups, cancelled):
+        if splitter is not self.folder_splitter:
+            return
+        self.folder_splitter = None
+        if not self.folder_scanners:
+            self.cancel_scan_btn.hide()
+        if cancelled:
+            self.log("Folder split cancelled")
+            return
+        if not groups:
+            self.log("No images to load")
+            return
+        main_window = self.get_main_window()
+        if main_window:
+            main_window.create_split_tabs(groups, self)
+    
+    def split_images_data(self, images):
+        """Card data of split images, in the journal/export format"""
+        return [{
+            "fileName": os.path.basename(image.path),
+            "absolutePath": image.path,
+            "checkpointName": image.checkpoint,
+            "criteria": {c: 0 for c in CRITERIA_LIST},
+            "totalScore": 0
+        } for image in images]
+    
+    def load_split_images(self, images):
+        """Fill an empty tab with split images; its cards are built on activation"""
+        data = self.split_images_data(images)
+        self.record_session('add', images=data)
+        self.restore_session_images(data)
+    
+    def cancel_folder_scans(self):
+        if self.folder_splitter is not None:
+            self.folder_splitter.cancel()
+        if self.scan_paths is None:
+            return
+        for scanner in self.folder_scanners:
+            scanner.cancel()
+        self.scan_queue.clear()
+        self.scan_cancelled = True
+        if not self.folder_scanners:
+            self.finish_folder_scans()
+    
+    def on_scan_batch(self, scanner, paths):
+        if scanner.is_cancelled() or scanner not in self.folder_scanners:
+            return
+        self.scan_queue.extend(paths)
+        if not self.ingest_timer.isActive():
+            self.ingest_timer.start()
+    
+    def ingest_scan_queue(self):
+        """Build cards for queued scan results for about one time slice, then yield"""
+        if not self.scan_queue:
+            return
+        self.ensure_materialized()
+        chunk = [self.scan_queue.popleft() for _ in range(min(self.scan_chunk, len(self.scan_queue)))]
+        started = time.perf_counter()
+        new_cards, duplicates = self.ingest_paths(chunk, self.scan_paths)
+        elapsed = time.perf_counter() - started
+        # Spend ~30 ms per slice, or as long as the event loop needed to lay out and
+        # paint the previous one: relayout grows with the grid, so chunks grow with it
+        event_loop_time = started - self.scan_tick_end if self.scan_tick_end else 0.0
+        target = max(0.03, min(event_loop_time, 0.5))
+        self.scan_chunk = max(4, min(4096, int(len(chunk) * target / max(elapsed, 0.001))))
+        self.scan_added += len(new_cards)
+        self.scan_duplicates += duplicates
+        
+        self.scan_tick_end = time.perf_counter()
+        if self.scan_queue:
+            self.show_info_persistent(f"Scanning... {self.scan_added} images added")
+            self.ingest_timer.start()
+        elif not self.folder_scanners:
+            self.finish_folder_scans()
+    
+    def on_scan_finished(self, scanner, found, cancelled):
+        if scanner not in self.folder_scanners:
+            return
+        self.folder_scanners.remove(scanner)
+        self.scan_cancelled |= cancelled
+        if not self.folder_scanners and not self.scan_queue:
+            self.finish_folder_scans()
+    
+    def finish_folder_scans(self):
+        self.ingest_timer.stop()
+        self.scan_tick_end = 0.0
+        self.scan_chunk = 16
+        self.cancel_scan_btn.hide()
+        self.scan_paths = None
+        if self.scan_added and self.collapse_similar_cb.isChecked():
+            self.update_similar_groups()
+        
+        status = "Scan cancelled" if self.scan_cancelled else "Scan complete"
+        total_count = len(self.cards)
+        self.log(
+            f"{status}: loaded {self.scan_added} new images, skipped {self.scan_duplicates} duplicate(s)",
+            lambda: self.show_info_persistent(f"{total_count} images")
+        )
+    
     def load_images_from_paths(self, files):
-        # Get existing image paths to avoid duplicates
-        existing_paths = {card.image_path for card in self.cards}
+        new_cards, duplicates = self.ingest_paths(files)
+        new_images = len(new_cards)
+        if new_cards and self.collapse_similar_cb.isChecked():
+            self.update_similar_groups()
         
-        new_images = 0
+        if new_images > 0:
+            total_count = len(self.cards)
+            self.log(
+                f"Loaded {new_images} new images",
+                lambda: self.show_info_persistent(f"{total_count} images")
+            )
+        if duplicates > 0:
+            self.log(f"Skipped {duplicates} duplicate(s)")
+        if new_images == 0 and duplicates == 0:
+            self.log("No images to load")
+    
+    @traced()
+    def ingest_paths(self, files, existing_paths=None):
+        """
+        Append cards for files not loaded yet and lay them out.
+        existing_paths: normalized paths already in the tab, updated in place
+        (computed from the cards if None). Returns (new cards, duplicates skipped).
+        """
+        # Get existing image paths to avoid duplicates (ignoring case and slash differences)
+        if existing_paths is None:
+            existing_paths = {normalize_path(card.image_path) for card in self.cards}
+        
+        new_cards = []
         duplicates = 0
         
         for file_path in files:
             # Skip if image already loaded
-            if file_path in existing_paths:
+            path_key = normalize_path(file_path)
+            if path_key in existing_paths:
                 duplicates += 1
                 continue
+            existing_paths.add(path_key)
                 
             filename = os.path.basename(file_path)
             checkpoint = self.extract_checkpoint_from_filename(filename)
-            card = ImageCard(file_path, checkpoint, self)
-            card.positionChanged.connect(self.update_borders)
+            card = self.new_card(file_path, checkpoint)
             self.cards.append(card)
-            new_images += 1
-            
-        self.refresh_grid()
+            new_cards.append(card)
+        
+        if new_cards:
+            self.register_new_cards(new_cards)
+            self.check_content_duplicates(new_cards)
+            self.append_to_grid(new_cards)
+        return new_cards, duplicates
+        
+    def new_card(self, image_path, checkpoint, source_json=None):
+        """A card for image_path, recycled from the card pool when possible"""
+        # Parented to the grid's widget directly: adding it to the layout then costs no reparenting
+        card = card_pool.acquire(image_path, checkpoint, self.scroll_widget, source_json, self.card_size)
+        card.positionChanged.connect(self.update_borders)
+        return card
+    
+    def card_for_path(self, path):
+        return next((card for card in self.cards if card.image_path == path), None)
+    
+    def register_new_cards(self, cards):
+        """Give new cards their score store rows and journal them"""
+        images = [card.get_session_data() for card in cards]
+        for card, row in zip(cards, self.score_store.add_images(self.session_id, images)):
+            card.score_row = row
+        self.record_session('add', images=images)
+    
+    def check_content_duplicates(self, cards, skippable=True):
+        """Hash the cards' files in the background and skip or flag copies"""
+        if config.get('content_dedup') not in ('skip', 'flag'):
+            return
+        for card in cards:
+            content_hasher.request(
+                card.image_path,
+                lambda digest, card=card, path=card.image_path: self.on_content_hashed(card, digest, skippable, path)
+            )
+    
+    def on_content_hashed(self, card, digest, skippable, path):
+        # Pooled cards may have been rebound to another image meanwhile
+        if digest is None or card not in self.cards or card.image_path != path:
+            return
+        original, original_path = self.content_hashes.get(digest, (None, None))
+        if original is None or original is card or original not in self.cards or original.image_path != original_path:
+            self.content_hashes[digest] = (card, path)
+            return
         
-        if new_images > 0:
+        # Hashes complete out of order: the card loaded first is the original
+        if self.cards.index(card) < self.cards.index(original):
+            card, original = original, card
+            self.content_hashes[digest] = (original, original.image_path)
+        
+        if skippable and config.get('content_dedup') == 'skip':
+            # Batch removals so a burst of duplicates costs a single grid refresh
+            self.duplicate_cards.append(card)
+            if len(self.duplicate_cards) == 1:
+                QTimer.singleShot(100, self.remove_duplicate_cards)
+        else:
+            card.set_duplicate_of(original)
+    
+    def remove_duplicate_cards(self):
+        duplicates = [card for card in self.duplicate_cards if card in self.cards]
+        self.duplicate_cards = []
+        self.score_store.remove([card.score_row for card in duplicates])
+        for card in duplicates:
+            self.cards.remove(card)
+            self.record_session('del', path=card.image_path)
+            card_pool.release(card)
+        if duplicates:
+            self.refresh_grid()
             total_count = len(self.cards)
             self.log(
-                f"Loaded {new_images} new images",
+                f"Skipped {len(duplicates)} duplicate(s) by content",
                 lambda: self.show_info_persistent(f"{total_count} images")
             )
-        if duplicates > 0:
-            self.log(f"Skipped {duplicates} duplicate(s)")
-        if new_images == 0 and duplicates == 0:
-            self.log("No images to load")
+    
+    def set_collapse_similar(self, enabled):
+        if enabled:
+            self.update_similar_groups()
+        else:
+            self.similar_generation += 1
+            self.apply_similar_groups([])
+    
+    @traced()
+    def update_similar_groups(self):
+        """Hash every card in the background, then collapse near-duplicate groups"""
+        self.similar_generation += 1
+        generation = self.similar_generation
+        cards = list(self.cards)
+        hashes = {}
+        
+        def on_hashed(card, path, value):
+            if generation != self.similar_generation:
+                return
+            hashes[card] = value if card.image_path == path else None
+            if len(hashes) == len(cards):
+                self.group_similar_cards(cards, hashes)
+        
+        if not cards:
+            self.apply_similar_groups([])
+            return
+        self.log(f"Hashing {len(cards)} images...")
+        for card in cards:
+            card.request_perceptual_hash(lambda value, card=card, path=card.image_path: on_hashed(card, path, value))
+    
+    def group_similar_cards(self, cards, hashes):
+        hashed = [card for card in cards if hashes.get(card) is not None and card in self.cards]
+        index_groups = group_near_duplicates(
+            [hashes[card] for card in hashed],
+            config.get('similar_max_distance')
+        )
+        position = {card: i for i, card in enumerate(self.cards)}
+        groups = [sorted((hashed[i] for i in group), key=position.get) for group in index_groups]
+        self.apply_similar_groups(groups)
+        
+        collapsed = len(self.collapsed_cards)
+        self.log(
+            f"{len(groups)} group(s) of similar images, {collapsed} collapsed",
+            lambda: self.show_info_persistent(f"{len(self.cards)} images ({collapsed} collapsed)")
+        )
+    
+    def apply_similar_groups(self, groups):
+        """Hide all but the first card of each group and refresh the grid"""
+        for card in self.cards:
+            card.set_similar_count(0)
+        self.collapsed_cards = set()
+        for group in groups:
+            group[0].set_similar_count(len(group) - 1)
+            self.collapsed_cards.update(group[1:])
+        self.refresh_grid()
+    
+    def displayed_cards(self):
+        """Cards shown in the grid, in order (collapsed near-duplicates excluded)"""
+        if not self.collapsed_cards:
+            return self.cards
+        return [card for card in self.cards if card not in self.collapsed_cards]
+    
+    def append_to_grid(self, cards):
+        """Lay out cards just appended to self.cards without rebuilding the grid"""
+        if self.card_order.active:
+            # Sorted/grouped tab: each new card is inserted at its place with one bisect
+            start = len(self.cards) - len(cards)
+            for src, dst in self.card_order.insert_tail(self.cards, len(cards)):
+                self.record_session('move', src=src, dst=dst)
+                start = min(start, dst)
+            self.relayout_cards(start)
+            self.request_sort_values()
+            return
         
+        start = self.grid_layout.count()
+        if self.collapsed_cards or not self.grid_cols or start + len(cards) != len(self.cards):
+            self.refresh_grid()
+            return
+        
+        cols = self.grid_cols
+        for idx, card in enumerate(cards, start):
+            cell = divmod(idx, cols)
+            self.grid_layout.addWidget(card, *cell, Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
+            self.grid_cells[card] = cell
+        
+        self.update_borders()
+        self.visible_pixmaps_timer.start()
+    
+    def grid_positions(self, cards):
+        """
+        (row, col) of each card for the current column count, and the
+        [row, checkpoint, count] of each group header when grouping by checkpoint
+        """
+        cols = self.grid_cols
+        if not self.card_order.group:
+            return [divmod(idx, cols) for idx in range(len(cards))], []
+        positions = []
+        headers = []
+        row = col = 0
+        group = None
+        for card in cards:
+            if not headers or card.checkpoint_name != group:
+                # A group starts on a new row, below its header
+                if col:
+                    row += 1
+                group = card.checkpoint_name
+                headers.append([row, group, 0])
+                row += 1
+                col = 0
+            headers[-1][2] += 1
+            positions.append((row, col))
+            col += 1
+            if col == cols:
+                row += 1
+                col = 0
+        return positions, headers
+    
+    def place_in_grid(self, widget, cell, alignment=Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft):
+        """Put a widget at a cell of the grid unless it is already there"""
+        if self.grid_cells.get(widget) == cell:
+            return
+        if widget in self.grid_cells:
+            self.grid_layout.takeAt(self.grid_layout.indexOf(widget))
+        self.grid_layout.addWidget(widget, *cell, alignment)
+        self.grid_cells[widget] = cell
+    
+    def place_group_headers(self, headers):
+        """Create, move, relabel or delete the section labels of grouped cards"""
+        labels = {}
+        for row, group, count in headers:
+            label = self.group_headers.pop(group, None)
+            if label is None:
+                label = QLabel(self.scroll_widget)
+                label.setStyleSheet("font-weight: bold; font-size: 14px; padding-top: 6px;")
+            text = f"{group} ({count})"
+            if label.text() != text:
+                label.setText(text)
+            self.place_in_grid(label, (row, 0, 1, self.grid_cols), Qt.AlignmentFlag.AlignLeft)
+            labels[group] = label
+        for label in self.group_headers.values():
+            if label in self.grid_cells:
+                self.grid_layout.takeAt(self.grid_layout.indexOf(label))
+                del self.grid_cells[label]
+            label.deleteLater()
+        self.group_headers = labels
+    
+    @traced()
+    def relayout_cards(self, start=0):
+        """
+        Move the cards from index start on to their cells after a sorted insert or move.
+        Only the cards and headers whose cell changed are touched.
+        """
+        if self.collapsed_cards or not self.grid_cols:
+            self.refresh_grid()
+            return
+        positions, headers = self.grid_positions(self.cards)
+        if [group for _row, group, _count in headers] != list(self.group_headers):
+            self.refresh_grid()
+            return
+        for card, cell in zip(self.cards[start:], positions[start:]):
+            self.place_in_grid(card, cell)
+        self.place_group_headers(headers)
+        self.update_borders()
+        self.visible_pixmaps_timer.start()
+    
+    @traced()
     def refresh_grid(self):
+        started = time.perf_counter()
+        # Detach items without reparenting: cards stay children of the scroll widget
         while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            if item.widget():
-                item.widget().setParent(None)
+            self.grid_layout.takeAt(0)
+        self.grid_cells = {}
+        self.card_order.invalidate()
         
         for i in range(self.grid_layout.columnCount()):
             self.grid_layout.setColumnStretch(i, 0)
+        
+        for card in self.collapsed_cards:
+            card.hide()
                 
         actual_card_width = max(210, self.card_size) + 20
         cols = max(1, self.scroll_area.width() // actual_card_width)
-        for idx, card in enumerate(self.cards):
-            row = idx // cols
-            col = idx % cols
-            self.grid_layout.addWidget(card, row, col, Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
-            self.grid_layout.setColumnStretch(col, 0)
+        self.grid_cols = cols
+        cards = self.displayed_cards()
+        positions, headers = self.grid_positions(cards)
+        for card, cell in zip(cards, positions):
+            if card.isHidden():
+                card.show()
+            self.place_in_grid(card, cell)
+        self.place_group_headers(headers)
         
         if cols > 0:
             self.grid_layout.setColumnStretch(cols, 1)
             
         self.update_borders()
+        self.visible_pixmaps_timer.start()
+        self.last_refresh_ms = (time.perf_counter() - started) * 1000.0
+    
+    def on_order_changed(self, *args):
+        self.card_order.set_mode(self.sort_combo.currentData(), self.group_checkpoint_cb.isChecked())
+        self.sort_cards()
+    
+    def set_order(self, mode, group):
+        """Select a sort mode and grouping without reordering the cards"""
+        self.sort_combo.blockSignals(True)
+        self.group_checkpoint_cb.blockSignals(True)
+        self.sort_combo.setCurrentIndex(max(0, self.sort_combo.findData(mode)))
+        self.group_checkpoint_cb.setChecked(group)
+        self.sort_combo.blockSignals(False)
+        self.group_checkpoint_cb.blockSignals(False)
+        self.card_order.set_mode(mode, group)
+    
+    @traced()
+    def sort_cards(self):
+        """Reorder all cards by the current sort mode and grouping, then lay them out"""
+        if self.card_order.active and self.cards:
+            self.request_sort_values()
+            self.card_order.sort(self.cards)
+            self.record_session('order', paths=[card.image_path for card in self.cards])
+        self.refresh_grid()
+    
+    def request_sort_values(self):
+        """Read the file dates or seeds the sort mode still lacks in the background"""
+        if self.sort_reader is not None:
+            return  # Checked again when it finishes
+        paths = self.card_order.missing_paths(self.cards)
+        if not paths:
+            return
+        self.sort_reader = SortMetadataReader(paths, self.card_order.mode, config.get('decode_workers'))
+        self.sort_reader.finished.connect(self.on_sort_values)
+        self.sort_reader.start()
+    
+    def on_sort_values(self, reader, values):
+        if reader is not self.sort_reader:
+            return
+        self.sort_reader = None
+        if values is None:
+            return
+        self.card_order.add_values(reader.mode, values)
+        if reader.mode == self.card_order.mode:
+            self.sort_cards()  # Cards read meanwhile are requested from there
+        else:
+            self.request_sort_values()
+    
+    def reorder_card(self, card):
+        """Move a card whose rating changed to its sorted place"""
+        if not self.card_order.depends_on_score or card not in self.cards:
+            return
+        index = self.cards.index(card)
+        new_index = self.card_order.reposition(self.cards, index)
+        if new_index != index:
+            self.record_session('move', src=index, dst=new_index)
+            self.relayout_cards(min(index, new_index))
+    
+    @traced()
+    def ensure_visible_pixmaps(self):
+        """Reload evicted thumbnails of cards inside the viewport and refresh their LRU rank"""
+        if not self.cards or not self.isVisible():
+            return
+        viewport = self.scroll_area.viewport().rect()
+        viewport.translate(self.scroll_area.horizontalScrollBar().value(),
+                           self.scroll_area.verticalScrollBar().value())
+        for card in self.displayed_cards():
+            if card.geometry().intersects(viewport):
+                card.ensure_pixmap()
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.visible_pixmaps_timer.start()
         
+    @traced()
     def resize_cards(self, size):
         self.card_size = size
         for card in self.cards:
@@ -859,8 +1628,34 @@ class GridTab(QWidget):
     
     def on_slider_released(self):
         size = self.size_slider.value()
+        if size != self.card_size:
+            self.history.push(('resize', self.card_size, size))
         self.resize_cards(size)
         
+    def apply_scores(self, totals, clamped_rows):
+        """
+        Take scores recomputed for the whole score store after a scoring change.
+        Only cards whose values, score or border changed are touched.
+        """
+        if not self.cards:
+            return
+        for card in self.cards:
+            if card.score_row in clamped_rows:
+                for criterion, btn in card.criteria_buttons.items():
+                    value = scoring.clamp(criterion, card.criteria[criterion])
+                    if value != card.criteria[criterion]:
+                        card.criteria[criterion] = value
+                        card.update_criterion_button(btn, value)
+            total = normalize_score(totals[card.score_row])
+            if total != card.total_score:
+                card.total_score = total
+                card.update_score_display()
+        if self.card_order.depends_on_score:
+            self.sort_cards()
+        else:
+            self.update_borders()
+    
+    @traced()
     def update_borders(self):
         if not self.cards:
             return
@@ -878,8 +1673,11 @@ class GridTab(QWidget):
                 card.set_border_color(None)
                 
     def remove_card(self, card):
+        """Take a card out of the grid, keeping it in the undo history"""
+        self.collapsed_cards.discard(card)
         if card in self.cards:
-            self.cards.remove(card)
+            self.history.push(('del', card.get_session_data(), self.cards.index(card)))
+            self.release_cards([card])
         self.refresh_grid()
         # Update persistent info after card removal
         if self.cards:
@@ -898,6 +1696,9 @@ class GridTab(QWidget):
                 target_card = card
                 
         if source_card and target_card:
+            # Moving a card by hand ends automatic ordering
+            if self.card_order.active:
+                self.set_order('manual', False)
             idx_source = self.cards.index(source_card)
             idx_target = self.cards.index(target_card)
             
@@ -909,48 +1710,330 @@ class GridTab(QWidget):
                 insert_pos = idx_target
             
             self.cards.insert(insert_pos, source_card)
+            self.record_session('move', src=idx_source, dst=insert_pos)
+            self.history.push(('move', source_card.image_path, idx_source, insert_pos))
             
             self.refresh_grid()
-            
+    
+    def move_card(self, card, index):
+        """Move a card to index (undo/redo of a drag)"""
+        if card not in self.cards:
+            return
+        if self.card_order.active:
+            self.set_order('manual', False)
+        src = self.cards.index(card)
+        dst = max(0, min(index, len(self.cards) - 1))
+        self.cards.insert(dst, self.cards.pop(src))
+        self.record_session('move', src=src, dst=dst)
+        self.refresh_grid()
+    
+    @traced()
+    def release_cards(self, cards, journal=True):
+        """Remove cards from the tab and hand their widgets back to the card pool"""
+        released = set(cards)
+        self.cards[:] = [card for card in self.cards if card not in released]
+        self.collapsed_cards -= released
+        self.score_store.remove([card.score_row for card in cards])
+        for card in cards:
+            if journal:
+                self.record_session('del', path=card.image_path)
+            card_pool.release(card)
+    
+    @traced()
+    def restore_images(self, images, indices):
+        """Rebuild removed images at their former indices from pooled shells and cached thumbnails"""
+        present = {normalize_path(card.image_path) for card in self.cards}
+        restored = []
+        for img_data, index in sorted(zip(images, indices), key=lambda pair: pair[1]):
+            if normalize_path(img_data["absolutePath"]) in present:
+                continue  # Loaded again since it was removed
+            restored.append((self.create_card_from_data(img_data, img_data.get("sourceJson")), index))
+        if not restored:
+            return
+        self.register_new_cards([card for card, _index in restored])
+        tail = len(self.cards)
+        for card, index in restored:
+            self.cards.insert(min(index, len(self.cards)), card)
+        if len(restored) == 1 and self.cards[-1] is not restored[0][0]:
+            self.record_session('move', src=tail, dst=self.cards.index(restored[0][0]))
+        elif [card for card, _index in restored] != self.cards[tail:]:
+            self.record_session('order', paths=[card.image_path for card in self.cards])
+        if self.card_order.active:
+            self.sort_cards()
+        else:
+            self.refresh_grid()
+        self.show_info_persistent(f"{len(self.cards)} images")
+    
+    def undo(self):
+        command = self.history.undo()
+        if command is None:
+            self.log(config.get_text('msg_nothing_to_undo'))
+            return
+        with self.history.paused():
+            self.apply_command(command, undo=True)
+    
+    def redo(self):
+        command = self.history.redo()
+        if command is None:
+            self.log(config.get_text('msg_nothing_to_redo'))
+            return
+        with self.history.paused():
+            self.apply_command(command, undo=False)
+    
+    def apply_command(self, command, undo):
+        """Revert (undo=True) or replay one command of the undo history"""
+        op = command[0]
+        if op == 'set':
+            _op, path, criterion, old_value, new_value = command
+            card = self.card_for_path(path)
+            if card is not None:
+                card.set_criterion(criterion, old_value if undo else new_value)
+        elif op == 'move':
+            _op, path, src, dst = command
+            card = self.card_for_path(path)
+            if card is not None:
+                self.move_card(card, src if undo else dst)
+        elif op == 'del':
+            _op, img_data, index = command
+            card = self.card_for_path(img_data["absolutePath"])
+            if undo:
+                self.restore_images([img_data], [index])
+            elif card is not None:
+                self.remove_card(card)
+        elif op == 'clear':
+            if undo:
+                self.restore_images(command[1], range(len(command[1])))
+            else:
+                self.clear_grid()
+        elif op == 'import':
+            images = command[1]
+            if undo:
+                paths = {img_data["absolutePath"] for img_data in images}
+                self.release_cards([card for card in self.cards if card.image_path in paths])
+                self.refresh_grid()
+            else:
+                self.restore_images(images, [len(self.cards) + i for i in range(len(images))])
+        elif op == 'resize':
+            size = command[1] if undo else command[2]
+            self.size_slider.setValue(size)
+            self.resize_cards(size)
+    
     def clear_grid(self):
-        for card in self.cards[:]:
-            card.deleteLater()
-        self.cards.clear()
+        self.cancel_folder_scans()
+        cards = list(self.cards)
+        if cards:
+            self.history.push(('clear', [card.get_session_data() for card in cards]))
+        self.release_cards(cards, journal=False)
+        self.collapsed_cards = set()
+        self.pairwise.reset()
+        self.record_session('clear')
         self.refresh_grid()
         # Clear persistent info when clearing grid
         self.log(config.get_text('msg_loaded'))
         
+    def tab_name(self):
+        tab_widget = self.get_tab_widget()
+        tab_index = tab_widget.indexOf(self) if tab_widget else 0
+        return tab_widget.tabText(tab_index) if tab_widget else "A"
+    
+    def export_file_name(self, prefix, extension):
+        """Default export file name: prefix, tab name and timestamp"""
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        return f"{prefix}-{self.tab_name()}_{timestamp}.{extension}"
+    
+    def export_images(self):
+        """Card data of this tab, built or dormant, with current scores"""
+        if self.dormant_images is None:
+            return [card.get_data() for card in self.cards]
+        totals = self.score_store.totals(self.dormant_rows) if self.dormant_images else []
+        return [dict(img_data, totalScore=normalize_score(total)) for img_data, total in zip(self.dormant_images, totals)]
+    
     def export_grid(self):
         if not self.cards:
             self.log(config.get_text('msg_no_images'))
             return
-            
-        tab_widget = self.get_tab_widget()
-        tab_index = tab_widget.indexOf(self) if tab_widget else 0
-        tab_name = tab_widget.tabText(tab_index) if tab_widget else "A"
         
-        data = {
-            "images": [card.get_data() for card in self.cards]
-        }
-        
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        filename = f"grid-{tab_name}_{timestamp}.json"
+        filename = self.export_file_name("grid", "json")
         
         save_path, _ = QFileDialog.getSaveFileName(
             self, config.get_text('dialog_export_title'), filename, config.get_text('file_filter_json')
         )
         
         if save_path:
-            with open(save_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self.write_grid(save_path)
             self.log(config.get_text('msg_exported'))
+    
+    def export_contact_sheet(self):
+        """Render the visible cards, in grid order, to one PNG or JPEG image"""
+        cards = [card for card in self.cards if card not in self.collapsed_cards]
+        if not cards:
+            self.log(config.get_text('msg_no_images'))
+            return
+        if self.sheet_exporter is not None:
+            return  # One sheet at a time per tab
+        
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, config.get_text('dialog_contact_sheet_title'), self.export_file_name("sheet", "png"),
+            config.get_text('file_filter_sheet')
+        )
+        if not save_path:
+            return
+        self.write_contact_sheet(save_path, cards)
+    
+    def write_contact_sheet(self, save_path, cards):
+        """Start rendering cards to save_path in the background"""
+        colors = get_styles().COLORS
+        tiles = [
+            SheetTile(card.image_path, card.checkpoint_name, format_score(card.total_score),
+                      card.border_color if card.border_color in ('green', 'red') else None)
+            for card in cards
+        ]
+        self.sheet_exporter = ContactSheetExporter(save_path, tiles, self.card_size, {
+            'background': colors['bg_dark'],
+            'tile': colors['bg_med'],
+            'border': colors['border_dark'],
+            'text': colors['text_white'],
+            'green': colors['green'],
+            'red': colors['red_btn'],
+        }, config.get('decode_workers'))
+        self.sheet_exporter.progress.connect(self.on_sheet_progress)
+        self.sheet_exporter.finished.connect(self.on_sheet_finished)
+        self.sheet_exporter.start()
+    
+    def export_html(self, all_tabs=False):
+        """Write this tab, or every tab, as a static HTML gallery into a chosen folder"""
+        tab_widget = self.get_tab_widget()
+        tabs = [self]
+        if all_tabs and tab_widget:
+            tabs = [tab_widget.widget(i) for i in range(tab_widget.count())]
+            tabs = [tab for tab in tabs if isinstance(tab, GridTab)]
+        tabs = [(tab.tab_name(), tab.export_images()) for tab in tabs]
+        tabs = [(name, images) for name, images in tabs if images]
+        if not tabs:
+            self.log(config.get_text('msg_no_images'))
+            return
+        if self.html_exporter is not None:
+            return  # One export at a time per tab
+        
+        folder = QFileDialog.getExistingDirectory(self, config.get_text('dialog_html_folder'))
+        if folder:
+            self.write_html(folder, tabs)
+    
+    def write_html(self, folder, tabs):
+        """Start writing the HTML gallery of (tab name, card data) pairs in the background"""
+        colors = get_styles().COLORS
+        self.html_exporter = HtmlExporter(folder, tabs, {
+            'background': colors['bg_dark'],
+            'tile': colors['bg_med'],
+            'border': colors['border_dark'],
+            'text': colors['text_white'],
+            'muted': colors['text_gray'],
+            'link': colors['blue'],
+            'green': colors['green'],
+            'red': colors['red_btn'],
+        }, {
+            'gallery': config.get_text('html_gallery'),
+            'compare': config.get_text('html_compare'),
+            'images': config.get_text('html_images'),
+        }, config.get('decode_workers'))
+        self.html_exporter.progress.connect(self.on_html_progress)
+        self.html_exporter.finished.connect(self.on_html_finished)
+        self.html_exporter.start()
+    
+    def on_html_progress(self, exporter, done, total):
+        if exporter is self.html_exporter:
+            self.log_label.setText(f"{config.get_text('msg_html_progress')}: {done}/{total}")
+    
+    def on_html_finished(self, exporter, error):
+        if exporter is not self.html_exporter:
+            return
+        self.html_exporter = None
+        if error:
+            self.log(f"{config.get_text('msg_html_error')}: {error}")
+        else:
+            self.log(f"{config.get_text('msg_html_exported')}: {exporter.made} + {exporter.reused} thumbnails")
+    
+    def on_sheet_progress(self, exporter, done, total):
+        if exporter is self.sheet_exporter:
+            # Plain label update: log() would queue a clear timer for every row
+            self.log_label.setText(f"{config.get_text('msg_sheet_progress')}: {done}/{total}")
+    
+    def on_sheet_finished(self, exporter, error):
+        if exporter is not self.sheet_exporter:
+            return
+        self.sheet_exporter = None
+        if error:
+            self.log(f"{config.get_text('msg_sheet_error')}: {error}")
+        else:
+            self.log(f"{config.get_text('msg_sheet_exported')}: {os.path.basename(exporter.path)}")
+    
+    @traced()
+    def write_grid(self, save_path):
+        """Write the cards and the scoring setup of this tab to a grid JSON file"""
+        images = []
+        for card in self.cards:
+            image = card.get_data()
+            try:
+                image["fileSize"] = os.path.getsize(card.image_path)  # Tells same-name files apart on relocation
+            except OSError:
+                pass
+            images.append(image)
+        data = {
+            "scoring": scoring.to_settings(),
+            "images": images
+        }
+        with open(save_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
             
+    @traced()
     def import_from_file(self, file_path):
-        """Import grid from a JSON file path"""
+        """Import grid from a JSON file path (once a folder searched for its missing images is indexed)"""
+        if self.relocation is not None:
+            self.relocation[0].cancel()
+            self.relocation = None
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-            
+            missing = [img_data for img_data in data.get("images", []) if not os.path.exists(img_data["absolutePath"])]
+        except Exception as e:
+            self.log(f"Import error: {str(e)}")
+            return
+        
+        root = self.ask_relocation_folder(missing) if missing and config.get('relocate_missing') else None
+        if not root:
+            self.finish_import(file_path, data, missing, [])
+            return
+        # The walk can take long on a large drive: the import resumes in on_relocation_index
+        builder = FileIndexBuilder([root])
+        builder.progress.connect(self.on_relocation_progress)
+        builder.finished.connect(self.on_relocation_index)
+        self.relocation = (builder, file_path, data, missing)
+        self.log_label.setText(f"{config.get_text('relocate_indexing')}...")
+        builder.start()
+    
+    def on_relocation_progress(self, builder, count):
+        if self.relocation is not None and builder is self.relocation[0]:
+            self.log_label.setText(f"{config.get_text('relocate_indexing')}: {count}")
+    
+    def on_relocation_index(self, builder, index):
+        if self.relocation is None or builder is not self.relocation[0]:
+            return
+        _builder, file_path, data, missing = self.relocation
+        self.relocation = None
+        if index is None:
+            return
+        relocated = []
+        for img_data in missing:
+            recorded = img_data["absolutePath"]
+            file_name = img_data.get("fileName") or os.path.basename(recorded.replace('\\', '/'))
+            path = index.resolve(file_name, recorded, img_data.get("fileSize"))
+            if path is not None:
+                relocated.append((img_data, path))
+        self.finish_import(file_path, data, missing, relocated)
+    
+    def finish_import(self, file_path, data, missing, relocated):
+        """Build the cards of an imported grid; relocated: (image data, new path) pairs"""
+        try:
             # Check import mode
             import_mode = config.get('import_mode')
             
@@ -960,35 +2043,44 @@ class GridTab(QWidget):
             # else: add mode - keep existing cards
             
             # Get existing paths to avoid duplicates in add mode
-            existing_paths = {card.image_path for card in self.cards} if import_mode == 'add' else set()
+            existing_paths = {normalize_path(card.image_path) for card in self.cards} if import_mode == 'add' else set()
             
             # Get source JSON filename for tracking
             source_json_name = os.path.basename(file_path)
             
-            added_count = 0
-            missing_count = 0
-            for img_data in data.get("images", []):
-                if os.path.exists(img_data["absolutePath"]):
-                    # Skip duplicates in add mode
-                    if import_mode == 'add' and img_data["absolutePath"] in existing_paths:
-                        continue
-                        
-                    card = ImageCard(
-                        img_data["absolutePath"],
-                        img_data["checkpointName"],
-                        self,
-                        source_json=source_json_name
-                    )
-                    card.criteria = img_data["criteria"]
-                    card.total_score = img_data["totalScore"]
-                    card.calculate_score()
-                    card.positionChanged.connect(self.update_borders)
-                    self.cards.append(card)
-                    added_count += 1
-                else:
-                    missing_count += 1
+            images = data.get("images", [])
+            new_paths = {id(img_data): path for img_data, path in relocated}
+            lost = {id(img_data) for img_data in missing} - new_paths.keys()
+            missing_count = len(lost)
+            
+            new_cards = []
+            for img_data in images:
+                if id(img_data) in lost:
+                    continue
+                if id(img_data) in new_paths:
+                    img_data = dict(img_data, absolutePath=new_paths[id(img_data)])
+                # Skip duplicates in add mode
+                if import_mode == 'add' and normalize_path(img_data["absolutePath"]) in existing_paths:
+                    continue
+                
+                card = self.create_card_from_data(img_data, source_json_name)
+                self.cards.append(card)
+                new_cards.append(card)
+            
+            added_count = len(new_cards)
+            if new_cards:
+                self.register_new_cards(new_cards)
+                # Imported cards carry ratings: flag copies, never drop them
+                self.check_content_duplicates(new_cards, skippable=False)
                     
-            self.refresh_grid()
+            if new_cards:
+                self.history.push(('import', [card.get_session_data() for card in new_cards]))
+            if new_cards and self.card_order.active:
+                self.sort_cards()
+            else:
+                self.refresh_grid()
+            if new_cards and self.collapse_similar_cb.isChecked():
+                self.update_similar_groups()
             
             # Get filename for persistent display
             filename = os.path.basename(file_path)
@@ -999,6 +2091,8 @@ class GridTab(QWidget):
             else:
                 msg = f"{config.get_text('msg_imported')}: {len(self.cards)} images"
             
+            if relocated:
+                msg += f" ({len(relocated)} {config.get_text('relocate_relocated')})"
             if missing_count > 0:
                 msg += f" ({missing_count} missing files skipped)"
             
@@ -1008,9 +2102,94 @@ class GridTab(QWidget):
                 lambda: self.show_info_persistent(f"{filename} - {total_count} images")
             )
             
+            if relocated:
+                self.offer_relocation_write_back(file_path, data, relocated)
+            
         except Exception as e:
             self.log(f"Import error: {str(e)}")
     
+    def ask_relocation_folder(self, missing):
+        """Offer to look for missing images below a folder; returns the folder chosen, or None"""
+        answer = QMessageBox.question(
+            self, config.get_text('relocate_title'),
+            f"{len(missing)} {config.get_text('relocate_missing')}\n{config.get_text('relocate_search')}"
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            return None
+        return QFileDialog.getExistingDirectory(self, config.get_text('relocate_folder')) or None
+    
+    def offer_relocation_write_back(self, file_path, data, relocated):
+        """Ask whether the new paths of relocated images go back into the imported JSON"""
+        answer = QMessageBox.question(
+            self, config.get_text('relocate_title'),
+            f"{len(relocated)} {config.get_text('relocate_found')}\n{config.get_text('relocate_save')}"
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+        for img_data, path in relocated:
+            img_data["absolutePath"] = path
+        # Written next to the original then renamed over it: a failed write leaves it intact
+        tmp_path = file_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, file_path)
+        except OSError as e:
+            self.log(f"Error saving relocated paths: {e}")
+    
+    def create_card_from_data(self, img_data, source_json=None, score_row=None):
+        """Build a card from exported/journaled data, restoring its criteria"""
+        card = self.new_card(img_data["absolutePath"], img_data["checkpointName"], source_json)
+        # Values outside the current ranges are clipped; unknown criteria are kept for export
+        card.criteria = dict(img_data["criteria"])
+        for criterion in CRITERIA_LIST:
+            card.criteria[criterion] = scoring.clamp(criterion, card.criteria.get(criterion, 0))
+        card.total_score = img_data["totalScore"]
+        card.score_row = score_row
+        card.calculate_score()
+        for criterion, btn in card.criteria_buttons.items():
+            card.update_criterion_button(btn, card.criteria.get(criterion, 0))
+        return card
+    
+    def restore_session_images(self, images, duels=()):
+        """Keep session journal data as a stub; cards are built on first activation"""
+        self.pairwise.replay(duels, {img["absolutePath"]: img["checkpointName"] for img in images})
+        self.dormant_images = list(images)
+        self.dormant_rows = self.score_store.add_images(self.session_id, self.dormant_images)
+        if self.dormant_images:
+            self.show_info_persistent(f"{len(self.dormant_images)} images")
+    
+    def is_dormant(self):
+        return self.dormant_images is not None
+    
+    def ensure_materialized(self):
+        """Build the cards, thumbnails and layout of a stub tab"""
+        if self.dormant_images is None:
+            return
+        images, rows = self.dormant_images, self.dormant_rows
+        self.dormant_images = self.dormant_rows = None
+        for img_data, row in zip(images, rows):
+            card = self.create_card_from_data(img_data, img_data.get("sourceJson"), row)
+            self.cards.append(card)
+        self.refresh_grid()
+        if self.cards:
+            self.show_info_persistent(f"{len(self.cards)} images")
+    
+    def dehydrate(self):
+        """Release card widgets and pixmaps, keeping only their data"""
+        if self.dormant_images is not None:
+            return
+        self.close_active_dialog()
+        self.dormant_images = [card.get_session_data() for card in self.cards]
+        self.dormant_rows = [card.score_row for card in self.cards]
+        for card in self.cards:
+            self.grid_layout.removeWidget(card)
+            card_pool.release(card)
+        self.cards.clear()
+        self.collapsed_cards = set()
+        self.place_group_headers([])
+        self.grid_cells = {}
+    
     def import_grid(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self, config.get_text('dialog_import_title'), "", config.get_text('file_filter_json')
@@ -1067,305 +2246,31 @@ class GridTab(QWidget):
         self.load_checkpoints_btn.setText(config.get_text('btn_select_folder'))
         self.export_btn.setText(config.get_text('btn_export'))
         self.import_btn.setText(config.get_text('btn_import'))
+        self.watch_btn.setText(config.get_text('btn_watch_folder'))
+        self.split_btn.setText(config.get_text('btn_split_folder'))
+        for key, action in self.export_actions.items():
+            action.setText(config.get_text(f'export_{key}'))
+        for key, action in self.split_actions.items():
+            action.setText(config.get_text(f'split_by_{key}'))
+        self.cancel_scan_btn.setText(config.get_text('btn_cancel_scan'))
         self.clear_btn.setText(config.get_text('btn_clear'))
+        self.leaderboard_btn.setText(config.get_text('btn_leaderboard'))
+        self.pairwise_btn.setText(config.get_text('btn_pairwise'))
+        self.xy_grid_btn.setText(config.get_text('btn_xy_grid'))
+        self.collapse_similar_cb.setText(config.get_text('collapse_similar'))
+        self.sort_label.setText(config.get_text('sort_label') + ":")
+        for i, mode in enumerate(SORT_MODES):
+            self.sort_combo.setItemText(i, config.get_text(f'sort_{mode}'))
+        self.group_checkpoint_cb.setText(config.get_text('group_by_checkpoint'))
         self.size_label.setText(config.get_text('slider_label') + ":")
         self.drop_zone.setText(config.get_text('drop_zone_text'))
         
     def show_fullscreen_image(self, card):
+        from widgets import FullscreenDialog
         dialog = FullscreenDialog(card, self)
         dialog.exec()
 
 
-class FullscreenDialog(QDialog):
-    def __init__(self, card, grid_tab, parent=None):
-        super().__init__(parent)
-        self.card = card
-        self.grid_tab = grid_tab
-        self.comparison_card = None
-        self.comparison_pixmap = None
-        self.main_pixmap = QPixmap(card.image_path)
-        self.split_position = 0.5
-        self.dragging_split = False
-        self.image_x_offset = 0
-        self.image_width = 0
-        
-        self.current_card_index = 0
-        for i, c in enumerate(grid_tab.cards):
-            if c == card:
-                self.current_card_index = i
-                break
-        
-        self.setWindowTitle("Fullscreen View")
-        self.setModal(True)
-        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
-        self.showFullScreen()
-        
-        self.setStyleSheet(get_styles().fullscreen_background())
-        
-        layout = QVBoxLayout()
-        layout.setContentsMargins(0, 0, 0, 0)
-        
-        # Top controls
-        top_bar = QHBoxLayout()
-        
-        close_btn = QPushButton("✕ ESC")
-        close_btn.setFixedSize(80, 40)
-        close_btn.setStyleSheet(get_styles().fullscreen_close_button())
-        close_btn.clicked.connect(self.close)
-        
-        grid_label = QLabel(config.get_text('fullscreen_compare'))
-        grid_label.setStyleSheet(get_styles().fullscreen_label())
-        
-        self.grid_combo = QComboBox()
-        self.grid_combo.setMinimumHeight(30)
-        self.grid_combo.setStyleSheet(get_styles().fullscreen_combo())
-        
-        main_window = self.get_main_window()
-        current_tab_index = 0
-        if main_window:
-            current_tab_index = main_window.tabs.indexOf(grid_tab)
-            for i in range(main_window.tabs.count()):
-                tab_name = main_window.tabs.tabText(i)
-                if i == current_tab_index:
-                    self.grid_combo.addItem(f"{tab_name} (current)", i)
-                else:
-                    self.grid_combo.addItem(tab_name, i)
-            for idx in range(self.grid_combo.count()):
-                if self.grid_combo.itemData(idx) == current_tab_index:
-                    self.grid_combo.setCurrentIndex(idx)
-                    break
-        else:
-            self.grid_combo.addItem(f"Grid A (current)", 0)
-        
-        top_bar.addWidget(close_btn)
-        top_bar.addStretch()
-        top_bar.addWidget(grid_label)
-        top_bar.addWidget(self.grid_combo)
-        top_bar.addWidget(QLabel("   "))  # Small spacer
-        
-        # Image info labels
-        info_layout = QHBoxLayout()
-        self.info_label = QLabel()
-        self.info_label.setStyleSheet(get_styles().fullscreen_info_selectable())
-        self.info_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
-        
-        self.info_label2 = QLabel()
-        self.info_label2.setStyleSheet(get_styles().fullscreen_info_selectable())
-        self.info_label2.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
-        self.info_label2.setVisible(False)
-        
-        info_layout.addWidget(self.info_label)
-        info_layout.addStretch()
-        info_layout.addWidget(self.info_label2)
-        
-        # Image display
-        self.image_container = QLabel()
-        self.image_container.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.image_container.setStyleSheet(get_styles().image_container())
-        self.image_container.mousePressEvent = self.mouse_press_on_image
-        self.image_container.mouseMoveEvent = self.mouse_move_on_image
-        self.image_container.mouseReleaseEvent = self.mouseReleaseEvent
-        self.image_container.paintEvent = self.paint_image
-        
-        layout.addLayout(top_bar)
-        layout.addWidget(self.image_container, stretch=1)
-        layout.addLayout(info_layout)
-        
-        self.setLayout(layout)
-        self.update_info_label()
-        
-        self.grid_combo.currentIndexChanged.connect(self.on_grid_changed)
-    
-    def paint_image(self, event):
-        if self.main_pixmap.isNull():
-            return
-        
-        painter = QPainter(self.image_container)
-        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-        
-        container_rect = self.image_container.rect()
-        
-        if not self.comparison_pixmap:
-            scaled = self.main_pixmap.scaled(
-                container_rect.size(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            x = (container_rect.width() - scaled.width()) // 2
-            y = (container_rect.height() - scaled.height()) // 2
-            self.image_x_offset = x
-            self.image_width = scaled.width()
-            painter.drawPixmap(x, y, scaled)
-        else:
-            max_width = container_rect.width()
-            max_height = container_rect.height()
-            
-            scaled1 = self.main_pixmap.scaled(
-                max_width, max_height,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            scaled2 = self.comparison_pixmap.scaled(
-                max_width, max_height,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            
-            display_width = min(scaled1.width(), scaled2.width())
-            display_height = min(scaled1.height(), scaled2.height())
-            
-            x = (container_rect.width() - display_width) // 2
-            y = (container_rect.height() - display_height) // 2
-            
-            self.image_x_offset = x
-            self.image_width = display_width
-            
-            split_x = int(x + display_width * self.split_position)
-            
-            left_rect = QRect(0, 0, int(display_width * self.split_position), display_height)
-            painter.drawPixmap(x, y, scaled1, 0, 0, left_rect.width(), display_height)
-            
-            right_width = display_width - left_rect.width()
-            painter.drawPixmap(
-                split_x, y,
-                scaled2,
-                int(scaled2.width() * self.split_position), 0,
-                right_width, display_height
-            )
-            
-            painter.setPen(QPen(QColor(get_styles().COLORS['text_white']), 3))
-            painter.drawLine(split_x, y, split_x, y + display_height)
-            
-            handle_y = y + display_height // 2
-            painter.setBrush(QColor(get_styles().COLORS['blue']))
-            painter.drawEllipse(split_x - 15, handle_y - 15, 30, 30)
-            painter.setPen(QPen(QColor(get_styles().COLORS['text_white']), 2))
-            painter.drawLine(split_x - 8, handle_y, split_x + 8, handle_y)
-        
-        painter.end()
-    
-    def get_main_window(self):
-        widget = self.grid_tab
-        while widget:
-            if isinstance(widget, MainWindow):
-                return widget
-            widget = widget.parent()
-        return None
-    
-    def on_grid_changed(self, index):
-        main_window = self.get_main_window()
-        if not main_window:
-            return
-        
-        selected_tab_index = self.grid_combo.itemData(index)
-        if selected_tab_index is None:
-            return
-            
-        selected_tab = main_window.tabs.widget(selected_tab_index)
-        current_tab_index = main_window.tabs.indexOf(self.grid_tab)
-        
-        if selected_tab_index == current_tab_index or not selected_tab or not hasattr(selected_tab, 'cards'):
-            self.info_label2.setVisible(False)
-            self.comparison_card = None
-            self.comparison_pixmap = None
-            self.image_container.update()
-        else:
-            cards = selected_tab.cards
-            if cards:
-                self.comparison_card = cards[0]
-                
-                pixmap2 = QPixmap(self.comparison_card.image_path)
-                if not pixmap2.isNull():
-                    self.comparison_pixmap = pixmap2
-                
-                self.info_label2.setVisible(True)
-                self.update_info_label()
-                self.split_position = 0.5
-                self.image_container.update()
-    
-    def mouse_press_on_image(self, event):
-        if self.comparison_pixmap:
-            self.dragging_split = True
-            self.update_split_from_mouse(event.pos().x())
-    
-    def mouse_move_on_image(self, event):
-        if self.comparison_pixmap and (self.dragging_split or event.buttons() & Qt.MouseButton.LeftButton):
-            self.dragging_split = True
-            self.update_split_from_mouse(event.pos().x())
-    
-    def update_split_from_mouse(self, mouse_x):
-        if self.image_width > 0:
-            relative_x = mouse_x - self.image_x_offset
-            self.split_position = max(0.0, min(1.0, relative_x / self.image_width))
-            self.image_container.update()
-    
-    def mouseReleaseEvent(self, event):
-        self.dragging_split = False
-    
-    def update_info_label(self):
-        info1 = f"{self.card.checkpoint_name} - {os.path.basename(self.card.image_path)}"
-        self.info_label.setText(info1)
-        
-        if self.comparison_card:
-            info2 = f"{self.comparison_card.checkpoint_name} - {os.path.basename(self.comparison_card.image_path)}"
-            self.info_label2.setText(info2)
-    
-    def show_previous_image(self):
-        if self.current_card_index > 0:
-            self.current_card_index -= 1
-            self.load_card_at_index(self.current_card_index)
-            if self.comparison_card:
-                self.load_comparison_at_index(self.current_card_index)
-    
-    def show_next_image(self):
-        if self.current_card_index < len(self.grid_tab.cards) - 1:
-            self.current_card_index += 1
-            self.load_card_at_index(self.current_card_index)
-            if self.comparison_card:
-                self.load_comparison_at_index(self.current_card_index)
-    
-    def load_card_at_index(self, index):
-        if 0 <= index < len(self.grid_tab.cards):
-            self.card = self.grid_tab.cards[index]
-            
-            pixmap = QPixmap(self.card.image_path)
-            if not pixmap.isNull():
-                self.main_pixmap = pixmap
-                self.image_container.update()
-            
-            self.update_info_label()
-    
-    def load_comparison_at_index(self, index):
-        main_window = self.get_main_window()
-        if not main_window:
-            return
-        
-        selected_index = self.grid_combo.currentIndex()
-        selected_tab_index = self.grid_combo.itemData(selected_index)
-        if selected_tab_index is None:
-            return
-        
-        selected_tab = main_window.tabs.widget(selected_tab_index)
-        if selected_tab and hasattr(selected_tab, 'cards') and selected_tab.cards:
-            comp_index = min(index, len(selected_tab.cards) - 1)
-            self.comparison_card = selected_tab.cards[comp_index]
-            
-            pixmap2 = QPixmap(self.comparison_card.image_path)
-            if not pixmap2.isNull():
-                self.comparison_pixmap = pixmap2
-                self.image_container.update()
-            
-            self.update_info_label()
-        
-    def keyPressEvent(self, event):
-        if event.key() == Qt.Key.Key_Escape:
-            self.close()
-        elif event.key() == Qt.Key.Key_Left:
-            self.show_previous_image()
-        elif event.key() == Qt.Key.Key_Right:
-            self.show_next_image()
-
-
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -1382,6 +2287,8 @@ class MainWindow(QMainWindow):
         
         self.tabs = QTabWidget()
         self.tabs.setTabsClosable(False)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        self.recent_tabs = []  # Most recently activated tabs, newest last
         
         tab_bar = self.tabs.tabBar()
         
@@ -1410,29 +2317,212 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.tabs)
         central.setLayout(layout)
         
-        self.add_tab()
+        self.applied_performance = None  # (budget MB, decode workers, hash workers)
+        self.apply_performance_settings()
+        
+        # Opt-in instrumentation, also toggled with Ctrl+Shift+T
+        if config.get('trace'):
+            tracer.start(config.get('stall_threshold_ms'))
+        trace_shortcut = QShortcut(QKeySequence("Ctrl+Shift+T"), self)
+        trace_shortcut.activated.connect(self.toggle_trace)
+        
+        # Live performance counters, built the first time Ctrl+Shift+H is pressed
+        self.perf_hud = None
+        hud_shortcut = QShortcut(QKeySequence("Ctrl+Shift+H"), self)
+        hud_shortcut.activated.connect(self.toggle_perf_hud)
+        
+        # Ratings of every image of the session, for cross-tab statistics
+        self.score_store = ScoreStore(scoring)
+        self.leaderboard_dialog = None
+        self.xy_grid_dialog = None
+        
+        # Session autosave: the tabs are restored right after the first paint
+        self.journal = SessionJournal()
+        self.next_tab_id = 0
+        self.startup_done = False
+        self.startup_scheduled = False
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.startup_scheduled:
+            # The empty window is on screen: build the tabs in the next event loop pass
+            self.startup_scheduled = True
+            QTimer.singleShot(0, self.finish_startup)
+    
+    def finish_startup(self):
+        """Restore the previous session's tabs (or open an empty one) and start journaling"""
+        if config.get('restore_session'):
+            self.restore_session(self.journal.restore())
+        else:
+            self.journal.discard()
+        self.journal.start()
+        
+        if self.tabs.count() == 0:
+            self.add_tab()
+        if config.get('perf_hud'):
+            self.toggle_perf_hud()
+        self.startup_done = True
     
     def add_tab(self):
-        tab_count = self.tabs.count()
-        if tab_count >= 26:
+        grid_tab = self.new_letter_tab()
+        if grid_tab is None:
             return
-            
-        letter = chr(65 + tab_count)
-        grid_tab = GridTab()
-        tab_index = self.tabs.addTab(grid_tab, letter)
         
-        self.tabs.setCurrentIndex(tab_index)
+        self.tabs.setCurrentIndex(self.tabs.indexOf(grid_tab))
         
         if self.tabs.count() == 1:
             self.tabs.setTabText(0, "A")
+    
+    def new_letter_tab(self):
+        """Append a tab named after the next letter and journal it (None past Z)"""
+        tab_count = self.tabs.count()
+        if tab_count >= 26:
+            return None
+        
+        letter = chr(65 + tab_count)
+        grid_tab = self.create_tab(letter)
+        self.journal.record('tab', tab=grid_tab.session_id, name=letter)
+        return grid_tab
+    
+    def create_split_tabs(self, groups, origin):
+        """One tab per (key, images) group; the origin tab is reused if it is empty"""
+        reuse = origin if not origin.cards and not origin.dormant_images else None
+        free = 26 - self.tabs.count() + (1 if reuse else 0)
+        if free <= 0:
+            origin.log("No free tab left (A-Z)")
+            return
+        if len(groups) > free:
+            # Not enough letters: the smallest groups share the last tab
+            largest = set(sorted(range(len(groups)), key=lambda i: -len(groups[i][1]))[:free - 1])
+            overflow = [group for i, group in enumerate(groups) if i not in largest]
+            merged = sorted((image for _, images in overflow for image in images), key=lambda image: image.sort_key())
+            groups = [group for i, group in enumerate(groups) if i in largest] + [(f"{len(overflow)} others", merged)]
+        
+        first_tab = None
+        for key, images in groups:
+            if reuse is not None:
+                tab, reuse = reuse, None
+            else:
+                tab = self.new_letter_tab()
+            if origin.checkpoints_list and tab is not origin:
+                tab.checkpoints_list = list(origin.checkpoints_list)
+                tab.record_session('checkpoints', list=tab.checkpoints_list)
+            tab.load_split_images(images)
+            self.tabs.setTabToolTip(self.tabs.indexOf(tab), f"{key} ({len(images)})")
+            first_tab = first_tab or tab
+        
+        self.tabs.setCurrentIndex(self.tabs.indexOf(first_tab))
+        first_tab.ensure_materialized()
+        total = sum(len(images) for _, images in groups)
+        first_tab.log(f"Split {total} images into {len(groups)} tab(s)")
+    
+    def create_tab(self, name, session_id=None):
+        """Create a GridTab with a session id and append it to the tab bar"""
+        if session_id is None:
+            session_id = self.next_tab_id
+        self.next_tab_id = max(self.next_tab_id, session_id + 1)
+        
+        grid_tab = GridTab(self.score_store)
+        grid_tab.session_id = session_id
+        self.tabs.addTab(grid_tab, name)
+        return grid_tab
+    
+    def restore_session(self, state):
+        """Rebuild all tabs from the journal's snapshot + tail"""
+        with self.journal.paused():
+            for tab_data in state.tabs[:26]:
+                grid_tab = self.create_tab(tab_data['name'], tab_data['id'])
+                grid_tab.checkpoints_list = list(tab_data['checkpoints'])
+                # Copy the dicts: the journal writer thread keeps mutating its own
+                images = [dict(img, criteria=dict(img['criteria'])) for img in tab_data['images']]
+                grid_tab.restore_session_images(images, [list(duel) for duel in tab_data.get('duels', [])])
+        if self.tabs.count():
+            self.tabs.setCurrentIndex(0)
+            self.on_tab_changed(0)
+    
+    def on_tab_changed(self, index):
+        """Materialize the activated tab and dehydrate the least recently visited ones"""
+        tab = self.tabs.widget(index)
+        if not isinstance(tab, GridTab):
+            return
+        tab.ensure_materialized()
+        
+        if tab in self.recent_tabs:
+            self.recent_tabs.remove(tab)
+        self.recent_tabs.append(tab)
+        
+        live_limit = config.get('live_tabs_limit')
+        while len(self.recent_tabs) > live_limit:
+            stale = self.recent_tabs.pop(0)
+            if self.tabs.indexOf(stale) >= 0:
+                stale.dehydrate()
             
     def remove_all_tabs(self):
+        # Don't materialize the tabs being removed as they become current
+        self.tabs.blockSignals(True)
         while self.tabs.count() > 0:
             widget = self.tabs.widget(0)
             self.tabs.removeTab(0)
+            widget.shutdown()
             widget.deleteLater()
+        self.tabs.blockSignals(False)
+        self.recent_tabs.clear()
+        self.score_store.clear()
+        self.journal.record('reset')
         self.add_tab()
     
+    def apply_performance_settings(self):
+        """Apply memory budget, worker counts and card pool size (pools are only rebuilt on change)"""
+        budget_mb, decode_workers, hash_workers = (
+            config.get('pixmap_budget_mb'), config.get('decode_workers'), config.get('hash_workers')
+        )
+        applied = self.applied_performance
+        image_memory.set_budget(budget_mb * 1024 * 1024)
+        if applied is None or applied[1] != decode_workers:
+            image_store.set_workers(decode_workers)
+        if applied is None or applied[2] != hash_workers:
+            content_hasher.set_workers(hash_workers)
+            perceptual_hasher.set_workers(hash_workers)
+        card_pool.capacity = config.get('card_pool_size')
+        self.applied_performance = (budget_mb, decode_workers, hash_workers)
+
+    def apply_scoring(self):
+        """Reload criteria weights/ranges from settings and rescore every tab in one pass"""
+        scoring.configure([
+            dict(criterion, name=name) for name, criterion in zip(CRITERIA_LIST, config.get('criteria'))
+        ])
+        clamped_rows = set(self.score_store.clamp_values().tolist())
+        totals = self.score_store.totals()
+        self.score_store.version += 1
+        for i in range(self.tabs.count()):
+            tab = self.tabs.widget(i)
+            if isinstance(tab, GridTab):
+                tab.apply_scores(totals, clamped_rows)
+    
+    def show_leaderboard(self):
+        """Open (or raise) the cross-tab checkpoint leaderboard"""
+        if self.leaderboard_dialog is None:
+            from widgets import LeaderboardDialog
+            self.leaderboard_dialog = LeaderboardDialog(self.score_store, self, self)
+            self.leaderboard_dialog.destroyed.connect(self.on_leaderboard_closed)
+        self.leaderboard_dialog.show()
+        self.leaderboard_dialog.raise_()
+    
+    def on_leaderboard_closed(self):
+        self.leaderboard_dialog = None
+    
+    def show_xy_grid(self, thumb_size):
+        """Open (or raise) the checkpoint x prompt/seed matrix builder"""
+        if self.xy_grid_dialog is None:
+            from widgets import XYGridDialog
+            self.xy_grid_dialog = XYGridDialog(self, thumb_size, self)
+            self.xy_grid_dialog.destroyed.connect(self.on_xy_grid_closed)
+        self.xy_grid_dialog.show()
+        self.xy_grid_dialog.raise_()
+    
+    def on_xy_grid_closed(self):
+        self.xy_grid_dialog = None
+    
     def refresh_ui_texts(self):
         """Refresh all UI texts after language change"""
         self.setWindowTitle(config.get_text('window_title'))
@@ -1449,6 +2539,8 @@ class MainWindow(QMainWindow):
         self.setStyleSheet(get_styles().main_window())
         self.add_tab_btn.setStyleSheet(get_styles().add_tab_button())
         self.remove_all_btn.setStyleSheet(get_styles().remove_tab_button())
+        if self.perf_hud is not None:
+            self.perf_hud.apply_styles()
         
         # Apply styles to all tabs
         for i in range(self.tabs.count()):
@@ -1472,6 +2564,37 @@ class MainWindow(QMainWindow):
         """Reposition popups when window is resized"""
         super().resizeEvent(event)
         self.reposition_all_dialogs()
+        if self.perf_hud is not None and self.perf_hud.isVisible():
+            self.perf_hud.reposition()
+    
+    def toggle_perf_hud(self):
+        if self.perf_hud is None:
+            from widgets import PerfHud
+            self.perf_hud = PerfHud(self)
+        self.perf_hud.toggle()
+    
+    def toggle_trace(self):
+        """Start tracing, or stop it and save the Chrome trace"""
+        if tracer.enabled:
+            tracer.stop()
+            message = f"Trace saved to {tracer.export()} ({tracer.stalls} stall(s))"
+        else:
+            tracer.start(config.get('stall_threshold_ms'))
+            message = "Tracing started (Ctrl+Shift+T to stop and save)"
+        grid_tab = self.tabs.currentWidget()
+        if grid_tab:
+            grid_tab.log(message)
+    
+    def closeEvent(self, event):
+        """Flush and compact the session journal before quitting"""
+        if tracer.enabled:
+            tracer.stop()
+            tracer.export()
+        self.journal.close()
+        image_store.shutdown()
+        content_hasher.shutdown()
+        perceptual_hasher.shutdown()
+        super().closeEvent(event)
 
 
 def main():
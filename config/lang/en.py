@@ -15,6 +15,20 @@ LANG = {
     'options_import_add': 'Add',
     'options_theme_dark': 'Dark',
     'options_theme_light': 'Light',
+    'options_dedup': "Duplicate images (same content)",
+    'options_dedup_off': 'Off',
+    'options_dedup_skip': 'Skip',
+    'options_dedup_flag': 'Flag',
+    'options_scoring': 'Scoring',
+    'options_criterion': 'Criterion',
+    'options_weight': 'Weight',
+    'options_min': 'Min',
+    'options_max': 'Max',
+    'options_performance': 'Performance',
+    'options_pixmap_budget': 'Thumbnail memory (MB)',
+    'options_decode_workers': 'Decoding threads',
+    'options_hash_workers': 'Hashing threads',
+    'options_card_pool': 'Recycled cards kept',
     'options_close': 'Close',
     
     # Main interface buttons
@@ -29,6 +43,103 @@ LANG = {
     # Drop zone
     'drop_zone_text': 'Drag and drop images here or click to select',
     
+    # Folder watch
+    'btn_watch_folder': '👁 Watch Folder',
+    'btn_cancel_scan': "Cancel scan",
+    'dialog_watch_folder': 'Select folder to watch',
+    
+    # Folder split
+    'btn_split_folder': '✂ Split Folder',
+    'split_by_checkpoint': 'By checkpoint',
+    'split_by_seed': 'By seed',
+    'split_by_prompt': 'By prompt',
+    'dialog_split_folder': 'Select folder to split into tabs',
+    
+    # Leaderboard
+    'btn_leaderboard': '🏆 Leaderboard',
+    'leaderboard_title': 'Checkpoint leaderboard',
+    'leaderboard_scope_all': 'All tabs',
+    'leaderboard_scope_tab': 'Current tab',
+    'leaderboard_checkpoint': 'Checkpoint',
+    'leaderboard_images': 'Images',
+    'leaderboard_rated': 'Rated',
+    'leaderboard_mean': 'Mean score',
+    
+    # Undo / redo
+    'msg_nothing_to_undo': 'Nothing to undo',
+    'msg_nothing_to_redo': 'Nothing to redo',
+    
+    # Pairwise voting
+    'btn_pairwise': 'A/B vote',
+    'pairwise_title': 'Pairwise vote',
+    'pairwise_votes': 'Votes',
+    'pairwise_hint': '←/A: A wins · →/B: B wins · Space: skip',
+    'msg_pairwise_need_two': 'Add at least two images to vote',
+    
+    # Sorting and grouping
+    'sort_label': 'Sort',
+    'sort_manual': 'Manual',
+    'sort_score_desc': 'Score (best first)',
+    'sort_score_asc': 'Score (worst first)',
+    'sort_checkpoint': 'Checkpoint',
+    'sort_filename': 'File name',
+    'sort_mtime': 'Date modified',
+    'sort_seed': 'Seed',
+    'group_by_checkpoint': 'Group by checkpoint',
+    
+    # Performance HUD
+    'hud_decode_queue': 'Decode queue',
+    'hud_cache_hits': 'Image cache hits',
+    'hud_pixmaps': 'Pixmaps',
+    'hud_prefetch': 'Fullscreen prefetch hits',
+    'hud_lag': 'Event loop lag',
+    'hud_cards': 'cards',
+    'hud_dormant': 'dormant',
+    'hud_refresh': 'layout',
+    
+    # Missing file relocation
+    'relocate_title': 'Missing files',
+    'relocate_missing': 'images of this grid were not found.',
+    'relocate_search': 'Search a folder where they were moved?',
+    'relocate_folder': 'Select the folder containing the moved images',
+    'relocate_found': 'images were found in another folder.',
+    'relocate_save': 'Save their new paths to the grid file?',
+    'relocate_relocated': 'relocated',
+    'relocate_indexing': 'Indexing the folder',
+    
+    # Export menu
+    'export_grid_json': 'Grid (JSON)',
+    'export_contact_sheet': 'Contact sheet (PNG/JPEG)',
+    'dialog_contact_sheet_title': 'Export Contact Sheet',
+    'file_filter_sheet': 'PNG image (*.png);;JPEG image (*.jpg *.jpeg)',
+    'msg_sheet_progress': 'Rendering contact sheet',
+    'msg_sheet_exported': 'Contact sheet exported',
+    'msg_sheet_error': 'Contact sheet error',
+    'export_html_tab': 'HTML gallery (this tab)',
+    'export_html_all': 'HTML gallery (all tabs)',
+    'dialog_html_folder': 'Select the folder for the HTML gallery',
+    'html_gallery': 'Gallery',
+    'html_compare': 'Side-by-side comparison',
+    'html_images': 'images',
+    'msg_html_progress': 'Generating thumbnails',
+    'msg_html_exported': 'HTML gallery exported',
+    'msg_html_error': 'HTML export error',
+    
+    # XY grid
+    'btn_xy_grid': '▦ XY Grid',
+    'xy_title': 'XY Grid - Checkpoint × Prompt',
+    'xy_build': 'Build',
+    'xy_export': 'Export image',
+    'xy_reading': 'Reading generation parameters',
+    'xy_rows': 'prompts',
+    'xy_columns': 'checkpoints',
+    'xy_rendering': 'Rendering matrix',
+    'xy_exported': 'Matrix exported',
+    'xy_export_error': 'Matrix export error',
+    
+    # Near-duplicate grouping
+    'collapse_similar': 'Collapse similar',
+    
     # Image size slider
     'slider_label': 'Image Size',
     
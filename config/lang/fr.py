@@ -15,6 +15,20 @@ LANG = {
     'options_import_replace': 'Remplacer',
     'options_theme_dark': 'Sombre',
     'options_theme_light': 'Clair',
+    'options_dedup': "Images en double (même contenu)",
+    'options_dedup_off': 'Désactivé',
+    'options_dedup_skip': 'Ignorer',
+    'options_dedup_flag': 'Signaler',
+    'options_scoring': 'Notation',
+    'options_criterion': 'Critère',
+    'options_weight': 'Poids',
+    'options_min': 'Min',
+    'options_max': 'Max',
+    'options_performance': 'Performances',
+    'options_pixmap_budget': 'Mémoire des miniatures (Mo)',
+    'options_decode_workers': 'Threads de décodage',
+    'options_hash_workers': 'Threads de hachage',
+    'options_card_pool': 'Cartes recyclées conservées',
     'options_close': 'Fermer',
     
     # Main interface buttons
@@ -29,6 +43,103 @@ LANG = {
     # Drop zone
     'drop_zone_text': 'Glisser-déposer des images ici ou cliquer pour sélectionner',
     
+    # Folder watch
+    'btn_watch_folder': '👁 Surveiller un dossier',
+    'btn_cancel_scan': "Annuler l'analyse",
+    'dialog_watch_folder': 'Sélectionner le dossier à surveiller',
+    
+    # Folder split
+    'btn_split_folder': '✂ Répartir un dossier',
+    'split_by_checkpoint': 'Par checkpoint',
+    'split_by_seed': 'Par seed',
+    'split_by_prompt': 'Par prompt',
+    'dialog_split_folder': 'Sélectionner le dossier à répartir en onglets',
+    
+    # Leaderboard
+    'btn_leaderboard': '🏆 Classement',
+    'leaderboard_title': 'Classement des checkpoints',
+    'leaderboard_scope_all': 'Tous les onglets',
+    'leaderboard_scope_tab': 'Onglet actuel',
+    'leaderboard_checkpoint': 'Checkpoint',
+    'leaderboard_images': 'Images',
+    'leaderboard_rated': 'Notées',
+    'leaderboard_mean': 'Score moyen',
+    
+    # Undo / redo
+    'msg_nothing_to_undo': 'Rien à annuler',
+    'msg_nothing_to_redo': 'Rien à rétablir',
+    
+    # Pairwise voting
+    'btn_pairwise': 'Vote A/B',
+    'pairwise_title': 'Vote par paires',
+    'pairwise_votes': 'Votes',
+    'pairwise_hint': '←/A : A gagne · →/B : B gagne · Espace : passer',
+    'msg_pairwise_need_two': 'Ajoutez au moins deux images pour voter',
+    
+    # Sorting and grouping
+    'sort_label': 'Tri',
+    'sort_manual': 'Manuel',
+    'sort_score_desc': "Score (meilleur d'abord)",
+    'sort_score_asc': "Score (pire d'abord)",
+    'sort_checkpoint': 'Checkpoint',
+    'sort_filename': 'Nom de fichier',
+    'sort_mtime': 'Date de modification',
+    'sort_seed': 'Seed',
+    'group_by_checkpoint': 'Grouper par checkpoint',
+    
+    # Performance HUD
+    'hud_decode_queue': 'File de décodage',
+    'hud_cache_hits': 'Succès du cache images',
+    'hud_pixmaps': 'Pixmaps',
+    'hud_prefetch': 'Préchargements plein écran utilisés',
+    'hud_lag': "Retard de la boucle d'événements",
+    'hud_cards': 'cartes',
+    'hud_dormant': 'en veille',
+    'hud_refresh': 'mise en page',
+    
+    # Missing file relocation
+    'relocate_title': 'Fichiers manquants',
+    'relocate_missing': 'images de cette grille sont introuvables.',
+    'relocate_search': 'Les chercher dans un dossier où elles ont été déplacées ?',
+    'relocate_folder': 'Sélectionnez le dossier contenant les images déplacées',
+    'relocate_found': 'images ont été retrouvées dans un autre dossier.',
+    'relocate_save': 'Enregistrer leurs nouveaux chemins dans le fichier de la grille ?',
+    'relocate_relocated': 'relocalisées',
+    'relocate_indexing': 'Indexation du dossier',
+    
+    # Export menu
+    'export_grid_json': 'Grille (JSON)',
+    'export_contact_sheet': 'Planche contact (PNG/JPEG)',
+    'dialog_contact_sheet_title': 'Exporter la planche contact',
+    'file_filter_sheet': 'Image PNG (*.png);;Image JPEG (*.jpg *.jpeg)',
+    'msg_sheet_progress': 'Rendu de la planche contact',
+    'msg_sheet_exported': 'Planche contact exportée',
+    'msg_sheet_error': 'Erreur de planche contact',
+    'export_html_tab': 'Galerie HTML (cet onglet)',
+    'export_html_all': 'Galerie HTML (tous les onglets)',
+    'dialog_html_folder': 'Sélectionnez le dossier de la galerie HTML',
+    'html_gallery': 'Galerie',
+    'html_compare': 'Comparaison côte à côte',
+    'html_images': 'images',
+    'msg_html_progress': 'Génération des miniatures',
+    'msg_html_exported': 'Galerie HTML exportée',
+    'msg_html_error': "Erreur d'export HTML",
+    
+    # XY grid
+    'btn_xy_grid': '▦ Grille XY',
+    'xy_title': 'Grille XY - Checkpoint × Prompt',
+    'xy_build': 'Construire',
+    'xy_export': "Exporter l'image",
+    'xy_reading': 'Lecture des paramètres de génération',
+    'xy_rows': 'prompts',
+    'xy_columns': 'checkpoints',
+    'xy_rendering': 'Rendu de la matrice',
+    'xy_exported': 'Matrice exportée',
+    'xy_export_error': "Erreur d'export de la matrice",
+    
+    # Near-duplicate grouping
+    'collapse_similar': 'Regrouper les similaires',
+    
     # Image size slider
     'slider_label': 'Taille des images',
     
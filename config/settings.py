@@ -2,8 +2,14 @@
 # CONFIGURATION MANAGER
 # ============================================================================
 
+import atexit
+import copy
 import json
+import math
 import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 # Default settings
@@ -11,39 +17,200 @@ DEFAULT_SETTINGS = {
     'language': 'fr',  # 'fr' or 'en'
     'theme': 'dark',   # 'dark' or 'light' (light not implemented yet)
     'import_mode': 'replace',  # 'add' or 'replace' (not implemented yet)
+    'restore_session': True,  # Reopen the tabs of the last session on startup
+    'live_tabs_limit': 3,  # Tabs kept materialized; older ones are dehydrated to stubs
+    'pixmap_budget_mb': 1024,  # Memory budget for all thumbnails and fullscreen pixmaps
+    'decode_workers': 4,  # Threads decoding thumbnails in the background
+    'content_dedup': 'off',  # 'off', 'skip' or 'flag' images whose file content is already loaded
+    'hash_workers': 2,  # Threads hashing file contents / perceptual hashes
+    'relocate_missing': True,  # Offer to search a folder for the missing images of an imported grid
+    'similar_max_distance': 6,  # Max dHash bit difference for "collapse similar" (0: identical hashes only)
+    'watch_debounce_ms': 500,  # Delay after the last change of a watched folder before rescanning it
+    'watch_settle_ms': 1000,  # Poll interval while new files of a watched folder are being written
+    'undo_limit': 200,  # Grid edits kept per tab for undo (Ctrl+Z / Ctrl+Y)
+    'card_pool_size': 2000,  # Released card widgets kept for reuse instead of being rebuilt (0: no reuse)
+    'trace': False,  # Record timed spans and GUI stalls from startup (Ctrl+Shift+T toggles it)
+    'stall_threshold_ms': 100,  # GUI thread blocked longer than this is recorded as a stall
+    'perf_hud': False,  # Show the live performance counters at startup (Ctrl+Shift+H toggles them)
+    'criteria': [  # Rating criteria: name, score weight and value range (names apply after restart)
+        {'name': 'beauty', 'weight': 1.0, 'min': -1, 'max': 1},
+        {'name': 'noErrors', 'weight': 1.0, 'min': -1, 'max': 1},
+        {'name': 'loras', 'weight': 1.0, 'min': -1, 'max': 1},
+        {'name': 'Pos prompt', 'weight': 1.0, 'min': -1, 'max': 1},
+        {'name': 'Neg prompt', 'weight': 1.0, 'min': -1, 'max': 1},
+    ],
+}
+
+CRITERION_VALUE_LIMIT = 9  # Criterion values are stored as int8 (see core.scoring.VALUE_LIMIT)
+
+
+def validate_criteria(criteria):
+    """Raise ValueError unless criteria is a list of distinct, well-formed criterion definitions"""
+    if not criteria:
+        raise ValueError("criteria must not be empty")
+    names = set()
+    for criterion in criteria:
+        if isinstance(criterion, str):
+            criterion = {'name': criterion}  # Older settings only listed names
+        if not isinstance(criterion, dict):
+            raise ValueError(f"criterion must be a name or an object, got {criterion!r}")
+        name = criterion.get('name')
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError(f"criterion name must be a non-empty string, got {name!r}")
+        if name in names:
+            raise ValueError(f"criterion {name!r} is defined twice")
+        names.add(name)
+        weight = criterion.get('weight', 1.0)
+        if not isinstance(weight, (int, float)) or isinstance(weight, bool) or not math.isfinite(weight):
+            raise ValueError(f"weight of {name!r} must be a number, got {weight!r}")
+        for field, low, high in (('min', -CRITERION_VALUE_LIMIT, 0), ('max', 0, CRITERION_VALUE_LIMIT)):
+            value = criterion.get(field, -1 if field == 'min' else 1)
+            if not isinstance(value, int) or isinstance(value, bool) or not low <= value <= high:
+                raise ValueError(f"{field} of {name!r} must be an integer between {low} and {high}, got {value!r}")
+
+
+# Accepted values: key -> (type, allowed values, (min, max) range or item validator)
+SETTINGS_SCHEMA = {
+    'language': (str, ('fr', 'en')),
+    'theme': (str, ('dark', 'light')),
+    'import_mode': (str, ('add', 'replace')),
+    'restore_session': (bool, None),
+    'live_tabs_limit': (int, (1, 100)),
+    'pixmap_budget_mb': (int, (64, 65536)),
+    'decode_workers': (int, (1, 64)),
+    'content_dedup': (str, ('off', 'skip', 'flag')),
+    'hash_workers': (int, (1, 64)),
+    'relocate_missing': (bool, None),
+    'similar_max_distance': (int, (0, 64)),
+    'watch_debounce_ms': (int, (50, 60000)),
+    'watch_settle_ms': (int, (100, 60000)),
+    'undo_limit': (int, (1, 100000)),
+    'card_pool_size': (int, (0, 100000)),
+    'trace': (bool, None),
+    'stall_threshold_ms': (int, (1, 60000)),
+    'perf_hud': (bool, None),
+    'criteria': (list, validate_criteria),
 }
 
 # Path to settings file
 SETTINGS_PATH = Path(__file__).parent / 'settings.json'
 
+SAVE_DELAY_S = 0.5  # Changes made within this delay are written together
+
+
+def validate_setting(key, value):
+    """Return value if it fits the schema of key, raise ValueError otherwise"""
+    if key not in SETTINGS_SCHEMA:
+        return value  # Unknown keys (from newer versions) are kept as they are
+    kind, allowed = SETTINGS_SCHEMA[key]
+    if kind is int and isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise ValueError(f"{key} must be of type {kind.__name__}, got {value!r}")
+    if callable(allowed):
+        allowed(value)
+    elif isinstance(allowed, tuple) and kind is int:
+        low, high = allowed
+        if not low <= value <= high:
+            raise ValueError(f"{key} must be between {low} and {high}, got {value}")
+    elif allowed is not None and value not in allowed:
+        raise ValueError(f"{key} must be one of {', '.join(allowed)}, got {value!r}")
+    return value
+
 
 class Config:
     def __init__(self):
-        self.settings = DEFAULT_SETTINGS.copy()
+        self.settings = copy.deepcopy(DEFAULT_SETTINGS)
         self.lang = None
+        self.lock = threading.RLock()  # Guards settings and save state
+        self.write_lock = threading.RLock()  # One writer at a time
+        self.batch_depth = 0
+        self.dirty = False
+        self.save_timer = None
         self.load_settings()
         self.load_language()
+        atexit.register(self.flush)
     
     def load_settings(self):
-        """Load settings from JSON file or create with defaults"""
+        """Load settings from JSON file (defaults are only written on the first change)"""
         if SETTINGS_PATH.exists():
             try:
                 with open(SETTINGS_PATH, 'r', encoding='utf-8') as f:
                     loaded = json.load(f)
-                    self.settings.update(loaded)
             except Exception as e:
                 print(f"Error loading settings: {e}")
                 print("Using default settings")
-        else:
-            self.save_settings()
+                return
+            for key, value in loaded.items():
+                try:
+                    self.settings[key] = validate_setting(key, value)
+                except ValueError as e:
+                    print(f"Ignoring invalid setting: {e}")
     
     def save_settings(self):
-        """Save current settings to JSON file"""
+        """Write current settings to JSON file atomically (temp file + rename)"""
+        with self.write_lock:
+            with self.lock:
+                self.dirty = False
+                data = json.dumps(self.settings, indent=4, ensure_ascii=False)
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(prefix='settings.', suffix='.tmp', dir=SETTINGS_PATH.parent)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, SETTINGS_PATH)
+            except Exception as e:
+                print(f"Error saving settings: {e}")
+                if tmp_path is not None and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+    
+    def schedule_save(self):
+        """Write settings in the background once no change happened for SAVE_DELAY_S"""
+        with self.lock:
+            self.dirty = True
+            if self.batch_depth:
+                return  # Written once when the outermost batch ends
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+            self.save_timer = threading.Timer(SAVE_DELAY_S, self.flush)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+    
+    def flush(self):
+        """Write pending changes now (called on exit and by the save timer)"""
+        with self.write_lock:
+            with self.lock:
+                if self.save_timer is not None:
+                    self.save_timer.cancel()
+                    self.save_timer = None
+                if not self.dirty:
+                    return
+            self.save_settings()
+    
+    @contextmanager
+    def batch(self):
+        """Group several changes into a single settings write"""
+        with self.lock:
+            self.batch_depth += 1
         try:
-            with open(SETTINGS_PATH, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error saving settings: {e}")
+            yield self
+        finally:
+            with self.lock:
+                self.batch_depth -= 1
+                pending = self.dirty and not self.batch_depth
+            if pending:
+                self.schedule_save()
+    
+    def set(self, key, value):
+        """Validate and change a setting; the file is written shortly after"""
+        value = validate_setting(key, value)
+        with self.lock:
+            if self.settings.get(key) == value:
+                return
+            self.settings[key] = value
+        self.schedule_save()
     
     def load_language(self):
         """Load language strings based on current language setting"""
@@ -63,19 +230,24 @@ class Config:
     
     def set_language(self, lang_code):
         """Change language and reload strings"""
-        self.settings['language'] = lang_code
-        self.save_settings()
+        self.set('language', lang_code)
         self.load_language()
     
     def set_theme(self, theme):
         """Set theme (dark/light)"""
-        self.settings['theme'] = theme
-        self.save_settings()
+        self.set('theme', theme)
     
     def set_import_mode(self, mode):
         """Set import mode (add/replace)"""
-        self.settings['import_mode'] = mode
-        self.save_settings()
+        self.set('import_mode', mode)
+    
+    def set_content_dedup(self, mode):
+        """Set content duplicate detection (off/skip/flag)"""
+        self.set('content_dedup', mode)
+    
+    def set_criteria(self, criteria):
+        """Set rating criteria definitions (name, weight, min, max)"""
+        self.set('criteria', criteria)
     
     def get(self, key):
         """Get a setting value"""
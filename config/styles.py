@@ -314,3 +314,6 @@ def options_button():
             background: {COLORS['border_dark']};
         }}
     """
+
+def perf_hud():
+    return f"background: rgba(0, 0, 0, 190); color: {COLORS['green']}; font-family: monospace; font-size: 11px; padding: 6px; border-radius: 4px;"
@@ -0,0 +1,31 @@
+"""
+Core services for Checkpoints Gallery (persistence, caches, background work)
+"""
+
+from .session_journal import SessionJournal
+from .image_memory import ImageMemoryManager, image_memory, pixmap_nbytes
+from .image_store import ImageStore, image_store
+from .content_hash import ContentHasher, content_hasher, normalize_path
+from .folder_watch import FolderWatcher, IMAGE_EXTENSIONS, is_image_file
+from .folder_scan import FolderScanner
+from .file_index import FileIndex, FileIndexBuilder
+from .folder_split import FolderSplitter, SPLIT_KEYS, match_checkpoint
+from .score_store import ScoreStore
+from .scoring import ScoringEngine, scoring, format_score, normalize_score
+from .card_order import CardOrder, SortMetadataReader, SORT_MODES
+from .pairwise import PairwiseRanker, EloTable
+from .undo_history import UndoHistory
+from .contact_sheet import ContactSheetExporter, SheetTile
+from .html_export import HtmlExporter
+from .xy_grid import XYMatrix, XYMatrixBuilder, XYSheetExporter
+from .trace import Tracer, tracer, traced
+
+__all__ = ['SessionJournal', 'ImageMemoryManager', 'image_memory', 'pixmap_nbytes',
+           'ImageStore', 'image_store', 'ContentHasher', 'content_hasher', 'normalize_path',
+           'FolderWatcher', 'IMAGE_EXTENSIONS', 'is_image_file', 'FolderScanner', 'FileIndex', 'FileIndexBuilder',
+           'FolderSplitter', 'SPLIT_KEYS', 'match_checkpoint', 'ScoreStore',
+           'ScoringEngine', 'scoring', 'format_score', 'normalize_score',
+           'CardOrder', 'SortMetadataReader', 'SORT_MODES', 'PairwiseRanker', 'EloTable', 'UndoHistory',
+           'ContactSheetExporter', 'SheetTile', 'HtmlExporter',
+           'XYMatrix', 'XYMatrixBuilder', 'XYSheetExporter',
+           'Tracer', 'tracer', 'traced']
@@ -0,0 +1,202 @@
+"""
+Card Order - Sort and group keys for the cards of a tab
+
+The key of every card is computed once and kept in a list parallel to the
+tab's card list. A card whose key changed (a new rating) or a new card is
+moved to its place with one bisect, so keeping a large tab sorted never needs
+a full resort. Ties keep their current order (stable insertion).
+
+Keys are also cached per card and only recomputed for cards whose path,
+score or checkpoint changed. File dates and seeds are never read on the GUI
+thread: SortMetadataReader fetches the missing ones in a thread pool, and
+until they arrive those cards sort last.
+"""
+
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .png_metadata import read_generation_info
+
+SORT_MODES = ('manual', 'score_desc', 'score_asc', 'checkpoint', 'filename', 'mtime', 'seed')
+
+SCORE_MODES = ('score_desc', 'score_asc')
+
+UNKNOWN = "unknown"
+
+METADATA_MODES = ('mtime', 'seed')  # Modes whose keys need file reads
+
+
+def read_sort_value(path, mode):
+    """Modification time or seed of one image (None when unavailable)"""
+    if mode == 'mtime':
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+    return read_generation_info(path).get('seed')
+
+
+class SortMetadataReader(QObject):
+    """Reads the file dates or seeds of some images on a worker thread"""
+
+    finished = pyqtSignal(object, object)  # Reader, {path: value} or None if cancelled (emitted from the worker)
+
+    def __init__(self, paths, mode, workers=4):
+        super().__init__()
+        self.paths = list(paths)
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.cancel_event = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name='SortMetadata', daemon=True).start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _run(self):
+        values = {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='SortMetadataRead') as pool:
+            for path, value in zip(self.paths, pool.map(lambda path: read_sort_value(path, self.mode), self.paths)):
+                if self.cancel_event.is_set():
+                    break
+                values[path] = value
+        self.finished.emit(self, None if self.cancel_event.is_set() else values)
+
+
+class CardOrder:
+    """Sort mode, optional grouping by checkpoint and the key index of one tab"""
+
+    def __init__(self):
+        self.mode = 'manual'
+        self.group = False
+        self.keys = []  # Key of each card, parallel to the tab's card list
+        self.valid = False
+        self.card_keys = {}  # card -> (path, score, checkpoint, key) it was computed from
+        self.values = {'mtime': {}, 'seed': {}}  # path -> modification time / seed (or None), read once
+
+    @property
+    def active(self):
+        return self.mode != 'manual' or self.group
+
+    @property
+    def depends_on_score(self):
+        return self.mode in SCORE_MODES
+
+    @property
+    def depends_on_checkpoint(self):
+        return self.group or self.mode == 'checkpoint'
+
+    def set_mode(self, mode, group):
+        self.mode = mode if mode in SORT_MODES else 'manual'
+        self.group = group
+        self.valid = False
+        self.card_keys.clear()
+
+    def invalidate(self):
+        """Forget the positions of the key index (cached per-card keys are kept)"""
+        self.valid = False
+
+    def missing_paths(self, cards):
+        """Paths whose date or seed the current mode needs and that were not read yet"""
+        if self.mode not in METADATA_MODES:
+            return []
+        values = self.values[self.mode]
+        return list(dict.fromkeys(card.image_path for card in cards if card.image_path not in values))
+
+    def add_values(self, mode, values):
+        """Store values read by a SortMetadataReader and drop the keys computed without them"""
+        self.values[mode].update(values)
+        if mode == self.mode:
+            for card, cached in list(self.card_keys.items()):
+                if cached[0] in values:
+                    del self.card_keys[card]
+            self.valid = False
+
+    def key(self, card):
+        """Key of a card, recomputed only when its path, score or checkpoint changed"""
+        cached = self.card_keys.get(card)
+        if (cached is not None and cached[0] == card.image_path and cached[1] == card.total_score
+                and cached[2] == card.checkpoint_name):
+            return cached[3]
+        key = self.compute_key(card)
+        self.card_keys[card] = (card.image_path, card.total_score, card.checkpoint_name, key)
+        return key
+
+    def compute_key(self, card):
+        if self.group:
+            name = card.checkpoint_name
+            key = (name == UNKNOWN, name.lower(), name)
+        else:
+            key = ()
+        mode = self.mode
+        if mode == 'score_desc':
+            return key + (-card.total_score,)
+        if mode == 'score_asc':
+            return key + (card.total_score,)
+        if mode == 'checkpoint':
+            return key + (card.checkpoint_name.lower(),)
+        if mode == 'filename':
+            return key + (os.path.basename(card.image_path).lower(),)
+        if mode in METADATA_MODES:
+            # Not read yet or unavailable: last
+            value = self.values[mode].get(card.image_path)
+            return key + ((value is None, value or 0),)
+        return key
+
+    def sync(self, cards):
+        if not self.valid or len(self.keys) != len(cards):
+            self.keys = [self.key(card) for card in cards]
+            self.valid = True
+            if len(self.card_keys) > len(cards):
+                # Cards that left the tab
+                present = set(cards)
+                self.card_keys = {card: cached for card, cached in self.card_keys.items() if card in present}
+
+    def sort(self, cards):
+        """Sort cards in place (stable) and rebuild the key index"""
+        keyed = sorted(zip((self.key(card) for card in cards), range(len(cards))), key=lambda pair: pair[0])
+        cards[:] = [cards[i] for _key, i in keyed]
+        self.keys = [key for key, _i in keyed]
+        self.valid = True
+
+    def insert_tail(self, cards, count):
+        """
+        Move the last count cards (just appended) to their sorted places
+        Returns the (source, destination) index of every move, in order.
+        """
+        start = len(cards) - count
+        self.sync(cards[:start])
+        moves = []
+        for src in range(start, len(cards)):
+            card = cards[src]
+            key = self.key(card)
+            dst = bisect_right(self.keys, key)
+            self.keys.insert(dst, key)
+            if dst != src:
+                cards.insert(dst, cards.pop(src))
+                moves.append((src, dst))
+        return moves
+
+    def reposition(self, cards, index):
+        """Move the card at index after its key changed; returns its new index"""
+        self.sync(cards)
+        key = self.key(cards[index])
+        keys = self.keys
+        if (index == 0 or keys[index - 1] <= key) and (index == len(keys) - 1 or key <= keys[index + 1]):
+            keys[index] = key
+            return index
+        card = cards.pop(index)
+        del keys[index]
+        # Land first among equal keys when moving up, last when moving down
+        if index < len(keys) and key > keys[index]:
+            dst = bisect_right(keys, key)
+        else:
+            dst = bisect_left(keys, key)
+        keys.insert(dst, key)
+        cards.insert(dst, card)
+        return dst
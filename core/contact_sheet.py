@@ -0,0 +1,241 @@
+"""
+Contact Sheet - A tab rendered as one large PNG or JPEG
+
+Tiles (thumbnail, checkpoint name, score, best/worst border) are painted a
+row at a time on worker threads and handed to the encoder in grid order as
+soon as they are ready, with only a few rows in flight. PNG is written by a
+streaming encoder: each row is filtered, deflated into IDAT chunks and
+dropped, so a sheet of thousands of cards never exists in memory as a whole.
+JPEG has no streaming encoder here: its canvas is built in full and limited
+to JPEG_MAX_SIDE pixels a side and JPEG_MAX_PIXELS in total.
+"""
+
+import math
+import os
+import struct
+import threading
+import zlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PyQt6.QtCore import QObject, QRect, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QImage, QPainter, QPen
+
+from .image_store import decode_image
+
+PAD = 8  # Around the thumbnail inside a tile
+GAP = 12  # Between tiles and around the sheet
+TEXT_HEIGHT = 40  # Checkpoint name and score below the thumbnail
+BORDER = 2
+HIGHLIGHT_BORDER = 5  # Best and worst tiles
+JPEG_MAX_SIDE = 65500
+JPEG_MAX_PIXELS = 200_000_000  # The JPEG canvas is held in memory whole (3 bytes per pixel)
+JPEG_QUALITY = 90
+PNG_CHUNK = 256 * 1024  # Compressed bytes per IDAT chunk
+
+# One card of the sheet; border is None, 'green' (best) or 'red' (worst)
+SheetTile = namedtuple('SheetTile', 'path name score border')
+
+
+class SheetGeometry:
+    """Tile and sheet sizes for count tiles of thumbnails fitting size x size"""
+
+    def __init__(self, count, size, columns=None):
+        self.size = size
+        self.tile_width = size + 2 * PAD
+        self.tile_height = size + 2 * PAD + TEXT_HEIGHT
+        # Default to a roughly square sheet
+        self.columns = columns or max(1, math.ceil(math.sqrt(count * self.tile_height / self.tile_width)))
+        self.rows = math.ceil(count / self.columns)
+        self.width = self.columns * self.tile_width + (self.columns + 1) * GAP
+        self.strip_height = GAP + self.tile_height  # A row of tiles with the gap above it
+        self.height = self.rows * self.strip_height + GAP
+
+
+class PngStreamWriter:
+    """8-bit RGB PNG written strip by strip (scanlines use the Up filter)"""
+
+    def __init__(self, f, width, height):
+        self.f = f
+        self.width = width
+        self.compressor = zlib.compressobj(6)
+        self.pending = []
+        self.pending_bytes = 0
+        self.previous = np.zeros(width * 3, dtype=np.uint8)
+        f.write(b'\x89PNG\r\n\x1a\n')
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+    def write(self, image):
+        """Append the scanlines of a QImage strip (Format_RGB888, sheet width)"""
+        ptr = image.constBits()
+        ptr.setsize(image.sizeInBytes())
+        rows = np.frombuffer(ptr, dtype=np.uint8).reshape(image.height(), image.bytesPerLine())[:, :self.width * 3]
+        # Up filter: each byte minus the one above it (wrapping), a cheap win on tiled images
+        filtered = np.empty((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+        filtered[:, 0] = 2
+        filtered[0, 1:] = rows[0] - self.previous
+        filtered[1:, 1:] = rows[1:] - rows[:-1]
+        self.previous = rows[-1].copy()
+        self._add(self.compressor.compress(filtered.tobytes()))
+
+    def close(self):
+        self._add(self.compressor.flush(), force=True)
+        self._chunk(b'IEND', b'')
+
+    def _add(self, data, force=False):
+        if data:
+            self.pending.append(data)
+            self.pending_bytes += len(data)
+        if self.pending and (force or self.pending_bytes >= PNG_CHUNK):
+            self._chunk(b'IDAT', b''.join(self.pending))
+            self.pending = []
+            self.pending_bytes = 0
+
+    def _chunk(self, kind, data):
+        self.f.write(struct.pack('>I', len(data)) + kind + data)
+        self.f.write(struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+
+def render_strip(tiles, geometry, colors):
+    """Paint one row of tiles (thread-safe: QImage only); colors maps roles to hex strings"""
+    image = QImage(geometry.width, geometry.strip_height, QImage.Format.Format_RGB888)
+    image.fill(QColor(colors['background']))
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+    name_font = QFont()
+    name_font.setPixelSize(13)
+    score_font = QFont(name_font)
+    score_font.setBold(True)
+    metrics = QFontMetrics(name_font)
+    size = geometry.size
+
+    for column, tile in enumerate(tiles):
+        x = GAP + column * (geometry.tile_width + GAP)
+        rect = QRect(x, GAP, geometry.tile_width, geometry.tile_height)
+        width = HIGHLIGHT_BORDER if tile.border else BORDER
+        painter.setPen(QPen(QColor(colors.get(tile.border) or colors['border']), width))
+        painter.setBrush(QColor(colors['tile']))
+        painter.drawRoundedRect(rect.adjusted(width // 2, width // 2, -(width // 2), -(width // 2)), 10, 10)
+
+        thumbnail = decode_image(tile.path, size)
+        if not thumbnail.isNull():
+            if thumbnail.width() > size or thumbnail.height() > size:
+                thumbnail = thumbnail.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio,
+                                             Qt.TransformationMode.SmoothTransformation)
+            painter.drawImage(x + PAD + (size - thumbnail.width()) // 2,
+                              GAP + PAD + (size - thumbnail.height()) // 2, thumbnail)
+
+        text_rect = QRect(x + PAD, GAP + PAD + size + 2, size, TEXT_HEIGHT // 2)
+        painter.setPen(QColor(colors['text']))
+        painter.setFont(name_font)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter,
+                         metrics.elidedText(tile.name, Qt.TextElideMode.ElideMiddle, size))
+        painter.setFont(score_font)
+        painter.drawText(text_rect.translated(0, TEXT_HEIGHT // 2 - 2), Qt.AlignmentFlag.AlignCenter, tile.score)
+
+    painter.end()
+    return image
+
+
+class ContactSheetExporter(QObject):
+    """Renders tiles to a PNG or JPEG file on a background thread"""
+
+    progress = pyqtSignal(object, int, int)  # Exporter, rows written, rows total (emitted from the worker)
+    finished = pyqtSignal(object, object)  # Exporter, error message or None (emitted from the worker)
+
+    def __init__(self, path, tiles, size, colors, workers=4, columns=None):
+        super().__init__()
+        self.path = path
+        self.tiles = list(tiles)
+        self.geometry = SheetGeometry(len(self.tiles), size, columns)
+        self.colors = colors
+        self.workers = max(1, workers)
+        self.cancel_event = threading.Event()
+        self.thread = None
+
+    def is_jpeg(self):
+        return os.path.splitext(self.path)[1].lower() in ('.jpg', '.jpeg')
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='ContactSheet', daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def row_jobs(self):
+        """One job per strip of the sheet, top to bottom (passed to render_row)"""
+        columns = self.geometry.columns
+        return [self.tiles[i:i + columns] for i in range(0, len(self.tiles), columns)]
+
+    def render_row(self, job):
+        """Paint one strip (runs in the pool)"""
+        return render_strip(job, self.geometry, self.colors)
+
+    def strips(self, rows):
+        """Rendered strips in order, at most two per worker in flight"""
+        window = 2 * self.workers
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='ContactSheetRow') as executor:
+            futures = [executor.submit(self.render_row, row) for row in rows[:window]]
+            for index in range(len(rows)):
+                if self.cancel_event.is_set():
+                    for future in futures[index:]:
+                        future.cancel()
+                    return
+                strip = futures[index].result()
+                futures[index] = None  # Written rows are not kept
+                if index + window < len(rows):
+                    futures.append(executor.submit(self.render_row, rows[index + window]))
+                yield strip
+
+    def _run(self):
+        error = None
+        tmp_path = self.path + '.tmp'
+        try:
+            if self.is_jpeg():
+                self._write_jpeg(tmp_path)
+            else:
+                self._write_png(tmp_path)
+            if self.cancel_event.is_set():
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, self.path)
+        except Exception as e:
+            error = str(e)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.finished.emit(self, error)
+
+    def _write_png(self, tmp_path):
+        geometry = self.geometry
+        with open(tmp_path, 'wb') as f:
+            writer = PngStreamWriter(f, geometry.width, geometry.height)
+            rows = self.row_jobs()
+            for done, strip in enumerate(self.strips(rows), 1):
+                writer.write(strip)
+                self.progress.emit(self, done, len(rows))
+            if self.cancel_event.is_set():
+                return
+            bottom = QImage(geometry.width, GAP, QImage.Format.Format_RGB888)
+            bottom.fill(QColor(self.colors['background']))
+            writer.write(bottom)
+            writer.close()
+
+    def _write_jpeg(self, tmp_path):
+        geometry = self.geometry
+        if max(geometry.width, geometry.height) > JPEG_MAX_SIDE or geometry.width * geometry.height > JPEG_MAX_PIXELS:
+            raise ValueError(f"{geometry.width}x{geometry.height} px is too large for JPEG, use PNG")
+        canvas = QImage(geometry.width, geometry.height, QImage.Format.Format_RGB888)
+        canvas.fill(QColor(self.colors['background']))
+        painter = QPainter(canvas)
+        rows = self.row_jobs()
+        y = 0
+        for done, strip in enumerate(self.strips(rows), 1):
+            painter.drawImage(0, y, strip)
+            y += strip.height()
+            self.progress.emit(self, done, len(rows))
+        painter.end()
+        if not self.cancel_event.is_set() and not canvas.save(tmp_path, 'JPEG', JPEG_QUALITY):
+            raise OSError(f"Could not write {self.path}")
@@ -0,0 +1,136 @@
+"""
+Content Hash - Background BLAKE2 hashing of image files for deduplication
+
+Files are hashed by streaming their bytes through BLAKE2b in a worker pool.
+Digests are cached by normalized path + mtime + size (persisted between
+runs), so a file is only read again after it changed.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+CACHE_PATH = Path(__file__).parent.parent / 'config' / 'cache' / 'content_hashes.json'
+
+CHUNK_SIZE = 1 << 20
+
+
+def normalize_path(path):
+    """Case/slash-insensitive key of a file path"""
+    return os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+
+def hash_file(path):
+    """Streaming BLAKE2b digest of a file's bytes"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ContentHasher(QObject):
+    """Hashes files in a thread pool and reports digests on the GUI thread"""
+
+    hashed = pyqtSignal(str, object)  # normalized path, (mtime, size, digest) or None (emitted from workers)
+
+    def __init__(self, cache_path=CACHE_PATH, workers=2):
+        super().__init__()
+        self.cache_path = Path(cache_path)
+        self.cache = None  # normalized path -> [mtime_ns, size, digest], loaded on first use
+        self.dirty = False
+        self.waiters = {}  # normalized path -> callbacks
+        self.workers = workers
+        self.executor = None
+        self.hashed.connect(self._on_hashed)
+
+    def set_workers(self, workers):
+        self.workers = max(1, workers)
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def pending(self):
+        return len(self.waiters)
+
+    def request(self, path, callback):
+        """Call callback(digest) with the file's content hash (None if unreadable)"""
+        self._load_cache()
+        key = normalize_path(path)
+        try:
+            stats = os.stat(key)
+        except OSError:
+            callback(None)
+            return
+        cached = self.cache.get(key)
+        if cached and cached[0] == stats.st_mtime_ns and cached[1] == stats.st_size:
+            callback(cached[2])
+            return
+
+        callbacks = self.waiters.setdefault(key, [])
+        callbacks.append(callback)
+        if len(callbacks) == 1:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='ContentHash')
+            self.executor.submit(self._hash_job, key, stats.st_mtime_ns, stats.st_size)
+
+    def _hash_job(self, key, mtime, size):
+        try:
+            result = (mtime, size, hash_file(key))
+        except OSError:
+            result = None
+        self.hashed.emit(key, result)
+
+    def _on_hashed(self, key, result):
+        digest = None
+        if result is not None:
+            digest = result[2]
+            self.cache[key] = list(result)
+            self.dirty = True
+        for callback in self.waiters.pop(key, []):
+            try:
+                callback(digest)
+            except RuntimeError:
+                pass  # Requesting widget was deleted meanwhile
+
+    def _load_cache(self):
+        if self.cache is not None:
+            return
+        self.cache = {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading content hash cache: {e}")
+
+    def save(self):
+        """Persist the digest cache (atomic replace)"""
+        if not self.dirty or self.cache is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f, separators=(',', ':'))
+            os.replace(tmp_path, self.cache_path)
+            self.dirty = False
+        except Exception as e:
+            print(f"Error saving content hash cache: {e}")
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.save()
+
+
+# Global instance shared by all tabs
+content_hasher = ContentHasher()
@@ -0,0 +1,111 @@
+"""
+File Index - File name to path lookup over a set of root folders
+
+Grids exported by the web gallery only know each image's file name and the
+path it had on the machine that produced them. The roots are walked once and
+every image file name is mapped to the places it lives, so any number of
+entries can be pointed at the real files without probing the disk for each.
+When the export recorded a file's size, only files of that size match: output
+folders reuse names like ComfyUI_00001_.png for unrelated images.
+FileIndexBuilder walks the roots on a worker thread for the GUI.
+"""
+
+import os
+import re
+import threading
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .folder_scan import iter_image_files
+
+_SEPARATORS = re.compile(r'[\\/]+')
+
+PROGRESS_INTERVAL = 1000  # Files indexed between progress signals
+
+
+def path_parts(path):
+    """Lowercased components of a Windows or POSIX path"""
+    return [part for part in _SEPARATORS.split(path.lower()) if part]
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+class FileIndex:
+    """Image file names below some roots, resolved to their current paths"""
+
+    def __init__(self, roots=()):
+        self.roots = []
+        self.paths = {}  # Lowercased file name -> paths, in walk order
+        self.add_roots(roots)
+
+    def add_roots(self, roots, is_cancelled=lambda: False, on_progress=None):
+        """Walk new roots (a single pass each) and index their image files"""
+        roots = [os.path.abspath(root) for root in roots if os.path.abspath(root) not in self.roots]
+        self.roots.extend(roots)
+        for count, path in enumerate(iter_image_files(roots, is_cancelled), 1):
+            self.paths.setdefault(os.path.basename(path).lower(), []).append(path)
+            if on_progress is not None and count % PROGRESS_INTERVAL == 0:
+                on_progress(count)
+
+    def __len__(self):
+        return sum(len(paths) for paths in self.paths.values())
+
+    def resolve(self, file_name, hint=None, size=None):
+        """
+        Current path of file_name, or None if no root contains it. With a
+        recorded size (exports without one match by name only), files of
+        another size never match. When several candidates remain, the one whose
+        trailing folders match hint (the path recorded in the export) best wins.
+        """
+        candidates = self.paths.get(os.path.basename(file_name.replace('\\', '/')).lower())
+        if not candidates:
+            return None
+        if size is not None:
+            # Only same-name files are stat'ed, never the whole index
+            candidates = [path for path in candidates if _file_size(path) == size]
+            if not candidates:
+                return None
+        if len(candidates) == 1 or not hint:
+            return candidates[0]
+        hint_parts = path_parts(hint)
+
+        def shared_tail(path):
+            count = 0
+            for a, b in zip(reversed(path_parts(path)), reversed(hint_parts)):
+                if a != b:
+                    break
+                count += 1
+            return count
+
+        return max(candidates, key=shared_tail)  # Ties keep walk order
+
+
+class FileIndexBuilder(QObject):
+    """Builds a FileIndex of some roots on a worker thread"""
+
+    progress = pyqtSignal(object, int)  # Builder, files indexed (emitted from the worker)
+    finished = pyqtSignal(object, object)  # Builder, FileIndex or None if cancelled (emitted from the worker)
+
+    def __init__(self, roots):
+        super().__init__()
+        self.roots = list(roots)
+        self.cancel_event = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name='FileIndex', daemon=True).start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _run(self):
+        index = FileIndex()
+        try:
+            index.add_roots(self.roots, self.cancel_event.is_set, lambda count: self.progress.emit(self, count))
+        except Exception as e:
+            print(f"Error indexing folders: {e}")
+        self.finished.emit(self, None if self.cancel_event.is_set() else index)
@@ -0,0 +1,97 @@
+"""
+Folder Scan - Streaming recursive enumeration of image files
+
+Folders are walked with os.scandir on a background thread and image paths
+are handed to the GUI thread in batches as soon as they are found, so the
+first cards of a huge folder appear immediately. The first batches are
+small; later ones grow so a large scan costs few GUI round trips. Files of
+a directory are reported in name order, before its subdirectories.
+"""
+
+import os
+import threading
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .folder_watch import is_image_file
+
+FIRST_BATCH = 32
+MAX_BATCH = 512
+FLUSH_INTERVAL = 0.05  # Seconds before a partial batch is sent anyway
+
+
+def iter_image_files(folders, is_cancelled=lambda: False):
+    """Yield image paths below folders: each directory's files in name order, then its subfolders"""
+    stack = [os.path.abspath(folder) for folder in reversed(folders)]
+    while stack:
+        if is_cancelled():
+            return
+        folder = stack.pop()
+        files, subfolders = [], []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subfolders.append(entry.path)
+                        elif is_image_file(entry.name) and entry.is_file():
+                            files.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"Error reading folder {folder}: {e}")
+            continue
+
+        files.sort(key=str.lower)
+        for path in files:
+            if is_cancelled():
+                return
+            yield path
+        subfolders.sort(key=str.lower, reverse=True)
+        stack.extend(subfolders)
+
+
+class FolderScanner(QObject):
+    """Enumerates images below a set of folders on a worker thread"""
+
+    batch_found = pyqtSignal(object, list)  # Scanner, image paths (emitted from the worker)
+    finished = pyqtSignal(object, int, bool)  # Scanner, images found, cancelled (emitted from the worker)
+
+    def __init__(self, folders, parent=None):
+        super().__init__(parent)
+        self.folders = [os.path.abspath(folder) for folder in folders]
+        self.cancel_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='FolderScan', daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def _run(self):
+        found = 0
+        batch = []
+        batch_size = FIRST_BATCH
+        last_flush = time.monotonic()
+        try:
+            for path in iter_image_files(self.folders, self.is_cancelled):
+                batch.append(path)
+                now = time.monotonic()
+                if len(batch) >= batch_size or now - last_flush >= FLUSH_INTERVAL:
+                    found += len(batch)
+                    self.batch_found.emit(self, batch)
+                    batch = []
+                    batch_size = min(batch_size * 2, MAX_BATCH)
+                    last_flush = now
+            if batch and not self.is_cancelled():
+                found += len(batch)
+                self.batch_found.emit(self, batch)
+        except Exception as e:
+            print(f"Error scanning folder: {e}")
+        self.finished.emit(self, found, self.is_cancelled())
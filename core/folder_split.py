@@ -0,0 +1,122 @@
+"""
+Folder Split - Partition a folder's images into groups in a single pass
+
+Every image below a folder is classified once, by checkpoint (filename
+matcher first, embedded metadata second), seed or prompt. Metadata is read
+in a thread pool while the walk goes on, and images land directly in their
+group's list, so the cost stays linear in the number of files whatever the
+number of groups. Each group is finally sorted by seed, then file name.
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .folder_scan import iter_image_files
+from .png_metadata import read_generation_info
+
+SPLIT_KEYS = ('checkpoint', 'seed', 'prompt')
+
+UNKNOWN = "unknown"
+
+PROGRESS_INTERVAL = 500  # Images between progress reports
+
+
+def match_checkpoint(filename, checkpoints):
+    """First checkpoint of the list whose name appears in filename"""
+    for checkpoint in checkpoints:
+        if checkpoint in filename:
+            return checkpoint
+    return UNKNOWN
+
+
+def group_sort_key(key):
+    """Order groups by name (seeds numerically), unknown last"""
+    if key == UNKNOWN:
+        return (2, 0, '')
+    if isinstance(key, int):
+        return (0, key, '')
+    return (1, 0, key.lower())
+
+
+class SplitImage:
+    __slots__ = ('path', 'checkpoint', 'seed')
+
+    def __init__(self, path, checkpoint, seed):
+        self.path = path
+        self.checkpoint = checkpoint
+        self.seed = seed
+
+    def sort_key(self):
+        return (self.seed is None, self.seed or 0, os.path.basename(self.path).lower())
+
+
+class FolderSplitter(QObject):
+    """Groups the images below a folder by checkpoint, seed or prompt on a worker thread"""
+
+    progress = pyqtSignal(object, int)  # Splitter, images classified (emitted from the worker)
+    finished = pyqtSignal(object, object, bool)  # Splitter, [(key, [SplitImage])], cancelled
+
+    def __init__(self, folder, key, checkpoints, workers=4):
+        super().__init__()
+        self.folder = folder
+        self.key = key
+        self.checkpoints = list(checkpoints)
+        self.workers = max(1, workers)
+        self.cancel_event = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name='FolderSplit', daemon=True).start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def classify(self, path):
+        """(group key, SplitImage) of one image (runs in the pool)"""
+        filename = os.path.basename(path)
+        checkpoint = match_checkpoint(filename, self.checkpoints)
+        # Always read: the seed orders every group so tabs line up by index
+        info = read_generation_info(path)
+        if checkpoint == UNKNOWN:
+            checkpoint = info.get('checkpoint') or UNKNOWN
+        seed = info.get('seed')
+
+        if self.key == 'checkpoint':
+            key = checkpoint
+        elif self.key == 'seed':
+            key = seed if seed is not None else UNKNOWN
+        else:
+            prompt = re.sub(r'\s+', ' ', info.get('prompt') or '').strip()
+            key = prompt or UNKNOWN
+        return key, SplitImage(path, checkpoint, seed)
+
+    def _run(self):
+        groups = {}
+        count = 0
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='FolderSplitRead')
+        try:
+            paths = iter_image_files([self.folder], self.is_cancelled)
+            for key, image in pool.map(self.classify, paths):
+                groups.setdefault(key, []).append(image)
+                count += 1
+                if count % PROGRESS_INTERVAL == 0:
+                    if self.is_cancelled():
+                        break
+                    self.progress.emit(self, count)
+        except Exception as e:
+            print(f"Error splitting folder: {e}")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        result = []
+        for key in sorted(groups, key=group_sort_key):
+            images = groups[key]
+            images.sort(key=SplitImage.sort_key)
+            result.append((key, images))
+        self.finished.emit(self, result, self.is_cancelled())
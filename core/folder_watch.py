@@ -0,0 +1,140 @@
+"""
+Folder Watch - Live ingestion of images written into a folder
+
+A QFileSystemWatcher reports changes of the folder; bursts of changes are
+debounced into a single rescan that only looks at names not seen before.
+New images are reported once they are completely written: PNG files when
+their IEND chunk is present, JPEG files when they end with an EOI marker,
+WebP files when the RIFF size matches, anything else once its size stopped
+changing between two polls. A file whose end marker never shows up is
+reported anyway once its size stayed the same for STALE_POLLS polls.
+"""
+
+import os
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
+PNG_TRAILER = b'IEND\xaeB`\x82'
+JPEG_TRAILER = b'\xff\xd9'
+
+STALE_POLLS = 30
+
+
+def is_image_file(name):
+    return name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def is_complete_image(path, size):
+    """
+    True if the file looks completely written, False if it is still growing,
+    None when its format has no end marker to check.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        with open(path, 'rb') as f:
+            if ext == '.png':
+                if size < len(PNG_TRAILER):
+                    return False
+                f.seek(-len(PNG_TRAILER), os.SEEK_END)
+                return f.read() == PNG_TRAILER
+            if ext in ('.jpg', '.jpeg'):
+                if size < 4:
+                    return False
+                f.seek(-len(JPEG_TRAILER), os.SEEK_END)
+                return f.read() == JPEG_TRAILER
+            if ext == '.webp':
+                header = f.read(12)
+                if len(header) < 12 or header[:4] != b'RIFF':
+                    return False
+                return int.from_bytes(header[4:8], 'little') + 8 <= size
+    except OSError:
+        return False  # Locked by the writer (Windows) or vanished
+    return None
+
+
+class FolderWatcher(QObject):
+    """Reports images newly written into a folder, once they are complete"""
+
+    files_ready = pyqtSignal(list)  # Absolute paths of new complete images, sorted by name
+
+    def __init__(self, folder, debounce_ms=500, settle_ms=1000, parent=None):
+        super().__init__(parent)
+        self.folder = os.path.abspath(folder)
+        self.known = set()  # Names already reported (or present when watching started)
+        self.pending = {}  # Name -> (size at the last poll, polls without change) of files being written
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.schedule_scan)
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce_ms)
+        self.debounce_timer.timeout.connect(self.scan)
+
+        # Writes into an existing file don't always signal the directory: poll while files settle
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(settle_ms)
+        self.settle_timer.timeout.connect(self.check_pending)
+
+    def start(self, include_existing=True):
+        """Start watching; existing images are reported first if include_existing"""
+        if include_existing:
+            self.scan()
+        else:
+            self.known = set(self.list_images())
+        if not self.watcher.addPath(self.folder):
+            print(f"Error watching folder: {self.folder}")
+
+    def stop(self):
+        self.debounce_timer.stop()
+        self.settle_timer.stop()
+        paths = self.watcher.directories()
+        if paths:
+            self.watcher.removePaths(paths)
+
+    def schedule_scan(self, _path=None):
+        self.debounce_timer.start()
+
+    def list_images(self):
+        try:
+            with os.scandir(self.folder) as entries:
+                return [entry.name for entry in entries if is_image_file(entry.name) and entry.is_file()]
+        except OSError as e:
+            print(f"Error scanning watched folder: {e}")
+            return []
+
+    def scan(self):
+        """Queue images not seen yet, then report the ones already complete"""
+        for name in self.list_images():
+            if name not in self.known and name not in self.pending:
+                self.pending[name] = (-1, 0)
+        self.check_pending()
+
+    def check_pending(self):
+        ready = []
+        for name, (last_size, unchanged) in list(self.pending.items()):
+            path = os.path.join(self.folder, name)
+            try:
+                size = os.stat(path).st_size
+            except OSError:
+                del self.pending[name]  # Deleted or renamed (e.g. a temp file)
+                continue
+            unchanged = unchanged + 1 if size == last_size else 0
+            complete = is_complete_image(path, size)
+            if complete is None:
+                complete = size > 0 and unchanged > 0
+            if complete or unchanged >= STALE_POLLS:
+                del self.pending[name]
+                self.known.add(name)
+                ready.append(path)
+            else:
+                self.pending[name] = (size, unchanged)
+
+        if self.pending:
+            self.settle_timer.start()
+        if ready:
+            ready.sort()
+            self.files_ready.emit(ready)
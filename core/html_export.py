@@ -0,0 +1,282 @@
+"""
+HTML Export - Static gallery of one or more tabs for reviewers without the app
+
+Writes a folder holding index.html, one page per tab (thumbnails in grid
+order with checkpoint, score, criteria and best/worst borders), compare.html
+(two tabs side by side, paired by position like the fullscreen comparison)
+and thumbs/. Thumbnails are made in a process pool and named after their
+source path; a manifest of each source's mtime and size lets a re-export
+skip every thumbnail still up to date and delete the ones no longer used.
+"""
+
+import hashlib
+import html
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .content_hash import normalize_path
+from .image_store import decode_image
+from .scoring import format_score
+
+THUMB_SIZE = 384
+THUMB_QUALITY = 85
+THUMBS_DIR = 'thumbs'
+MANIFEST = 'manifest.json'  # In thumbs/: thumbnail name -> [mtime_ns, size, THUMB_SIZE]
+PROGRESS_STEPS = 100  # Progress signals over a whole export
+
+
+def thumbnail_name(path):
+    """Stable thumbnail file name of a source image (the same image in several tabs shares it)"""
+    return hashlib.blake2b(normalize_path(path).encode('utf-8'), digest_size=8).hexdigest() + '.jpg'
+
+
+def make_thumbnail(source, target, size=THUMB_SIZE):
+    """Process pool job: write a JPEG thumbnail of source fitting size x size"""
+    image = decode_image(source, size)
+    if image.isNull():
+        return False
+    tmp_path = target + '.tmp'
+    if not image.save(tmp_path, 'JPEG', THUMB_QUALITY):
+        return False
+    os.replace(tmp_path, target)
+    return True
+
+
+def _borders(images):
+    """'best'/'worst' class of each image, with the rule of GridTab.update_borders"""
+    scores = [img.get("totalScore", 0) for img in images]
+    if not scores or max(scores) == min(scores):
+        return [''] * len(images)
+    high, low = max(scores), min(scores)
+    return ['best' if score == high else 'worst' if score == low else '' for score in scores]
+
+
+def _value_class(value):
+    return 'pos' if value > 0 else 'neg' if value < 0 else 'zero'
+
+
+class HtmlExporter(QObject):
+    """Writes the HTML gallery of some tabs on a background thread"""
+
+    progress = pyqtSignal(object, int, int)  # Exporter, thumbnails done, thumbnails to make (emitted from the worker)
+    finished = pyqtSignal(object, object)  # Exporter, error message or None (emitted from the worker)
+
+    def __init__(self, folder, tabs, colors, labels, workers=4):
+        """
+        tabs: (name, card data) pairs, card data as written to grid JSON files.
+        colors and labels: theme colors and translated page texts.
+        """
+        super().__init__()
+        self.folder = folder
+        self.tabs = [(name, list(images)) for name, images in tabs]
+        self.colors = colors
+        self.labels = labels
+        self.workers = max(1, workers)
+        self.cancel_event = threading.Event()
+        self.thread = None
+        self.made = 0
+        self.reused = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='HtmlExport', daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _run(self):
+        error = None
+        try:
+            thumbs = self.update_thumbnails()
+            if not self.cancel_event.is_set():
+                self.write_pages(thumbs)
+        except Exception as e:
+            error = str(e)
+        self.finished.emit(self, error)
+
+    def update_thumbnails(self):
+        """Make missing or outdated thumbnails; returns source path -> thumbnail name (None if unreadable)"""
+        thumbs_dir = os.path.join(self.folder, THUMBS_DIR)
+        os.makedirs(thumbs_dir, exist_ok=True)
+        manifest_path = os.path.join(thumbs_dir, MANIFEST)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+
+        thumbs = {}
+        stamps = {}
+        jobs = []
+        for _, images in self.tabs:
+            for img in images:
+                source = img["absolutePath"]
+                if source in thumbs:
+                    continue
+                name = thumbnail_name(source)
+                try:
+                    stat = os.stat(source)
+                except OSError:
+                    thumbs[source] = None
+                    continue
+                thumbs[source] = name
+                stamp = [stat.st_mtime_ns, stat.st_size, THUMB_SIZE]
+                if name in stamps:
+                    continue  # Same file reached through another spelling of its path
+                stamps[name] = stamp
+                if manifest.get(name) == stamp and os.path.exists(os.path.join(thumbs_dir, name)):
+                    self.reused += 1
+                else:
+                    jobs.append((source, name))
+
+        # Thumbnails of images no longer exported
+        for name in set(manifest) - set(stamps):
+            try:
+                os.remove(os.path.join(thumbs_dir, name))
+            except OSError:
+                pass
+            del manifest[name]
+
+        failed = set()
+        if jobs:
+            step = max(1, len(jobs) // PROGRESS_STEPS)
+            # Spawned workers: forking a process running Qt threads is unsafe
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs)), mp_context=context) as executor:
+                futures = {
+                    executor.submit(make_thumbnail, source, os.path.join(thumbs_dir, name)): (source, name)
+                    for source, name in jobs
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    if self.cancel_event.is_set():
+                        for pending in futures:
+                            pending.cancel()
+                        break
+                    source, name = futures[future]
+                    if future.result():
+                        manifest[name] = stamps[name]
+                        self.made += 1
+                    else:
+                        manifest.pop(name, None)
+                        failed.add(source)
+                    if done % step == 0 or done == len(jobs):
+                        self.progress.emit(self, done, len(jobs))
+
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, manifest_path)
+        return {source: None if source in failed else name for source, name in thumbs.items()}
+
+    def write_pages(self, thumbs):
+        pages = [f"tab-{index}.html" for index in range(1, len(self.tabs) + 1)]
+        for (name, images), page in zip(self.tabs, pages):
+            self._write(page, name, self._tab_body(name, images, thumbs))
+
+        items = "".join(
+            f'<li><a href="{page}">{html.escape(name)}</a> <span class="count">{len(images)} '
+            f'{html.escape(self.labels["images"])}</span></li>'
+            for (name, images), page in zip(self.tabs, pages)
+        )
+        body = f'<h1>{html.escape(self.labels["gallery"])}</h1><ul class="tabs">{items}</ul>'
+        if len(self.tabs) > 1:
+            body += f'<p><a href="compare.html">{html.escape(self.labels["compare"])}</a></p>'
+        self._write('index.html', self.labels["gallery"], body)
+        if len(self.tabs) > 1:
+            self._write('compare.html', self.labels["compare"], self._compare_body(thumbs))
+
+        # Pages of tabs from an earlier, larger export of this folder
+        stale = {'compare.html'} if len(self.tabs) < 2 else set()
+        stale.update(name for name in os.listdir(self.folder)
+                     if name.startswith('tab-') and name.endswith('.html') and name not in pages)
+        for name in stale:
+            try:
+                os.remove(os.path.join(self.folder, name))
+            except OSError:
+                pass
+
+    def _tab_body(self, name, images, thumbs):
+        cards = []
+        for img, border in zip(images, _borders(images)):
+            thumb = thumbs.get(img["absolutePath"])
+            file_name = html.escape(img.get("fileName") or os.path.basename(img["absolutePath"]))
+            picture = (f'<a href="{THUMBS_DIR}/{thumb}"><img src="{THUMBS_DIR}/{thumb}" loading="lazy" alt="{file_name}"></a>'
+                       if thumb else f'<div class="missing">{file_name}</div>')
+            criteria = "".join(
+                f'<span class="{_value_class(value)}">{html.escape(criterion)} {value:+d}</span>'
+                if isinstance(value, int) else f'<span>{html.escape(criterion)} {value}</span>'
+                for criterion, value in img.get("criteria", {}).items()
+            )
+            cards.append(
+                f'<figure class="card {border}" title="{file_name}">{picture}'
+                f'<figcaption><b>{html.escape(img.get("checkpointName", ""))}</b>'
+                f'<span class="score">{format_score(img.get("totalScore", 0))}</span>'
+                f'<span class="criteria">{criteria}</span></figcaption></figure>'
+            )
+        return (f'<p><a href="index.html">&larr; {html.escape(self.labels["gallery"])}</a></p>'
+                f'<h1>{html.escape(name)}</h1><div class="grid">{"".join(cards)}</div>')
+
+    def _compare_body(self, thumbs):
+        data = [
+            {"name": name, "cards": [
+                {"thumb": thumbs.get(img["absolutePath"]), "name": img.get("checkpointName", ""),
+                 "score": format_score(img.get("totalScore", 0))}
+                for img in images
+            ]}
+            for name, images in self.tabs
+        ]
+        # "</" would end the script element early
+        payload = json.dumps(data, ensure_ascii=False).replace('</', '<\\/')
+        return f'''<p><a href="index.html">&larr; {html.escape(self.labels["gallery"])}</a></p>
+<h1>{html.escape(self.labels["compare"])}</h1>
+<p><select id="left"></select> <select id="right"></select></p>
+<div id="pairs"></div>
+<script>
+const TABS = {payload};
+const left = document.getElementById("left"), right = document.getElementById("right");
+TABS.forEach((tab, i) => {{ left.add(new Option(tab.name, i)); right.add(new Option(tab.name, i)); }});
+right.value = Math.min(1, TABS.length - 1);
+function cell(card) {{
+  if (!card) return "<td></td>";
+  const td = document.createElement("td");
+  if (card.thumb) {{ const img = document.createElement("img"); img.src = "{THUMBS_DIR}/" + card.thumb; img.loading = "lazy"; td.append(img); }}
+  const caption = document.createElement("div");
+  caption.textContent = card.name + " — " + card.score;
+  td.append(caption);
+  return td.outerHTML;
+}}
+function render() {{
+  const a = TABS[left.value].cards, b = TABS[right.value].cards;
+  const rows = [];
+  for (let i = 0; i < Math.max(a.length, b.length); i++) rows.push("<tr>" + cell(a[i]) + cell(b[i]) + "</tr>");
+  document.getElementById("pairs").innerHTML = "<table class=\\"compare\\">" + rows.join("") + "</table>";
+}}
+left.onchange = right.onchange = render;
+render();
+</script>'''
+
+    def _write(self, page, title, body):
+        c = self.colors
+        style = f'''body {{ background: {c['background']}; color: {c['text']}; font-family: sans-serif; margin: 16px; }}
+a {{ color: {c['link']}; }}
+.grid {{ display: flex; flex-wrap: wrap; gap: 12px; }}
+.card {{ margin: 0; width: {THUMB_SIZE // 2 + 16}px; padding: 8px; background: {c['tile']}; border: 2px solid {c['border']}; border-radius: 12px; }}
+.card.best {{ border: 4px solid {c['green']}; }}
+.card.worst {{ border: 4px solid {c['red']}; }}
+.card img {{ width: 100%; height: {THUMB_SIZE // 2}px; object-fit: contain; }}
+.missing {{ height: {THUMB_SIZE // 2}px; display: flex; align-items: center; justify-content: center; color: {c['muted']}; word-break: break-all; }}
+figcaption {{ display: flex; flex-direction: column; align-items: center; gap: 2px; font-size: 13px; }}
+.score {{ font-size: 16px; font-weight: bold; }}
+.criteria span {{ margin: 0 3px; font-size: 11px; }}
+.pos {{ color: {c['green']}; }} .neg {{ color: {c['red']}; }} .zero, .count {{ color: {c['muted']}; }}
+table.compare td {{ width: 50%; text-align: center; vertical-align: top; padding: 6px; }}
+table.compare img {{ max-width: 100%; max-height: {THUMB_SIZE}px; }}'''
+        document = (f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+                    f'<style>\n{style}\n</style></head>\n<body>\n{body}\n</body></html>\n')
+        with open(os.path.join(self.folder, page), 'w', encoding='utf-8') as f:
+            f.write(document)
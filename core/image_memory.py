@@ -0,0 +1,119 @@
+"""
+Image Memory Manager - One byte budget for every pixmap held by the gallery
+
+Image caches (the shared ImageStore) report the bytes of every decoded image
+they hold. Owners (image cards, the fullscreen view) register themselves when
+they display an image. When the total exceeds the budget, unreferenced cache
+entries are dropped first; then the least recently displayed owners are
+asked to release their pixmaps: owners that are hidden (cards of other tabs,
+detached cards) go first, then owners scrolled out of view. Owners that are
+on screen are never evicted; they re-fetch their pixmaps when they come back
+into view.
+"""
+
+import weakref
+from collections import OrderedDict
+
+DEFAULT_BUDGET_MB = 1024
+
+# Evict down to this fraction of the budget so enforcement runs rarely
+LOW_WATER_MARK = 0.85
+
+
+def pixmap_nbytes(pixmap):
+    """Approximate memory held by a QPixmap/QImage"""
+    if pixmap is None or pixmap.isNull():
+        return 0
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+class ImageMemoryManager:
+    """LRU accounting of decoded image bytes across all tabs"""
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_MB * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.owners = OrderedDict()  # id(owner) -> weakref(owner), least recently displayed first
+        self.caches = []  # Objects providing trim_idle(nbytes)
+        self.total_bytes = 0
+        self.evictions = 0
+        self.enforcing = False
+
+    def set_budget(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.enforce()
+
+    def add_cache(self, cache):
+        self.caches.append(cache)
+
+    def allocate(self, nbytes):
+        """A cache decoded nbytes of image data"""
+        self.total_bytes += nbytes
+        if self.total_bytes > self.budget_bytes:
+            self.enforce()
+
+    def free(self, nbytes):
+        """A cache dropped nbytes of image data"""
+        self.total_bytes -= nbytes
+
+    def register(self, owner):
+        """Mark owner as displaying an image right now"""
+        key = id(owner)
+        self.owners.pop(key, None)
+        self.owners[key] = weakref.ref(owner)
+
+    def touch(self, owner):
+        """Mark owner as just displayed"""
+        key = id(owner)
+        if key in self.owners:
+            self.owners.move_to_end(key)
+
+    def unregister(self, owner):
+        self.owners.pop(id(owner), None)
+
+    def _trim_caches(self, target):
+        for cache in self.caches:
+            if self.total_bytes <= target:
+                return
+            cache.trim_idle(self.total_bytes - target)
+
+    def enforce(self):
+        """Release images until the total fits below the budget again"""
+        if self.enforcing or self.total_bytes <= self.budget_bytes:
+            return
+        self.enforcing = True
+        try:
+            target = int(self.budget_bytes * LOW_WATER_MARK)
+            self._trim_caches(target)
+            if self.total_bytes <= target:
+                return
+
+            hidden, offscreen = [], []
+            for key, ref in list(self.owners.items()):
+                owner = ref()
+                try:
+                    if owner is None or not owner.isVisible():
+                        hidden.append((key, owner))
+                    elif owner.visibleRegion().isEmpty():
+                        offscreen.append((key, owner))
+                except RuntimeError:
+                    # Underlying Qt object already deleted
+                    hidden.append((key, None))
+
+            for key, owner in hidden + offscreen:
+                if self.total_bytes <= target:
+                    break
+                if self.owners.pop(key, None) is None:
+                    continue
+                if owner is not None:
+                    try:
+                        owner.release_pixmaps()
+                    except RuntimeError:
+                        pass
+                self.evictions += 1
+                self._trim_caches(target)
+        finally:
+            self.enforcing = False
+
+
+# Global instance shared by all tabs
+image_memory = ImageMemoryManager()
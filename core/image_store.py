@@ -0,0 +1,203 @@
+"""
+Image Store - Process-wide, reference-counted cache of decoded images
+
+Thumbnails and full-resolution images are keyed by normalized path + mtime
+(+ thumbnail size), so an image shown by several cards, tabs and the
+fullscreen view costs one decode and one allocation. Thumbnails are decoded
+off the GUI thread with QImageReader (scaled while decoding); requests for
+the same image coalesce onto a single decode. Entries nobody references any
+more stay in an idle LRU cache until the memory budget needs the room.
+"""
+
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtGui import QImageReader, QPixmap
+
+from .image_memory import image_memory, pixmap_nbytes
+from .trace import traced
+
+FULL_SIZE = 0  # Size component of full-resolution tickets
+
+
+@traced(category='io')
+def image_key(path):
+    """Normalized path + mtime identifying one version of an image file"""
+    norm_path = os.path.normcase(os.path.abspath(path))
+    try:
+        mtime = os.stat(norm_path).st_mtime_ns
+    except OSError:
+        mtime = 0
+    return norm_path, mtime
+
+
+@traced(category='decode')
+def decode_image(path, max_size=FULL_SIZE):
+    """Decode an image file to a QImage, scaled to fit max_size if given (thread-safe)"""
+    reader = QImageReader(path)
+    if max_size:
+        size = reader.size()
+        if size.isValid():
+            reader.setScaledSize(size.scaled(max_size, max_size, Qt.AspectRatioMode.KeepAspectRatio))
+    return reader.read()
+
+
+class _Entry:
+    __slots__ = ('pixmap', 'refs', 'nbytes', 'waiters', 'decoding', 'prefetched')
+
+    def __init__(self):
+        self.pixmap = None  # None until decoded
+        self.refs = 0
+        self.nbytes = 0
+        self.waiters = []
+        self.decoding = False
+        self.prefetched = False
+
+
+class ImageStore(QObject):
+    """Shared decoded images handed out by ticket with reference counting"""
+
+    decoded = pyqtSignal(object, object)  # ticket, QImage (emitted from worker threads)
+
+    def __init__(self, workers=4):
+        super().__init__()
+        self.entries = {}  # ticket -> _Entry
+        self.idle = OrderedDict()  # tickets with no references, least recently released first
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ImageDecode')
+        self.pending = 0
+        self.stats = {'hits': 0, 'misses': 0, 'decodes': 0, 'prefetch_hits': 0}
+        self.decoded.connect(self._on_decoded)
+        image_memory.add_cache(self)
+
+    def set_workers(self, workers):
+        """Replace the decode pool (pending decodes finish on the old one)"""
+        old = self.executor
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='ImageDecode')
+        old.shutdown(wait=False)
+
+    def request_thumbnail(self, path, size, callback):
+        """
+        Reference the thumbnail of path fitting size x size and call
+        callback(QPixmap) once it is available (immediately on a cache hit).
+        Returns the ticket to pass to release().
+        """
+        ticket = image_key(path) + (size,)
+        entry = self._acquire(ticket)
+        if entry.pixmap is not None:
+            callback(entry.pixmap)
+        else:
+            entry.waiters.append(callback)
+            if not entry.decoding:
+                self._submit(ticket, entry, path, size)
+        return ticket
+
+    def acquire_full(self, path):
+        """Reference the full-resolution image of path, decoding it now if needed"""
+        ticket = image_key(path) + (FULL_SIZE,)
+        entry = self._acquire(ticket)
+        if entry.prefetched and entry.pixmap is not None:
+            self.stats['prefetch_hits'] += 1
+            entry.prefetched = False
+        if entry.pixmap is None:
+            # Not cached (or a prefetch still in flight): the view can't wait
+            self._store(ticket, entry, QPixmap.fromImage(decode_image(path)))
+        return ticket, entry.pixmap
+
+    def prefetch_full(self, path):
+        """Decode a full-resolution image in the background into the idle cache"""
+        ticket = image_key(path) + (FULL_SIZE,)
+        if ticket in self.entries:
+            return
+        entry = _Entry()
+        entry.prefetched = True
+        self.entries[ticket] = entry
+        self._submit(ticket, entry, path, FULL_SIZE)
+
+    def release(self, ticket, callback=None):
+        """Drop one reference taken by request_thumbnail()/acquire_full()"""
+        entry = self.entries.get(ticket)
+        if entry is None or entry.refs == 0:
+            return
+        if callback is not None and callback in entry.waiters:
+            entry.waiters.remove(callback)
+        entry.refs -= 1
+        if entry.refs == 0 and entry.pixmap is not None:
+            self.idle[ticket] = None
+
+    def trim_idle(self, nbytes):
+        """Drop unreferenced entries, oldest first, until nbytes were freed"""
+        freed = 0
+        while self.idle and freed < nbytes:
+            ticket, _ = self.idle.popitem(last=False)
+            entry = self.entries.pop(ticket)
+            freed += entry.nbytes
+            image_memory.free(entry.nbytes)
+        return freed
+
+    def clear_idle(self):
+        self.trim_idle(float('inf'))
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def hit_rate(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def _acquire(self, ticket):
+        entry = self.entries.get(ticket)
+        if entry is None:
+            entry = _Entry()
+            self.entries[ticket] = entry
+            self.stats['misses'] += 1
+        elif entry.pixmap is not None or entry.refs:
+            self.stats['hits'] += 1
+        else:
+            self.stats['misses'] += 1
+        if entry.refs == 0:
+            self.idle.pop(ticket, None)
+        entry.refs += 1
+        return entry
+
+    def _submit(self, ticket, entry, path, size):
+        entry.decoding = True
+        self.pending += 1
+        self.executor.submit(self._decode_job, ticket, path, size)
+
+    def _decode_job(self, ticket, path, size):
+        try:
+            image = decode_image(path, size)
+        except Exception:
+            image = None
+        self.decoded.emit(ticket, image)
+
+    def _on_decoded(self, ticket, image):
+        """Back on the GUI thread: upload the QImage and wake the waiters"""
+        self.pending -= 1
+        entry = self.entries.get(ticket)
+        if entry is None or entry.pixmap is not None:
+            return
+        entry.decoding = False
+        pixmap = QPixmap.fromImage(image) if image is not None else QPixmap()
+        self._store(ticket, entry, pixmap)
+        if entry.refs == 0:
+            self.idle[ticket] = None
+
+        waiters, entry.waiters = entry.waiters, []
+        for callback in waiters:
+            try:
+                callback(pixmap)
+            except RuntimeError:
+                pass  # Waiter's widget was deleted without releasing
+
+    def _store(self, ticket, entry, pixmap):
+        entry.pixmap = pixmap
+        entry.nbytes = pixmap_nbytes(pixmap)
+        self.stats['decodes'] += 1
+        image_memory.allocate(entry.nbytes)
+
+
+# Global instance shared by all tabs and dialogs
+image_store = ImageStore()
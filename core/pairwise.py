@@ -0,0 +1,143 @@
+"""
+Pairwise Ranking - Elo ratings from A/B votes and an active pair scheduler
+
+Every vote updates an Elo rating (the online form of a Bradley-Terry model)
+for both images and for both checkpoints. The scheduler picks the next pair
+where the outcome is most uncertain: the least compared checkpoint against
+the opponent of closest rating, weighted by how little both are known. Like
+a Swiss tournament, a usable ranking of N checkpoints needs on the order of
+N log N votes instead of the N^2 of a full round robin.
+
+The next pair is chosen while the current one is on screen, avoiding its
+checkpoints when there are enough: an Elo vote only moves the two entities
+compared, so that choice does not depend on the pending vote and its images
+can be decoded ahead of time.
+"""
+
+import math
+import random
+
+import numpy as np
+
+BASE_RATING = 1500.0
+K_FACTOR = 32.0
+SCALE = 400.0  # Rating difference for 10:1 odds
+PRIOR_DEVIATION = 350.0  # Uncertainty of an entity never compared
+
+
+def expected_score(rating_a, rating_b):
+    """Probability that a beats b"""
+    return 1.0 / (1.0 + 10.0 ** ((rating_b - rating_a) / SCALE))
+
+
+class EloTable:
+    """Ratings and comparison counts of a set of named entities"""
+
+    def __init__(self):
+        self.ratings = {}
+        self.games = {}
+
+    def rating(self, name):
+        return self.ratings.get(name, BASE_RATING)
+
+    def update(self, winner, loser):
+        expected = expected_score(self.rating(winner), self.rating(loser))
+        delta = K_FACTOR * (1.0 - expected)
+        self.ratings[winner] = self.rating(winner) + delta
+        self.ratings[loser] = self.rating(loser) - delta
+        self.games[winner] = self.games.get(winner, 0) + 1
+        self.games[loser] = self.games.get(loser, 0) + 1
+
+    def ranking(self, names=None):
+        """(name, rating, games), best first"""
+        names = self.ratings if names is None else names
+        return sorted(((name, self.rating(name), self.games.get(name, 0)) for name in names),
+                      key=lambda entry: -entry[1])
+
+
+class PairwiseRanker:
+    """Votes of one tab: image and checkpoint ratings, plus the pair scheduler"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.images = EloTable()  # Keyed by image path
+        self.checkpoints = EloTable()  # Keyed by checkpoint name
+        self.pair_counts = {}  # frozenset of the two entities -> times compared
+        self.votes = 0
+
+    def record(self, winner, loser):
+        """winner / loser: (path, checkpoint) of the two images of a vote"""
+        self.images.update(winner[0], loser[0])
+        if winner[1] != loser[1]:
+            self.checkpoints.update(winner[1], loser[1])
+            key = frozenset((winner[1], loser[1]))
+        else:
+            key = frozenset((winner[0], loser[0]))
+        self.pair_counts[key] = self.pair_counts.get(key, 0) + 1
+        self.votes += 1
+
+    def replay(self, duels, checkpoint_of):
+        """Rebuild the ratings from journaled [winner path, loser path] votes"""
+        for winner, loser in duels:
+            self.record((winner, checkpoint_of.get(winner, "unknown")),
+                        (loser, checkpoint_of.get(loser, "unknown")))
+
+    def _pick(self, table, names, exclude):
+        """Most informative (a, b) among names, avoiding excluded ones when possible"""
+        if len(names) - len(exclude & set(names)) >= 2:
+            names = [name for name in names if name not in exclude]
+        if len(names) < 2:
+            return None
+        ratings = np.array([table.rating(name) for name in names])
+        games = np.array([table.games.get(name, 0) for name in names], dtype=np.float64)
+        deviation = PRIOR_DEVIATION / np.sqrt(1.0 + games)
+
+        # First the least known entity (ties broken at random)
+        least = np.flatnonzero(games == games.min())
+        first = int(random.choice(least))
+
+        # Then the opponent whose vote would teach the most: an uncertain outcome
+        # (p close to 1/2) against an uncertain opponent, not compared too often
+        p = 1.0 / (1.0 + 10.0 ** ((ratings - ratings[first]) / SCALE))
+        repeats = np.array([self.pair_counts.get(frozenset((names[first], name)), 0) for name in names])
+        gain = p * (1.0 - p) * (deviation[first] ** 2 + deviation ** 2) / (1.0 + repeats)
+        gain[first] = -1.0
+        second = int(np.argmax(gain))
+        return names[first], names[second]
+
+    def next_pair(self, cards, exclude=()):
+        """
+        The two cards to compare next, or None if there are fewer than two.
+        Images of different checkpoints are compared while the tab holds several
+        checkpoints; otherwise the images themselves are ranked.
+        exclude: cards on screen, whose checkpoints (or images) are avoided
+        """
+        by_checkpoint = {}
+        for card in cards:
+            by_checkpoint.setdefault(card.checkpoint_name, []).append(card)
+
+        if len(by_checkpoint) >= 2:
+            excluded = {card.checkpoint_name for card in exclude}
+            pair = self._pick(self.checkpoints, list(by_checkpoint), excluded)
+            if pair is None:
+                return None
+            return tuple(self._least_compared(by_checkpoint[name], exclude) for name in pair)
+
+        by_path = {card.image_path: card for card in cards}
+        excluded = {card.image_path for card in exclude}
+        pair = self._pick(self.images, list(by_path), excluded)
+        if pair is None:
+            return None
+        return by_path[pair[0]], by_path[pair[1]]
+
+    def _least_compared(self, cards, exclude):
+        """Image of a checkpoint with the fewest votes (random among ties)"""
+        choices = [card for card in cards if card not in exclude] or cards
+        fewest = min(self.images.games.get(card.image_path, 0) for card in choices)
+        return random.choice([card for card in choices if self.images.games.get(card.image_path, 0) == fewest])
+
+    def comparisons_for_ranking(self, count):
+        """Rough number of votes after which count entities are ranked (~N log2 N)"""
+        return int(math.ceil(count * math.log2(max(2, count))))
@@ -0,0 +1,169 @@
+"""
+Perceptual Hash - 64-bit dHash per image and near-duplicate grouping
+
+Hashes are computed in a worker pool from the already-decoded thumbnail
+(or a tiny scaled decode when the thumbnail was evicted). Groups of images
+within a Hamming distance are found with NumPy: hashes are split into
+max_distance + 1 bands (by pigeonhole, two hashes within the distance share
+at least one band exactly), candidate pairs come from equal band values in
+sorted order, and distances are checked on the packed uint64 array.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from .image_store import decode_image
+
+DEFAULT_MAX_DISTANCE = 6
+
+# Popcount of every byte value, used when np.bitwise_count is unavailable (NumPy < 2)
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def dhash(image):
+    """64-bit difference hash of a QImage (thread-safe)"""
+    small = image.scaled(9, 8, Qt.AspectRatioMode.IgnoreAspectRatio,
+                         Qt.TransformationMode.SmoothTransformation)
+    small = small.convertToFormat(QImage.Format.Format_Grayscale8)
+    stride = small.bytesPerLine()
+    bits = small.constBits()
+    bits.setsize(small.sizeInBytes())
+    data = bytes(bits)
+
+    value = 0
+    for y in range(8):
+        row = y * stride
+        for x in range(8):
+            value = (value << 1) | (data[row + x] > data[row + x + 1])
+    return value
+
+
+def popcount64(values):
+    """Number of set bits of each element of a uint64 array"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    return _POPCOUNT_TABLE[values.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+def _connected_labels(n, left, right):
+    """Smallest member index of each node's component, given edges left[k]-right[k]"""
+    labels = np.arange(n)
+    if len(left) == 0:
+        return labels
+    while True:
+        lowest = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, lowest)
+        np.minimum.at(updated, right, lowest)
+        updated = updated[updated]  # Pointer jumping
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def group_near_duplicates(hashes, max_distance=DEFAULT_MAX_DISTANCE):
+    """
+    Group indices of hashes within max_distance bits of each other
+    (single linkage). Returns a list of groups (sorted index lists) of size >= 2.
+    """
+    if len(hashes) < 2:
+        return []
+    # Identical hashes are grouped for free: only compare distinct values
+    values, owner = np.unique(np.asarray(hashes, dtype=np.uint64), return_inverse=True)
+    owner = owner.ravel()
+    n = len(values)
+    bands = max_distance + 1
+    band_bits = -(-64 // bands)
+
+    left_parts, right_parts = [], []
+    for band in range(bands):
+        shift = band * band_bits
+        width = min(band_bits, 64 - shift)
+        if width <= 0:
+            break
+        keys = (values >> np.uint64(shift)) & np.uint64((1 << width) - 1)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        # Pair each element with the ones k positions later while the band value matches
+        k = 1
+        while k < len(sorted_keys):
+            same = sorted_keys[k:] == sorted_keys[:-k]
+            if not same.any():
+                break
+            left = order[:-k][same]
+            right = order[k:][same]
+            close = popcount64(values[left] ^ values[right]) <= max_distance
+            left_parts.append(left[close])
+            right_parts.append(right[close])
+            k += 1
+
+    left = np.concatenate(left_parts) if left_parts else np.empty(0, dtype=np.intp)
+    right = np.concatenate(right_parts) if right_parts else np.empty(0, dtype=np.intp)
+    labels = _connected_labels(n, left, right)[owner]
+
+    roots, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    members = np.split(np.argsort(inverse.ravel(), kind='stable'), np.cumsum(counts)[:-1])
+    return [group.tolist() for group, count in zip(members, counts) if count > 1]
+
+
+class PerceptualHasher(QObject):
+    """Computes dHashes in a thread pool, cached by image key"""
+
+    hashed = pyqtSignal(object, object)  # key, hash or None (emitted from workers)
+
+    def __init__(self, workers=2):
+        super().__init__()
+        self.cache = {}  # key -> 64-bit hash
+        self.waiters = {}  # key -> callbacks
+        self.workers = workers
+        self.executor = None
+        self.hashed.connect(self._on_hashed)
+
+    def set_workers(self, workers):
+        self.workers = max(1, workers)
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def request(self, key, source, callback):
+        """
+        Call callback(hash) for the image identified by key. source is a
+        QImage (e.g. the card's thumbnail) or a file path to decode.
+        """
+        if key in self.cache:
+            callback(self.cache[key])
+            return
+        callbacks = self.waiters.setdefault(key, [])
+        callbacks.append(callback)
+        if len(callbacks) == 1:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='PerceptualHash')
+            self.executor.submit(self._hash_job, key, source)
+
+    def _hash_job(self, key, source):
+        try:
+            image = source if isinstance(source, QImage) else decode_image(source, 64)
+            value = None if image.isNull() else dhash(image)
+        except Exception:
+            value = None
+        self.hashed.emit(key, value)
+
+    def _on_hashed(self, key, value):
+        if value is not None:
+            self.cache[key] = value
+        for callback in self.waiters.pop(key, []):
+            try:
+                callback(value)
+            except RuntimeError:
+                pass
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global instance shared by all tabs
+perceptual_hasher = PerceptualHasher()
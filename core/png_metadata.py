@@ -0,0 +1,145 @@
+"""
+PNG Metadata - Generation parameters embedded in PNG text chunks
+
+ComfyUI stores its workflow graph as JSON in a "prompt" chunk; AUTOMATIC1111
+style UIs store a "parameters" text block. Only the chunks before the image
+data are read (a few KB per file), so extracting checkpoint, seed and prompt
+from thousands of files stays cheap.
+"""
+
+import json
+import os
+import re
+import struct
+import zlib
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+TEXT_CHUNKS = (b'tEXt', b'zTXt', b'iTXt')
+
+# Nodes / inputs used to find the generation parameters in a ComfyUI graph
+SAMPLER_SEED_INPUTS = ('seed', 'noise_seed')
+CHECKPOINT_INPUTS = ('ckpt_name', 'unet_name', 'model_name')
+LINKED_VALUE_INPUTS = ('seed', 'noise_seed', 'value', 'int', 'text', 'string')
+
+A1111_SEED = re.compile(r'(?:^|,\s*)Seed:\s*(-?\d+)', re.MULTILINE)
+A1111_MODEL = re.compile(r'(?:^|,\s*)Model:\s*([^,\n]+)', re.MULTILINE)
+
+
+def read_png_text(path):
+    """Text chunks of a PNG file located before its image data, as {keyword: text}"""
+    texts = {}
+    with open(path, 'rb') as f:
+        if f.read(8) != PNG_SIGNATURE:
+            return texts
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            length, chunk_type = struct.unpack('>I4s', header)
+            if chunk_type in (b'IDAT', b'IEND'):
+                break
+            if chunk_type not in TEXT_CHUNKS:
+                f.seek(length + 4, os.SEEK_CUR)  # Data + CRC
+                continue
+            data = f.read(length)
+            f.seek(4, os.SEEK_CUR)
+            try:
+                keyword, text = _decode_text_chunk(chunk_type, data)
+            except (ValueError, IndexError, zlib.error):
+                continue
+            texts[keyword] = text
+    return texts
+
+
+def _decode_text_chunk(chunk_type, data):
+    keyword, _, rest = data.partition(b'\0')
+    keyword = keyword.decode('latin-1')
+    if chunk_type == b'tEXt':
+        return keyword, rest.decode('latin-1')
+    if chunk_type == b'zTXt':
+        return keyword, zlib.decompress(rest[1:]).decode('latin-1')
+    # iTXt: compression flag, method, language tag, translated keyword, text
+    compressed = rest[0] == 1
+    _language, _, rest = rest[2:].partition(b'\0')
+    _translated, _, text = rest.partition(b'\0')
+    if compressed:
+        text = zlib.decompress(text)
+    return keyword, text.decode('utf-8')
+
+
+def _clean_checkpoint(name):
+    """Checkpoint file name without folders and extension"""
+    name = str(name).replace('\\', '/').rsplit('/', 1)[-1]
+    if name.lower().endswith(('.safetensors', '.ckpt', '.pt', '.gguf')):
+        name = os.path.splitext(name)[0]
+    return name
+
+
+def _comfy_value(graph, value, depth=0):
+    """Follow [node_id, output] links to the literal value feeding an input"""
+    while isinstance(value, list) and len(value) == 2 and str(value[0]) in graph and depth < 8:
+        inputs = graph[str(value[0])].get('inputs', {})
+        value = next((inputs[name] for name in LINKED_VALUE_INPUTS if name in inputs), None)
+        depth += 1
+    return value
+
+
+def parse_comfy_prompt(text):
+    """Checkpoint, seed and positive prompt of a ComfyUI "prompt" graph"""
+    graph = json.loads(text)
+    info = {}
+    if not isinstance(graph, dict):
+        return info
+    for node in graph.values():
+        if not isinstance(node, dict):
+            continue
+        inputs = node.get('inputs', {})
+        if 'checkpoint' not in info:
+            for name in CHECKPOINT_INPUTS:
+                if isinstance(inputs.get(name), str):
+                    info['checkpoint'] = _clean_checkpoint(inputs[name])
+                    break
+        if 'seed' not in info:
+            for name in SAMPLER_SEED_INPUTS:
+                seed = _comfy_value(graph, inputs.get(name))
+                if isinstance(seed, int):
+                    info['seed'] = seed
+                    break
+        if 'prompt' not in info and 'positive' in inputs:
+            positive = inputs['positive']
+            if isinstance(positive, list) and str(positive[0]) in graph:
+                text_value = _comfy_value(graph, graph[str(positive[0])].get('inputs', {}).get('text'))
+                if isinstance(text_value, str):
+                    info['prompt'] = text_value
+    return info
+
+
+def parse_a1111_parameters(text):
+    """Checkpoint, seed and prompt of an AUTOMATIC1111 "parameters" block"""
+    info = {}
+    prompt = re.split(r'\n(?:Negative prompt:|Steps:)', text, maxsplit=1)[0]
+    if prompt.strip():
+        info['prompt'] = prompt
+    seed = A1111_SEED.search(text)
+    if seed:
+        info['seed'] = int(seed.group(1))
+    model = A1111_MODEL.search(text)
+    if model:
+        info['checkpoint'] = _clean_checkpoint(model.group(1).strip())
+    return info
+
+
+def read_generation_info(path):
+    """{'checkpoint', 'seed', 'prompt'} found in an image's metadata (keys may be missing)"""
+    if not path.lower().endswith('.png'):
+        return {}
+    try:
+        texts = read_png_text(path)
+        if 'prompt' in texts:
+            return parse_comfy_prompt(texts['prompt'])
+        if 'parameters' in texts:
+            return parse_a1111_parameters(texts['parameters'])
+    except (OSError, ValueError, struct.error):
+        pass
+    return {}
@@ -0,0 +1,169 @@
+"""
+Score Store - Compact NumPy matrix of every rating in the session
+
+Each image of every tab (including dehydrated tabs) owns one row of an int8
+matrix (images x criteria) plus its checkpoint id and tab id. Ratings are
+written in place when a criterion is toggled, and per-checkpoint statistics
+are computed with a few vectorized bincounts, whatever the number of images.
+Weighted scores of every row come from the ScoringEngine in one product.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+INITIAL_CAPACITY = 1024
+
+Leaderboard = namedtuple('Leaderboard', 'names counts rated means criterion_means')
+
+
+class ScoreStore:
+    """Ratings of all images, one row per image"""
+
+    def __init__(self, engine, capacity=INITIAL_CAPACITY):
+        self.engine = engine  # ScoringEngine: criteria order, weights and value ranges
+        self.criteria = list(engine.names)
+        self.criterion_index = {criterion: i for i, criterion in enumerate(self.criteria)}
+        self.scores = np.zeros((capacity, len(self.criteria)), dtype=np.int8)
+        self.checkpoint_ids = np.zeros(capacity, dtype=np.int32)
+        self.tab_ids = np.full(capacity, -1, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.size = 0  # Rows ever used (high-water mark)
+        self.free_rows = []
+        self.checkpoint_names = []
+        self.checkpoint_index = {}
+        self.version = 0  # Bumped on every change, lets views skip redundant refreshes
+
+    def checkpoint_id(self, name):
+        checkpoint_id = self.checkpoint_index.get(name)
+        if checkpoint_id is None:
+            checkpoint_id = len(self.checkpoint_names)
+            self.checkpoint_names.append(name)
+            self.checkpoint_index[name] = checkpoint_id
+        return checkpoint_id
+
+    def _grow(self, needed):
+        capacity = len(self.alive)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        extra = capacity - len(self.alive)
+        self.scores = np.vstack([self.scores, np.zeros((extra, len(self.criteria)), dtype=np.int8)])
+        self.checkpoint_ids = np.concatenate([self.checkpoint_ids, np.zeros(extra, dtype=np.int32)])
+        self.tab_ids = np.concatenate([self.tab_ids, np.full(extra, -1, dtype=np.int32)])
+        self.alive = np.concatenate([self.alive, np.zeros(extra, dtype=bool)])
+
+    def _allocate(self, count):
+        reused = self.free_rows[-count:] if count else []
+        del self.free_rows[len(self.free_rows) - len(reused):]
+        fresh = count - len(reused)
+        self._grow(self.size + fresh)
+        rows = reused[::-1] + list(range(self.size, self.size + fresh))
+        self.size += fresh
+        return rows
+
+    def add_images(self, tab_id, images):
+        """Rows for image dicts ({"checkpointName", "criteria"}), in order"""
+        rows = self._allocate(len(images))
+        if not rows:
+            return rows
+        index = np.asarray(rows)
+        values = np.zeros((len(rows), len(self.criteria)), dtype=np.int8)
+        for i, img in enumerate(images):
+            criteria = img.get("criteria") or {}
+            for criterion, value in criteria.items():
+                column = self.criterion_index.get(criterion)
+                if column is not None:
+                    values[i, column] = value
+        self.scores[index] = np.clip(values, self.engine.mins, self.engine.maxs)
+        self.checkpoint_ids[index] = [self.checkpoint_id(img.get("checkpointName", "unknown")) for img in images]
+        self.tab_ids[index] = tab_id
+        self.alive[index] = True
+        self.version += 1
+        return rows
+
+    def add(self, tab_id, checkpoint, criteria=None):
+        return self.add_images(tab_id, [{"checkpointName": checkpoint, "criteria": criteria}])[0]
+
+    def set_value(self, row, criterion, value):
+        column = self.criterion_index.get(criterion)
+        if row is not None and column is not None:
+            self.scores[row, column] = value
+            self.version += 1
+
+    def set_checkpoint(self, row, checkpoint):
+        if row is not None:
+            self.checkpoint_ids[row] = self.checkpoint_id(checkpoint)
+            self.version += 1
+
+    def remove(self, rows):
+        rows = [row for row in rows if row is not None and self.alive[row]]
+        if not rows:
+            return
+        self.alive[rows] = False
+        self.tab_ids[rows] = -1
+        self.free_rows.extend(rows)
+        self.version += 1
+
+    def remove_tab(self, tab_id):
+        self.remove(np.flatnonzero(self.alive[:self.size] & (self.tab_ids[:self.size] == tab_id)).tolist())
+
+    def clear(self):
+        self.alive[:] = False
+        self.tab_ids[:] = -1
+        self.size = 0
+        self.free_rows = []
+        self.version += 1
+
+    def totals(self, rows=None):
+        """Weighted score of each row (of all rows in use if rows is None)"""
+        values = self.scores[:self.size] if rows is None else self.scores[rows]
+        return self.engine.score_matrix(values.astype(np.float64))
+
+    def clamp_values(self):
+        """Clip every value into the engine's current ranges; returns the rows changed"""
+        values = self.scores[:self.size]
+        clipped = np.clip(values, self.engine.mins, self.engine.maxs).astype(np.int8)
+        changed = np.flatnonzero((clipped != values).any(axis=1))
+        if len(changed):
+            self.scores[:self.size] = clipped
+            self.version += 1
+        return changed
+
+    def leaderboard(self, tab_id=None):
+        """
+        Per-checkpoint statistics of the images alive (of one tab if tab_id is
+        given): image count, rated count (any criterion set), mean total score
+        (weighted) and mean of each criterion over the rated images. Best mean first.
+        """
+        n = self.size
+        mask = self.alive[:n].copy()
+        if tab_id is not None:
+            mask &= self.tab_ids[:n] == tab_id
+        ids = self.checkpoint_ids[:n][mask]
+        scores = self.scores[:n][mask]
+        k = len(self.checkpoint_names)
+
+        counts = np.bincount(ids, minlength=k)
+        rated_mask = scores.any(axis=1)
+        rated = np.bincount(ids[rated_mask], minlength=k)
+        rated_ids = ids[rated_mask]
+        rated_scores = scores[rated_mask]
+        criterion_sums = np.stack(
+            [np.bincount(rated_ids, weights=rated_scores[:, j], minlength=k) for j in range(len(self.criteria))],
+            axis=1
+        ) if self.criteria else np.zeros((k, 0))
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            criterion_means = np.where(rated[:, None] > 0, criterion_sums / rated[:, None], 0.0)
+        means = criterion_means @ self.engine.weights
+
+        present = np.flatnonzero(counts)
+        order = present[np.lexsort((-counts[present], -means[present]))]
+        return Leaderboard(
+            [self.checkpoint_names[i] for i in order],
+            counts[order],
+            rated[order],
+            means[order],
+            criterion_means[order]
+        )
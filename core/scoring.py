@@ -0,0 +1,93 @@
+"""
+Scoring Engine - Weighted criteria with configurable value ranges
+
+Criteria are defined in settings as {"name", "weight", "min", "max"}. A
+card's score is the weighted sum of its criterion values; a criterion button
+cycles 0 -> 1 -> ... -> max -> min -> ... -> 0. The same weights score a whole
+ScoreStore matrix in one matrix-vector product.
+"""
+
+import numpy as np
+
+DEFAULT_CRITERIA = [
+    {"name": name, "weight": 1.0, "min": -1, "max": 1}
+    for name in ("beauty", "noErrors", "loras", "Pos prompt", "Neg prompt")
+]
+
+VALUE_LIMIT = 9  # Values are stored as int8; ranges are kept well inside it
+
+
+class ScoringEngine:
+    """Criteria definitions and the weighted score they produce"""
+
+    def __init__(self, criteria=None):
+        self.version = 0
+        self.configure(criteria)
+
+    def configure(self, criteria):
+        """Apply a list of criterion definitions (missing fields get defaults)"""
+        definitions = []
+        for criterion in criteria or DEFAULT_CRITERIA:
+            if isinstance(criterion, str):
+                criterion = {"name": criterion}
+            low = max(-VALUE_LIMIT, min(0, int(criterion.get("min", -1))))
+            high = min(VALUE_LIMIT, max(0, int(criterion.get("max", 1))))
+            definitions.append({
+                "name": str(criterion["name"]),
+                "weight": float(criterion.get("weight", 1.0)),
+                "min": low,
+                "max": high,
+            })
+        self.criteria = definitions
+        self.names = [c["name"] for c in definitions]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.weights = np.array([c["weight"] for c in definitions], dtype=np.float64)
+        self.mins = np.array([c["min"] for c in definitions], dtype=np.int8)
+        self.maxs = np.array([c["max"] for c in definitions], dtype=np.int8)
+        self.version += 1
+
+    def to_settings(self):
+        """Criteria definitions as stored in settings and exported grids"""
+        return [dict(c) for c in self.criteria]
+
+    def next_value(self, name, current):
+        """Value after one click on a criterion button"""
+        i = self.index[name]
+        if current == 0:
+            return 1 if self.maxs[i] >= 1 else int(self.mins[i])
+        if current > 0:
+            return current + 1 if current < self.maxs[i] else (int(self.mins[i]) if self.mins[i] < 0 else 0)
+        return current + 1
+
+    def clamp(self, name, value):
+        i = self.index.get(name)
+        if i is None:
+            return value
+        return max(int(self.mins[i]), min(int(self.maxs[i]), int(value)))
+
+    def score(self, criteria):
+        """Weighted score of a {criterion: value} dict"""
+        total = 0.0
+        for name, value in criteria.items():
+            i = self.index.get(name)
+            if i is not None:
+                total += self.weights[i] * value
+        return normalize_score(total)
+
+    def score_matrix(self, values):
+        """Weighted scores of an (images x criteria) value matrix"""
+        return values @ self.weights
+
+
+def normalize_score(value):
+    """Integral scores stay ints (unweighted grids look and export as before)"""
+    value = round(float(value), 4)
+    return int(value) if value.is_integer() else value
+
+
+def format_score(value):
+    return str(value) if isinstance(value, int) else f"{value:.1f}"
+
+
+# Global instance, configured from settings at startup
+scoring = ScoringEngine()
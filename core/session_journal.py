@@ -0,0 +1,280 @@
+"""
+Session Journal - Crash-safe autosave of every tab and rating
+
+Each grid edit is appended as one compact JSON line to ``journal.jsonl`` by a
+background writer thread. Every ``compact_every`` records (or after
+``compact_interval`` seconds of activity) the writer folds the journal into
+``snapshot.json`` with an atomic rename and truncates the journal. On startup
+the snapshot plus the journal tail rebuild the whole session.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from .scoring import scoring
+
+# Default location of the session files
+SESSION_DIR = Path(__file__).parent.parent / 'config' / 'session'
+
+SNAPSHOT_VERSION = 1
+
+# Queue sentinels
+_COMPACT = object()
+_STOP = object()
+
+
+class SessionState:
+    """In-memory model of the session, rebuilt from snapshot + journal"""
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.seq = data.get('seq', 0)
+        self.tabs = []
+        self.tab_by_id = {}
+        self.path_index = {}  # tab id -> {absolutePath: image dict}
+        for tab in data.get('tabs', []):
+            self._add_tab(tab['id'], tab.get('name', ''), tab.get('checkpoints', []), tab.get('images', []),
+                          tab.get('duels', []))
+
+    def _add_tab(self, tab_id, name, checkpoints=None, images=None, duels=None):
+        tab = {
+            'id': tab_id,
+            'name': name,
+            'checkpoints': list(checkpoints or []),
+            'images': list(images or []),
+            'duels': list(duels or []),  # [winner path, loser path] of pairwise votes
+        }
+        self.tabs.append(tab)
+        self.tab_by_id[tab_id] = tab
+        self.path_index[tab_id] = {img['absolutePath']: img for img in tab['images']}
+        return tab
+
+    def apply(self, record):
+        """Apply one journal record. Unknown tabs/paths are ignored so replay never fails."""
+        op = record.get('op')
+        if op == 'reset':
+            self.tabs.clear()
+            self.tab_by_id.clear()
+            self.path_index.clear()
+            return
+        tab_id = record.get('tab')
+        if op == 'tab':
+            if tab_id not in self.tab_by_id:
+                self._add_tab(tab_id, record.get('name', ''))
+            return
+        tab = self.tab_by_id.get(tab_id)
+        if tab is None:
+            return
+        index = self.path_index[tab_id]
+        images = tab['images']
+
+        if op == 'untab':
+            self.tabs.remove(tab)
+            del self.tab_by_id[tab_id]
+            del self.path_index[tab_id]
+        elif op == 'add':
+            for img in record.get('images', []):
+                if img['absolutePath'] not in index:
+                    images.append(img)
+                    index[img['absolutePath']] = img
+        elif op == 'del':
+            img = index.pop(record.get('path'), None)
+            if img is not None:
+                images.remove(img)
+        elif op == 'move':
+            src, dst = record.get('src', -1), record.get('dst', -1)
+            if 0 <= src < len(images) and 0 <= dst < len(images):
+                images.insert(dst, images.pop(src))
+        elif op == 'order':
+            rank = {path: i for i, path in enumerate(record.get('paths', []))}
+            images.sort(key=lambda img: rank.get(img['absolutePath'], len(rank)))
+        elif op == 'clear':
+            images.clear()
+            index.clear()
+            tab['duels'].clear()
+        elif op == 'duel':
+            tab['duels'].append([record.get('winner'), record.get('loser')])
+        elif op == 'set':
+            img = index.get(record.get('path'))
+            if img is not None:
+                img['criteria'][record['criterion']] = record['value']
+                # Weighted total shown by the card (journals from before weighting: recomputed)
+                img['totalScore'] = record['total'] if 'total' in record else scoring.score(img['criteria'])
+        elif op == 'rename':
+            for path, name in record.get('names', {}).items():
+                img = index.get(path)
+                if img is not None:
+                    img['checkpointName'] = name
+        elif op == 'checkpoints':
+            tab['checkpoints'] = list(record.get('list', []))
+
+    def to_dict(self):
+        return {'version': SNAPSHOT_VERSION, 'seq': self.seq, 'tabs': self.tabs}
+
+
+class SessionJournal:
+    """
+    Append-only journal of grid edits, written asynchronously
+
+    The GUI thread only builds small dicts and puts them on a queue; the writer
+    thread owns the SessionState, appends the records and compacts them.
+    """
+
+    def __init__(self, directory=None, compact_every=500, compact_interval=60.0):
+        self.directory = Path(directory or SESSION_DIR)  # Default read at call time, so tools can redirect it
+        self.snapshot_path = self.directory / 'snapshot.json'
+        self.journal_path = self.directory / 'journal.jsonl'
+        self.compact_every = compact_every
+        self.compact_interval = compact_interval
+        self.queue = queue.Queue()
+        self.state = SessionState()
+        self.pause_depth = 0
+        self.thread = None
+
+    def restore(self):
+        """Rebuild the session from snapshot + journal tail. Call before start()."""
+        state = SessionState()
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                state = SessionState(json.load(f))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading session snapshot: {e}")
+
+        replayed = 0
+        try:
+            with open(self.journal_path, 'rb') as f:
+                good_offset = 0
+                torn = False
+                for line in f:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError("unterminated record")
+                        record = json.loads(line)
+                    except ValueError:
+                        torn = True  # Torn write from a crash, nothing valid after it
+                        break
+                    good_offset += len(line)
+                    if record.get('seq', 0) <= state.seq:
+                        continue  # Already folded into the snapshot
+                    state.apply(record)
+                    state.seq = record['seq']
+                    replayed += 1
+            if torn:
+                # Appends must not land after the partial line
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(good_offset)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error replaying session journal: {e}")
+
+        self.state = state
+        if replayed:
+            self.queue.put(_COMPACT)
+        return state
+
+    def discard(self):
+        """Forget any previous session. Call before start()."""
+        self.state = SessionState()
+        self.queue.put(_COMPACT)
+
+    def start(self):
+        """Start the background writer thread"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name='SessionJournal', daemon=True)
+            self.thread.start()
+
+    def record(self, op, **fields):
+        """Queue one journal record (GUI thread)"""
+        if self.pause_depth:
+            return
+        fields['op'] = op
+        self.queue.put(fields)
+
+    @contextmanager
+    def paused(self):
+        """Suspend recording, e.g. while widgets are rebuilt from the journal itself"""
+        self.pause_depth += 1
+        try:
+            yield
+        finally:
+            self.pause_depth -= 1
+
+    def compact(self):
+        """Ask the writer to fold the journal into a fresh snapshot"""
+        self.queue.put(_COMPACT)
+
+    def close(self):
+        """Flush pending records, compact and stop the writer"""
+        if self.thread is None:
+            return
+        self.queue.put(_COMPACT)
+        self.queue.put(_STOP)
+        self.thread.join(timeout=10)
+        self.thread = None
+
+    def _run(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        journal_file = open(self.journal_path, 'a', encoding='utf-8')
+        pending = 0
+        last_compact = time.monotonic()
+        running = True
+
+        while running:
+            try:
+                batch = [self.queue.get(timeout=self.compact_interval)]
+            except queue.Empty:
+                batch = []
+            # Drain everything already queued so bursts become a single write
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            compact = False
+            for item in batch:
+                if item is _STOP:
+                    running = False
+                elif item is _COMPACT:
+                    compact = True
+                else:
+                    self.state.seq += 1
+                    item['seq'] = self.state.seq
+                    self.state.apply(item)
+                    lines.append(json.dumps(item, ensure_ascii=False, separators=(',', ':')))
+
+            try:
+                if lines:
+                    journal_file.write('\n'.join(lines) + '\n')
+                    journal_file.flush()
+                    pending += len(lines)
+
+                interval_elapsed = time.monotonic() - last_compact >= self.compact_interval
+                if compact or pending >= self.compact_every or (pending and interval_elapsed):
+                    self._write_snapshot()
+                    journal_file.close()
+                    journal_file = open(self.journal_path, 'w', encoding='utf-8')
+                    pending = 0
+                    last_compact = time.monotonic()
+            except Exception as e:
+                print(f"Error writing session journal: {e}")
+
+        journal_file.close()
+
+    def _write_snapshot(self):
+        """Atomically replace the snapshot with the current state"""
+        tmp_path = self.snapshot_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
@@ -0,0 +1,188 @@
+"""
+Trace - Opt-in timed spans, GUI stall watchdog and Chrome trace export
+
+Hot functions are wrapped with @traced; while tracing is off a wrapped call
+costs one attribute check. While it is on, every call is recorded as a
+complete event, together with os.path.exists calls and the GUI thread
+stalls: a QTimer on the GUI thread beats a heartbeat, and a watchdog thread
+samples the GUI thread's Python stack whenever the heartbeat is older than
+the stall threshold. export() writes the Chrome trace-event JSON format,
+viewable in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from PyQt6.QtCore import QTimer
+
+TRACE_DIR = Path(__file__).parent.parent / 'config' / 'traces'
+
+MAX_EVENTS = 500_000  # Oldest events are dropped beyond this
+STACK_DEPTH = 16  # Innermost frames kept per stack sample
+MAX_SAMPLES = 8  # Distinct stack samples kept per stall
+
+_NULL_SPAN = nullcontext()
+
+
+def _format_stack(frame):
+    return [f"{os.path.basename(entry.filename)}:{entry.lineno} {entry.name}"
+            for entry in traceback.extract_stack(frame)[-STACK_DEPTH:]]
+
+
+class Tracer:
+    """Event recorder shared by all threads; also runs the stall watchdog"""
+
+    def __init__(self):
+        self.enabled = False
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.thread_names = {}
+        self.origin_ns = time.perf_counter_ns()
+        self.stall_threshold = 0.1
+        self.stalls = 0
+        self.heartbeat = 0.0
+        self.heartbeat_timer = None
+        self.watchdog = None
+        self.gui_thread_id = None
+        self.original_exists = None
+
+    def start(self, stall_threshold_ms=100):
+        """Start recording (call from the GUI thread)"""
+        if self.enabled:
+            return
+        self.events.clear()
+        self.thread_names = {}
+        self.stalls = 0
+        self.origin_ns = time.perf_counter_ns()
+        self.stall_threshold = max(10, stall_threshold_ms) / 1000.0
+        self.gui_thread_id = threading.get_ident()
+
+        self.heartbeat = time.perf_counter()
+        self.heartbeat_timer = QTimer()
+        self.heartbeat_timer.setInterval(max(5, int(self.stall_threshold * 250)))
+        self.heartbeat_timer.timeout.connect(self.beat)
+        self.heartbeat_timer.start()
+
+        # Existence checks hit the disk (or the network) from many call sites
+        self.original_exists = os.path.exists
+        os.path.exists = traced('os.path.exists', 'io')(self.original_exists)
+
+        self.enabled = True
+        self.watchdog = threading.Thread(target=self.watch, name='StallWatchdog', daemon=True)
+        self.watchdog.start()
+
+    def stop(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        self.heartbeat_timer.stop()
+        self.heartbeat_timer = None
+        os.path.exists = self.original_exists
+        self.watchdog.join(timeout=1.0)
+        self.watchdog = None
+
+    def beat(self):
+        self.heartbeat = time.perf_counter()
+
+    def complete(self, name, category, start_ns, end_ns, args=None):
+        """Record a finished span"""
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        event = {'name': name, 'cat': category, 'ph': 'X', 'pid': os.getpid(), 'tid': tid,
+                 'ts': (start_ns - self.origin_ns) / 1000.0, 'dur': (end_ns - start_ns) / 1000.0}
+        if args:
+            event['args'] = args
+        self.events.append(event)
+
+    def span(self, name, category='gallery'):
+        """Context manager timing a block (a shared no-op while tracing is off)"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, category)
+
+    @contextmanager
+    def _span(self, name, category):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.complete(name, category, start, time.perf_counter_ns())
+
+    def watch(self):
+        """Watchdog thread: record GUI heartbeats older than the stall threshold"""
+        period = self.stall_threshold / 4
+        stall_start = None
+        samples = []
+        while self.enabled:
+            time.sleep(period)
+            last_beat = self.heartbeat
+            age = time.perf_counter() - last_beat
+            if age > self.stall_threshold:
+                if stall_start is None:
+                    stall_start = last_beat
+                    samples = []
+                frame = sys._current_frames().get(self.gui_thread_id)
+                if frame is not None and len(samples) < MAX_SAMPLES:
+                    stack = _format_stack(frame)
+                    if stack not in samples:
+                        samples.append(stack)
+            elif stall_start is not None:
+                self.record_stall(stall_start, last_beat, samples)
+                stall_start = None
+
+    def record_stall(self, start, end, samples):
+        # perf_counter() and perf_counter_ns() read the same clock
+        self.stalls += 1
+        self.events.append({
+            'name': 'GUI stall', 'cat': 'stall', 'ph': 'X', 'pid': os.getpid(), 'tid': self.gui_thread_id,
+            'ts': (start * 1e9 - self.origin_ns) / 1000.0, 'dur': (end - start) * 1e6,
+            'args': {'ms': round((end - start) * 1000.0, 1), 'stacks': samples},
+        })
+
+    def export(self, path=None):
+        """Write the recorded events as a Chrome trace; returns the file path"""
+        if path is None:
+            path = TRACE_DIR / f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                    for tid, name in list(self.thread_names.items())]
+        if self.gui_thread_id is not None:
+            metadata.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': self.gui_thread_id,
+                             'args': {'name': 'GUI'}})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + list(self.events), 'displayTimeUnit': 'ms',
+                       'otherData': {'stalls': self.stalls,
+                                     'stall_threshold_ms': self.stall_threshold * 1000.0}}, f)
+        return path
+
+
+# Global instance
+tracer = Tracer()
+
+
+def traced(name=None, category='gallery'):
+    """Decorator recording every call of a function as a span while tracing is on"""
+    def decorate(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.complete(label, category, start, time.perf_counter_ns())
+        return wrapper
+    return decorate
@@ -0,0 +1,57 @@
+"""
+Undo History - Bounded undo/redo log of grid edits
+
+Commands are compact tuples ``(op, *fields)`` holding image paths and the
+session data of removed images, never widgets. Undoing a delete or a clear
+rebuilds its cards from pooled widget shells and cached thumbnails. The undo
+log is a ring buffer: the oldest command is dropped once the capacity is
+reached.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+
+
+class UndoHistory:
+    """Undo ring buffer plus redo stack"""
+
+    def __init__(self, capacity=200):
+        self.undo_stack = deque(maxlen=max(1, capacity))
+        self.redo_stack = []
+        self.pause_depth = 0
+
+    def push(self, command):
+        """Log a new command (ignored while paused); clears the redo stack"""
+        if self.pause_depth:
+            return
+        self.redo_stack = []
+        self.undo_stack.append(command)
+
+    def undo(self):
+        """Command to undo, moved to the redo stack (None if there is none)"""
+        if not self.undo_stack:
+            return None
+        command = self.undo_stack.pop()
+        self.redo_stack.append(command)
+        return command
+
+    def redo(self):
+        """Command to redo, moved back to the undo log (None if there is none)"""
+        if not self.redo_stack:
+            return None
+        command = self.redo_stack.pop()
+        self.undo_stack.append(command)
+        return command
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack = []
+
+    @contextmanager
+    def paused(self):
+        """Don't log the edits made while undoing or redoing a command"""
+        self.pause_depth += 1
+        try:
+            yield
+        finally:
+            self.pause_depth -= 1
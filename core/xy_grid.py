@@ -0,0 +1,210 @@
+"""
+XY Grid - Checkpoint x prompt/seed matrix of rated images
+
+Images are placed by their generation parameters: the column is the
+checkpoint (the name the card was matched to, else the one embedded in the
+file) and the row the prompt + seed embedded in the file. Metadata is read in
+a thread pool on a worker thread. In each row, the best and worst scored
+cells are flagged like the grid's borders. The matrix is exported as one
+image through the contact sheet's streaming pipeline.
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, QRect, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QImage, QPainter, QPen
+
+from .contact_sheet import ContactSheetExporter, BORDER, GAP, HIGHLIGHT_BORDER, PAD
+from .folder_split import UNKNOWN, group_sort_key
+from .image_store import decode_image
+from .png_metadata import read_generation_info
+from .scoring import format_score
+
+LABEL_WIDTH = 280  # Prompt/seed column of exported matrices
+HEADER_HEIGHT = 48  # Checkpoint names row of exported matrices
+SCORE_HEIGHT = 20
+
+
+class XYCell:
+    __slots__ = ('path', 'score', 'border', 'extra')
+
+    def __init__(self, path, score):
+        self.path = path
+        self.score = score
+        self.border = None  # 'green' (best of its row), 'red' (worst) or None
+        self.extra = 0  # Further images with the same checkpoint, prompt and seed
+
+
+class XYMatrix:
+    """Cells indexed by (row, column); rows are (prompt, seed) pairs, columns checkpoint names"""
+
+    def __init__(self, entries):
+        """entries: (path, checkpoint, prompt, seed, score) tuples, in grid order"""
+        cells = {}
+        for path, checkpoint, prompt, seed, score in entries:
+            key = ((prompt, seed), checkpoint)
+            if key in cells:
+                cells[key].extra += 1
+            else:
+                cells[key] = XYCell(path, score)
+
+        self.rows = sorted({row for row, _ in cells}, key=self.row_sort_key)
+        self.columns = sorted({column for _, column in cells}, key=group_sort_key)
+        row_index = {row: i for i, row in enumerate(self.rows)}
+        column_index = {column: i for i, column in enumerate(self.columns)}
+        self.cells = {(row_index[row], column_index[column]): cell for (row, column), cell in cells.items()}
+        self.image_count = len(entries)
+        self.flag_rows()
+
+    @staticmethod
+    def row_sort_key(row):
+        prompt, seed = row
+        return (not prompt, prompt.lower(), seed is None, seed or 0)
+
+    def flag_rows(self):
+        """Best and worst cell of each row, with the rule of GridTab.update_borders"""
+        rows = {}
+        for (row, _), cell in self.cells.items():
+            rows.setdefault(row, []).append(cell)
+        for cells in rows.values():
+            scores = [cell.score for cell in cells]
+            high, low = max(scores), min(scores)
+            if high == low:
+                continue
+            for cell in cells:
+                cell.border = 'green' if cell.score == high else 'red' if cell.score == low else None
+
+    def cell(self, row, column):
+        return self.cells.get((row, column))
+
+    def row_label(self, row):
+        prompt, seed = self.rows[row]
+        if not prompt and seed is None:
+            return UNKNOWN
+        return f"{seed if seed is not None else '-'} · {prompt or UNKNOWN}"
+
+
+class XYMatrixBuilder(QObject):
+    """Reads the generation parameters of some images on a worker thread and builds their matrix"""
+
+    progress = pyqtSignal(object, int, int)  # Builder, images read, images total (emitted from the worker)
+    finished = pyqtSignal(object, object)  # Builder, XYMatrix or None if cancelled (emitted from the worker)
+
+    PROGRESS_INTERVAL = 200
+
+    def __init__(self, images, workers=4):
+        """images: card data as written to grid JSON files"""
+        super().__init__()
+        self.images = list(images)
+        self.workers = max(1, workers)
+        self.cancel_event = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name='XYMatrix', daemon=True).start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def classify(self, img_data):
+        """(path, checkpoint, prompt, seed, score) of one image (runs in the pool)"""
+        path = img_data["absolutePath"]
+        info = read_generation_info(path) if os.path.exists(path) else {}
+        checkpoint = img_data.get("checkpointName") or UNKNOWN
+        if checkpoint == UNKNOWN:
+            checkpoint = info.get('checkpoint') or UNKNOWN
+        prompt = re.sub(r'\s+', ' ', info.get('prompt') or '').strip()
+        return path, checkpoint, prompt, info.get('seed'), img_data.get("totalScore", 0)
+
+    def _run(self):
+        entries = []
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='XYMatrixRead') as pool:
+            for entry in pool.map(self.classify, self.images):
+                entries.append(entry)
+                if len(entries) % self.PROGRESS_INTERVAL == 0:
+                    if self.cancel_event.is_set():
+                        break
+                    self.progress.emit(self, len(entries), len(self.images))
+        if self.cancel_event.is_set():
+            self.finished.emit(self, None)
+        else:
+            self.finished.emit(self, XYMatrix(entries))
+
+
+class XYSheetExporter(ContactSheetExporter):
+    """A matrix rendered to one PNG or JPEG: checkpoint header row, then one strip per prompt/seed"""
+
+    def __init__(self, path, matrix, size, colors, workers=4):
+        super().__init__(path, [], size, colors, workers)
+        self.matrix = matrix
+        self.size = size
+        self.cell_width = size + 2 * PAD
+        self.cell_height = size + 2 * PAD + SCORE_HEIGHT
+        geometry = self.geometry
+        geometry.columns = len(matrix.columns)
+        geometry.rows = len(matrix.rows)
+        geometry.width = LABEL_WIDTH + GAP + geometry.columns * (self.cell_width + GAP)
+        geometry.strip_height = GAP + self.cell_height
+        geometry.height = HEADER_HEIGHT + geometry.rows * geometry.strip_height + GAP
+
+    def row_jobs(self):
+        return [None] + list(range(len(self.matrix.rows)))  # None: the header
+
+    def cell_x(self, column):
+        return LABEL_WIDTH + GAP + column * (self.cell_width + GAP)
+
+    def render_row(self, row):
+        colors = self.colors
+        height = HEADER_HEIGHT if row is None else self.geometry.strip_height
+        image = QImage(self.geometry.width, height, QImage.Format.Format_RGB888)
+        image.fill(QColor(colors['background']))
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        font = QFont()
+        font.setPixelSize(13)
+        bold = QFont(font)
+        bold.setBold(True)
+        painter.setPen(QColor(colors['text']))
+
+        if row is None:
+            painter.setFont(bold)
+            for column, name in enumerate(self.matrix.columns):
+                rect = QRect(self.cell_x(column), GAP, self.cell_width, HEADER_HEIGHT - GAP)
+                painter.drawText(rect, Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap, str(name))
+            painter.end()
+            return image
+
+        painter.setFont(font)
+        label_rect = QRect(GAP, GAP, LABEL_WIDTH - GAP, self.cell_height)
+        painter.drawText(label_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter | Qt.TextFlag.TextWordWrap,
+                         self.matrix.row_label(row))
+        size = self.size
+        for column in range(len(self.matrix.columns)):
+            cell = self.matrix.cell(row, column)
+            x = self.cell_x(column)
+            rect = QRect(x, GAP, self.cell_width, self.cell_height)
+            width = HIGHLIGHT_BORDER if cell is not None and cell.border else BORDER
+            border = colors.get(cell.border) if cell is not None and cell.border else colors['border']
+            painter.setPen(QPen(QColor(border), width))
+            painter.setBrush(QColor(colors['tile'] if cell is not None else colors['background']))
+            painter.drawRoundedRect(rect.adjusted(width // 2, width // 2, -(width // 2), -(width // 2)), 10, 10)
+            if cell is None:
+                continue
+            thumbnail = decode_image(cell.path, size)
+            if not thumbnail.isNull():
+                if thumbnail.width() > size or thumbnail.height() > size:
+                    thumbnail = thumbnail.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio,
+                                                 Qt.TransformationMode.SmoothTransformation)
+                painter.drawImage(x + PAD + (size - thumbnail.width()) // 2,
+                                  GAP + PAD + (size - thumbnail.height()) // 2, thumbnail)
+            painter.setPen(QColor(colors['text']))
+            painter.setFont(bold)
+            score = format_score(cell.score) + (f"  (+{cell.extra})" if cell.extra else "")
+            painter.drawText(QRect(x, GAP + PAD + size, self.cell_width, SCORE_HEIGHT),
+                             Qt.AlignmentFlag.AlignCenter, score)
+            painter.setFont(font)
+        painter.end()
+        return image
@@ -0,0 +1,437 @@
+"""
+Benchmark - Headless timings of the gallery hot paths
+
+Generates synthetic PNG/JPEG/WebP corpora (cached between runs) and times,
+under Qt's offscreen platform, a standalone grid tab loading them, relaying
+out, resizing, updating borders, exporting/importing its grid JSON, matching
+checkpoint names and navigating the fullscreen view. The session journal and
+settings.json are never touched. Results, with the peak RSS of the process,
+go to a JSON report; --compare prints the ratios against an older report.
+
+    python tools/benchmark.py                      # quick matrix
+    python tools/benchmark.py --full               # 512 to 8K, 100 to 20k files
+    python tools/benchmark.py --formats png --sizes 1024 --counts 5000
+    python tools/benchmark.py --compare benchmark-20260101-120000.json
+    python tools/benchmark.py --startup 10         # cold starts to first paint
+
+Startup runs spawn fresh interpreters that open the main window with the
+current settings and a copy of the current session, like a user launching
+the app, and report the time from spawn to import, first paint and restored
+tabs. Each run restores and compacts its own temporary copy.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QT_VERSION_STR, QElapsedTimer, QEvent, QObject, QTimer
+from PyQt6.QtGui import QColor, QImage, QImageWriter, QPainter
+from PyQt6.QtWidgets import QApplication
+
+QUICK_SIZES = (512, 2048)
+QUICK_COUNTS = (100, 1000)
+FULL_SIZES = (512, 1024, 2048, 4096, 8192)
+FULL_COUNTS = (100, 1000, 5000, 20000)
+FORMATS = {'png': 'png', 'jpg': 'jpg', 'webp': 'webp'}  # Extension -> Qt writer format
+
+CHECKPOINTS = [f"ckpt{i:03d}_v{i % 7}" for i in range(200)]  # Names matched against file names
+NAV_STEPS = 50  # Fullscreen images stepped through per corpus
+NAV_DWELL = 0.05  # Seconds spent on each fullscreen image (prefetches get this long)
+RESIZED = 300  # Card size the resize timing switches to
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, in MiB (None if unknown)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+    except ImportError:
+        pass
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(Counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return round(counters.PeakWorkingSetSize / (1024 * 1024), 1)
+    except (AttributeError, OSError):
+        pass
+    return None
+
+
+def pump(seconds=0.0):
+    """Process Qt events for at least the given time"""
+    app = QApplication.instance()
+    deadline = time.perf_counter() + seconds
+    while True:
+        app.processEvents()
+        if time.perf_counter() >= deadline:
+            return
+
+
+def settle(timeout=600.0):
+    """Process events until no thumbnail decode is pending; returns the time waited"""
+    from core import image_store
+    start = time.perf_counter()
+    pump()
+    while image_store.pending and time.perf_counter() - start < timeout:
+        pump(0.005)
+    pump()
+    return time.perf_counter() - start
+
+
+def render_image(size, index):
+    """A distinct synthetic render: gradient background plus a few index-dependent shapes"""
+    image = QImage(size, size, QImage.Format.Format_RGB32)
+    image.fill(QColor((index * 37) % 256, (index * 91) % 256, (index * 53) % 256))
+    painter = QPainter(image)
+    step = max(1, size // 8)
+    for k in range(6):
+        color = QColor((index * 17 + k * 40) % 256, (index * 29 + k * 70) % 256, (k * 43) % 256)
+        painter.fillRect((index * 13 + k * step) % size, (k * step) % size, step * 2, step, color)
+    painter.end()
+    return image
+
+
+def build_corpus(root, ext, size, count, unique, regenerate=False):
+    """
+    Folder of count files named after the checkpoints. Only `unique` images
+    are encoded; the others are hard links (or copies) of them, so large
+    corpora stay cheap to build while every path is decoded separately.
+    """
+    folder = os.path.join(root, f"{ext}_{size}_{count}")
+    marker = os.path.join(folder, '.complete')
+    names = [f"{CHECKPOINTS[i % len(CHECKPOINTS)]}_{i:05d}.{ext}" for i in range(count)]
+    paths = [os.path.join(folder, name) for name in names]
+    if os.path.exists(marker) and not regenerate:
+        return paths
+
+    shutil.rmtree(folder, ignore_errors=True)
+    os.makedirs(folder)
+    sources = []
+    for i, path in enumerate(paths):
+        if i < unique:
+            if not render_image(size, i).save(path, FORMATS[ext], 90):
+                raise RuntimeError(f"Could not write {path}")
+            sources.append(path)
+            continue
+        try:
+            os.link(sources[i % len(sources)], path)
+        except OSError:
+            shutil.copyfile(sources[i % len(sources)], path)
+    open(marker, 'w').close()
+    return paths
+
+
+def summarize(samples):
+    """Median / p95 / max of per-step times"""
+    ordered = sorted(samples)
+    return {
+        'median': statistics.median(ordered),
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'max': ordered[-1],
+        'steps': len(ordered),
+    }
+
+
+class Timer:
+    """Collects named wall-clock timings of one case"""
+
+    def __init__(self):
+        self.timings = {}
+
+    def time(self, name, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        self.timings[name] = time.perf_counter() - start
+        return result
+
+
+def run_case(gallery, paths, workdir):
+    """Time every hot path on one corpus with a fresh tab"""
+    from config.settings import config
+    from core import ScoreStore, image_store, scoring
+    from widgets import FullscreenDialog
+
+    timer = Timer()
+    tab = gallery.GridTab(ScoreStore(scoring))
+    tab.resize(1600, 1000)
+    tab.show()
+    tab.checkpoints_list = list(CHECKPOINTS)
+    tab.session_id = 0  # Score store rows need a tab id; without a main window nothing is journaled
+    pump()
+
+    # Loading: building the cards, then every thumbnail decoded and shown
+    timer.time('load_images_from_paths', tab.load_images_from_paths, paths)
+    timer.timings['load_thumbnails_settled'] = settle()
+
+    timer.time('refresh_grid', tab.refresh_grid)
+
+    timer.time('resize_cards', tab.resize_cards, RESIZED)
+    timer.timings['resize_thumbnails_settled'] = settle()
+    tab.resize_cards(210)
+    settle()
+
+    # Borders: once with every card changing color, once with nothing to restyle
+    tab.cards[0].set_criterion(scoring.names[0], 1)
+    for card in tab.cards[1:]:
+        card.set_border_color(None)
+    timer.time('update_borders', tab.update_borders)
+    timer.time('update_borders_unchanged', tab.update_borders)
+
+    grid_path = os.path.join(workdir, 'grid.json')
+    timer.time('export_grid', tab.write_grid, grid_path)
+    timer.timings['export_grid_bytes'] = os.path.getsize(grid_path)
+    config.settings['import_mode'] = 'replace'
+    timer.time('import_from_file', tab.import_from_file, grid_path)
+    timer.timings['import_thumbnails_settled'] = settle()
+
+    filenames = [os.path.basename(path) for path in paths]
+    start = time.perf_counter()
+    for filename in filenames:
+        tab.extract_checkpoint_from_filename(filename)
+    timer.timings['extract_checkpoint_from_filename_us'] = (time.perf_counter() - start) / len(filenames) * 1e6
+
+    # Fullscreen: per-step latency of stepping forward, a short dwell on each image
+    dialog = timer.time('fullscreen_open', FullscreenDialog, tab.cards[0], tab)
+    pump(NAV_DWELL)
+    steps = []
+    clock = QElapsedTimer()
+    for _ in range(min(NAV_STEPS, len(tab.cards) - 1)):
+        clock.start()
+        dialog.show_next_image()
+        dialog.repaint()
+        steps.append(clock.nsecsElapsed() / 1e9)
+        pump(NAV_DWELL)
+    if steps:
+        timer.timings['fullscreen_next'] = summarize(steps)
+    dialog.close()
+    dialog.deleteLater()
+
+    timer.time('clear_grid', tab.clear_grid)
+    gallery.card_pool.forget(tab.scroll_widget)
+    tab.deleteLater()
+    pump()
+    # Next case starts with cold thumbnails
+    image_store.clear_idle()
+    return timer.timings
+
+
+class FirstPaint(QObject):
+    """Event filter noting when a widget is painted for the first time"""
+
+    def __init__(self, widget):
+        super().__init__()
+        self.widget = widget
+        self.painted_at = None
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self.widget and event.type() == QEvent.Type.Paint and self.painted_at is None:
+            self.painted_at = time.time()
+        return False
+
+
+def startup_child(spawned_at, session_dir):
+    """Run in a fresh interpreter: open the main window, print the startup milestones as JSON"""
+    import checkpoints_gallery as gallery
+    imported_at = time.time()
+    import core.session_journal
+    core.session_journal.SESSION_DIR = session_dir
+
+    app = QApplication(sys.argv)
+    window = gallery.MainWindow()
+    first_paint = FirstPaint(window)
+    window.show()
+
+    def check_ready():
+        if first_paint.painted_at is None or not window.startup_done:
+            QTimer.singleShot(1, check_ready)
+            return
+        print(json.dumps({
+            'import_ms': (imported_at - spawned_at) * 1000.0,
+            'first_paint_ms': (first_paint.painted_at - spawned_at) * 1000.0,
+            'ready_ms': (time.time() - spawned_at) * 1000.0,
+        }))
+        window.close()
+        app.quit()
+
+    QTimer.singleShot(0, check_ready)
+    app.exec()
+
+
+def run_startup(runs):
+    """Median and worst of each startup milestone over fresh interpreter runs"""
+    from core.session_journal import SESSION_DIR
+
+    samples = []
+    workdir = tempfile.mkdtemp(prefix='gallery_startup_')
+    try:
+        for _ in range(runs):
+            # A fresh copy each run: the app compacts the session it restores
+            session_dir = os.path.join(workdir, 'session')
+            shutil.rmtree(session_dir, ignore_errors=True)
+            if SESSION_DIR.is_dir():
+                shutil.copytree(SESSION_DIR, session_dir)
+            spawned_at = time.time()
+            result = subprocess.run([sys.executable, os.path.abspath(__file__), '--startup-child', repr(spawned_at),
+                                     '--session-dir', session_dir],
+                                    capture_output=True, text=True, timeout=120)
+            lines = [line for line in result.stdout.splitlines() if line.startswith('{')]
+            if result.returncode != 0 or not lines:
+                raise RuntimeError(f"Startup run failed:\n{result.stderr}")
+            samples.append(json.loads(lines[-1]))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {name: {'median': statistics.median(sample[name] for sample in samples),
+                   'max': max(sample[name] for sample in samples), 'runs': runs}
+            for name in samples[0]}
+
+
+def compare(old_report, new_report):
+    """Print new/old ratios of every timing present in both reports"""
+    for name, value in new_report.get('startup', {}).items():
+        before = old_report.get('startup', {}).get(name)
+        if before:
+            print(f"  startup {name:36s} {before['median']:10.1f} -> {value['median']:10.1f}  "
+                  f"x{value['median'] / before['median']:.2f}")
+
+    def key(case):
+        return case['format'], case['size'], case['count']
+
+    old_cases = {key(case): case for case in old_report.get('cases', [])}
+    for case in new_report['cases']:
+        old = old_cases.get(key(case))
+        if not old or 'timings' not in old or 'timings' not in case:
+            continue
+        print(f"\n{case['format']} {case['size']}px x{case['count']}")
+        for name, value in case['timings'].items():
+            before = old['timings'].get(name)
+            if isinstance(value, dict):
+                value, before = value['median'], before and before['median']
+            if before:
+                print(f"  {name:44s} {before:10.4f} -> {value:10.4f}  x{value / before:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmark of the gallery hot paths")
+    parser.add_argument('--full', action='store_true', help="512 to 8K images, 100 to 20000 files")
+    parser.add_argument('--formats', default='png,jpg,webp', help="comma-separated: png, jpg, webp")
+    parser.add_argument('--sizes', help="comma-separated image sizes in pixels (square)")
+    parser.add_argument('--counts', help="comma-separated file counts")
+    parser.add_argument('--unique', type=int, default=64, help="distinct images encoded per corpus")
+    parser.add_argument('--max-megapixels', type=float, default=50000,
+                        help="skip corpora whose total pixel count exceeds this")
+    parser.add_argument('--corpus-dir', default=os.path.join(tempfile.gettempdir(), 'checkpoints_gallery_bench'),
+                        help="where synthetic corpora are generated and cached")
+    parser.add_argument('--regenerate', action='store_true', help="rebuild cached corpora")
+    parser.add_argument('--output', help="report path (default: benchmark-<timestamp>.json)")
+    parser.add_argument('--compare', help="older report to compare the results with")
+    parser.add_argument('--startup', type=int, metavar='RUNS',
+                        help="time this many cold starts instead of the corpus matrix")
+    parser.add_argument('--startup-child', type=float, help=argparse.SUPPRESS)
+    parser.add_argument('--session-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.startup_child is not None:
+        startup_child(args.startup_child, args.session_dir)
+        return
+
+    sizes = FULL_SIZES if args.full else QUICK_SIZES
+    counts = FULL_COUNTS if args.full else QUICK_COUNTS
+    if args.sizes:
+        sizes = [int(value) for value in args.sizes.split(',')]
+    if args.counts:
+        counts = [int(value) for value in args.counts.split(',')]
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    writable = {bytes(name).decode() for name in QImageWriter.supportedImageFormats()}
+
+    import checkpoints_gallery as gallery
+    from config.settings import config
+    # In memory only: the benchmark never saves settings
+    config.settings['content_dedup'] = 'off'
+
+    report = {
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'platform': {
+            'system': platform.platform(),
+            'python': platform.python_version(),
+            'qt': QT_VERSION_STR,
+            'cpus': os.cpu_count(),
+            'decode_workers': config.get('decode_workers'),
+        },
+        'cases': [],
+    }
+
+    if args.startup:
+        print(f"{args.startup} cold starts...", flush=True)
+        report['startup'] = run_startup(args.startup)
+        for name, value in report['startup'].items():
+            print(f"  {name:44s} {value['median']:8.1f} ms (max {value['max']:.1f})")
+    else:
+        workdir = tempfile.mkdtemp(prefix='gallery_bench_')
+        try:
+            for ext in args.formats.split(','):
+                for size in sizes:
+                    for count in counts:
+                        case = {'format': ext, 'size': size, 'count': count}
+                        report['cases'].append(case)
+                        if FORMATS.get(ext) not in writable:
+                            case['skipped'] = f"no Qt image writer for {ext}"
+                            continue
+                        if size * size * count / 1e6 > args.max_megapixels:
+                            case['skipped'] = "over --max-megapixels"
+                            continue
+                        print(f"{ext} {size}px x{count}: generating...", flush=True)
+                        start = time.perf_counter()
+                        paths = build_corpus(args.corpus_dir, ext, size, count, max(1, args.unique), args.regenerate)
+                        case['corpus_seconds'] = time.perf_counter() - start
+                        print(f"{ext} {size}px x{count}: running...", flush=True)
+                        case['timings'] = run_case(gallery, paths, workdir)
+                        case['peak_rss_mb'] = peak_rss_mb()
+                        for name, value in case['timings'].items():
+                            shown = value['median'] if isinstance(value, dict) else value
+                            print(f"  {name:44s} {shown:10d}" if isinstance(shown, int) else f"  {name:44s} {shown:10.4f}")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report['peak_rss_mb'] = peak_rss_mb()
+    output = args.output or f"benchmark-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {output} (peak RSS {report['peak_rss_mb']} MiB)")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(json.load(f), report)
+
+    from core import image_store
+    image_store.shutdown()
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,48 @@
+"""
+Fix JSON from web - Turn web gallery exports into grids the app can import
+
+Without arguments a small dialog converts one export, prefixing every file
+name with a typed folder. With arguments, whole files or directories of
+exports are converted in parallel; each image is looked up by file name in
+an index of the given roots, built in a single walk, so it points to where
+the file really lives:
+
+    python tools/fix_json_from_web.py exports/ --root X:/comfyui_output
+    python tools/fix_json_from_web.py a.json b.json --root D:/renders --root E:/old --out fixed/
+
+Results are written next to each export as <name>_fixed.json (or into --out)
+in the format GridTab.import_from_file reads.
+"""
+
+import argparse
 import json
 import os
+import sys
 import tkinter as tk
+from concurrent.futures import ProcessPoolExecutor
 from tkinter import filedialog, messagebox, simpledialog
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXED_SUFFIX = '_fixed'
+
+
+def convert_items(data, locate):
+    """Grid data for an export: each item gets the absolutePath returned by locate(item)"""
+    items = data.get('images', []) if isinstance(data, dict) else data
+    result = {"images": []}
+    for item in items:
+        new_item = item.copy()
+        new_item['absolutePath'] = locate(item)
+        result['images'].append(new_item)
+    return result
+
+
+def write_grid(result, output_file):
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+
 class JsonConverterApp:
     def __init__(self, root):
         self.root = root
@@ -47,22 +87,121 @@ class JsonConverterApp:
         if not folder_path.endswith('\\\\'):
             folder_path += '\\\\'
 
-        result = {"images": []}
-        for item in data:
-            new_item = item.copy()
-            new_item['absolutePath'] = folder_path + item['fileName']
-            result['images'].append(new_item)
+        result = convert_items(data, lambda item: folder_path + item['fileName'])
 
         base_name = os.path.splitext(source_file)[0]
-        output_file = f"{base_name}_fixed.json"
+        output_file = f"{base_name}{FIXED_SUFFIX}.json"
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        write_grid(result, output_file)
 
         messagebox.showinfo("Succès", f"Fichier créé :\n{output_file}")
         self.root.quit()
 
+
+# Batch mode: the index is sent once to each worker process
+_worker_index = None
+
+
+def _init_worker(index):
+    global _worker_index
+    _worker_index = index
+
+
+def convert_file(source_file, output_file):
+    """Convert one export using the file index; returns (images, relocated, missing) or the error"""
+    try:
+        return _convert_file(source_file, output_file, _worker_index)
+    except Exception as e:
+        return e
+
+
+def _convert_file(source_file, output_file, index):
+    counts = {'relocated': 0, 'missing': 0}
+
+    def locate(item):
+        recorded = item.get('absolutePath')
+        file_name = item.get('fileName') or os.path.basename((recorded or '').replace('\\', '/'))
+        path = index.resolve(file_name, recorded, item.get('fileSize'))
+        if path is None:
+            counts['missing'] += 1
+            # Keep what the export knew; the import counts it as a missing file
+            return recorded or os.path.join(index.roots[0], file_name)
+        if path != recorded:
+            counts['relocated'] += 1
+        return path
+
+    with open(source_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    result = convert_items(data, locate)
+    write_grid(result, output_file)
+    return len(result['images']), counts['relocated'], counts['missing']
+
+
+def collect_exports(sources):
+    """JSON files given directly or found below the given directories (earlier results excluded)"""
+    exports = []
+    for source in sources:
+        if os.path.isdir(source):
+            for folder, subfolders, files in os.walk(source):
+                subfolders.sort()
+                exports.extend(
+                    os.path.join(folder, name) for name in sorted(files)
+                    if name.lower().endswith('.json') and not name[:-5].endswith(FIXED_SUFFIX)
+                )
+        else:
+            exports.append(source)
+    return exports
+
+
+def output_path(source_file, out_dir=None):
+    base_name = os.path.splitext(os.path.basename(source_file) if out_dir else source_file)[0]
+    return os.path.join(out_dir or '', f"{base_name}{FIXED_SUFFIX}.json")
+
+
+def run_batch(argv):
+    from core.file_index import FileIndex
+
+    parser = argparse.ArgumentParser(description="Convert web gallery exports into importable grids")
+    parser.add_argument('sources', nargs='+', help="export JSON files or directories containing them")
+    parser.add_argument('--root', action='append', required=True,
+                        help="folder holding the images (repeatable); searched recursively")
+    parser.add_argument('--out', help="directory for the converted grids (default: next to each export)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="parallel conversions")
+    args = parser.parse_args(argv)
+
+    exports = collect_exports(args.sources)
+    if not exports:
+        print("No export found")
+        return 1
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+
+    index = FileIndex(args.root)
+    print(f"Indexed {len(index)} images below {len(index.roots)} root(s)")
+
+    jobs = [(source, output_path(source, args.out)) for source in exports]
+    workers = max(1, min(args.workers, len(jobs)))
+    if workers == 1:
+        _init_worker(index)
+        results = [convert_file(source, output) for source, output in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(index,)) as executor:
+            results = list(executor.map(convert_file, *zip(*jobs)))
+
+    failed = 0
+    for (source, output), result in zip(jobs, results):
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"Error converting {source}: {result}")
+            continue
+        images, relocated, missing = result
+        print(f"{source}: {images} images, {relocated} relocated, {missing} missing -> {output}")
+    return 1 if failed else 0
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_batch(sys.argv[1:]))
     root = tk.Tk()
     app = JsonConverterApp(root)
     root.mainloop()
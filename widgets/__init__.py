@@ -1,7 +1,29 @@
 """
 Custom widgets for Checkpoints Gallery
+
+Dialogs and overlays are only needed once the user opens them, so each one
+is imported on first access (`from widgets import X`) instead of at startup.
 """
 
-from .card_details_dialog import CardDetailsDialog
+import importlib
+
+_MODULES = {
+    'CardDetailsDialog': '.card_details_dialog',
+    'LeaderboardDialog': '.leaderboard_dialog',
+    'PerfHud': '.perf_hud',
+    'OptionsDialog': '.options_dialog',
+    'FullscreenDialog': '.fullscreen_dialog',
+    'PairwiseDialog': '.fullscreen_dialog',
+    'XYGridDialog': '.xy_grid_dialog',
+}
+
+__all__ = list(_MODULES)
+
 
-__all__ = ['CardDetailsDialog']
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
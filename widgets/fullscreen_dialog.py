@@ -0,0 +1,448 @@
+"""
+Fullscreen Dialog - Full-resolution view with side-by-side comparison, and the pairwise A/B vote view
+"""
+
+import os
+
+from PyQt6.QtWidgets import QDialog, QMainWindow, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox
+from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtGui import QPixmap, QPainter, QColor, QPen
+
+from config.settings import config
+from core import image_store, image_memory, traced
+
+
+class FullscreenDialog(QDialog):
+    def __init__(self, card, grid_tab, parent=None):
+        super().__init__(parent)
+        self.card = card
+        self.grid_tab = grid_tab
+        self.comparison_card = None
+        self.comparison_pixmap = None
+        self.main_ticket = None
+        self.comparison_ticket = None
+        self.main_pixmap = QPixmap()
+        self.set_main_image(card.image_path)
+        self.split_position = 0.5
+        self.dragging_split = False
+        self.image_x_offset = 0
+        self.image_width = 0
+        
+        self.current_card_index = 0
+        for i, c in enumerate(grid_tab.cards):
+            if c == card:
+                self.current_card_index = i
+                break
+        
+        self.setWindowTitle("Fullscreen View")
+        self.setModal(True)
+        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
+        self.showFullScreen()
+        
+        self.setStyleSheet(config.get_styles().fullscreen_background())
+        
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        # Top controls
+        top_bar = QHBoxLayout()
+        
+        close_btn = QPushButton("✕ ESC")
+        close_btn.setFixedSize(80, 40)
+        close_btn.setStyleSheet(config.get_styles().fullscreen_close_button())
+        close_btn.clicked.connect(self.close)
+        
+        self.grid_label = QLabel(config.get_text('fullscreen_compare'))
+        self.grid_label.setStyleSheet(config.get_styles().fullscreen_label())
+        
+        self.grid_combo = QComboBox()
+        self.grid_combo.setMinimumHeight(30)
+        self.grid_combo.setStyleSheet(config.get_styles().fullscreen_combo())
+        
+        main_window = self.get_main_window()
+        current_tab_index = 0
+        if main_window:
+            current_tab_index = main_window.tabs.indexOf(grid_tab)
+            for i in range(main_window.tabs.count()):
+                tab_name = main_window.tabs.tabText(i)
+                if i == current_tab_index:
+                    self.grid_combo.addItem(f"{tab_name} (current)", i)
+                else:
+                    self.grid_combo.addItem(tab_name, i)
+            for idx in range(self.grid_combo.count()):
+                if self.grid_combo.itemData(idx) == current_tab_index:
+                    self.grid_combo.setCurrentIndex(idx)
+                    break
+        else:
+            self.grid_combo.addItem(f"Grid A (current)", 0)
+        
+        top_bar.addWidget(close_btn)
+        top_bar.addStretch()
+        top_bar.addWidget(self.grid_label)
+        top_bar.addWidget(self.grid_combo)
+        top_bar.addWidget(QLabel("   "))  # Small spacer
+        
+        # Image info labels
+        info_layout = QHBoxLayout()
+        self.info_label = QLabel()
+        self.info_label.setStyleSheet(config.get_styles().fullscreen_info_selectable())
+        self.info_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        
+        self.info_label2 = QLabel()
+        self.info_label2.setStyleSheet(config.get_styles().fullscreen_info_selectable())
+        self.info_label2.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        self.info_label2.setVisible(False)
+        
+        info_layout.addWidget(self.info_label)
+        info_layout.addStretch()
+        info_layout.addWidget(self.info_label2)
+        
+        # Image display
+        self.image_container = QLabel()
+        self.image_container.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.image_container.setStyleSheet(config.get_styles().image_container())
+        self.image_container.mousePressEvent = self.mouse_press_on_image
+        self.image_container.mouseMoveEvent = self.mouse_move_on_image
+        self.image_container.mouseReleaseEvent = self.mouseReleaseEvent
+        self.image_container.paintEvent = self.paint_image
+        
+        layout.addLayout(top_bar)
+        layout.addWidget(self.image_container, stretch=1)
+        layout.addLayout(info_layout)
+        
+        self.top_bar = top_bar
+        self.setLayout(layout)
+        self.update_info_label()
+        self.prefetch_neighbors()
+        
+        self.grid_combo.currentIndexChanged.connect(self.on_grid_changed)
+    
+    @traced()
+    def set_main_image(self, path):
+        """Show the shared full-resolution image of path; False if it can't be read"""
+        ticket, pixmap = image_store.acquire_full(path)
+        if pixmap.isNull():
+            image_store.release(ticket)
+            return False
+        if self.main_ticket is not None:
+            image_store.release(self.main_ticket)
+        self.main_ticket = ticket
+        self.main_pixmap = pixmap
+        image_memory.register(self)
+        return True
+    
+    def set_comparison_image(self, path):
+        """Show the comparison image of path, or drop it when path is None"""
+        if path is None:
+            ticket, pixmap = None, None
+        else:
+            ticket, pixmap = image_store.acquire_full(path)
+            if pixmap.isNull():
+                image_store.release(ticket)
+                return False
+        if self.comparison_ticket is not None:
+            image_store.release(self.comparison_ticket)
+        self.comparison_ticket = ticket
+        self.comparison_pixmap = pixmap
+        image_memory.register(self)
+        return True
+    
+    def prefetch_neighbors(self):
+        """Decode the next/previous images (and their comparisons) in the background"""
+        comparison_tab = self.get_comparison_tab() if self.comparison_card else None
+        for index in (self.current_card_index + 1, self.current_card_index - 1):
+            if 0 <= index < len(self.grid_tab.cards):
+                image_store.prefetch_full(self.grid_tab.cards[index].image_path)
+                if comparison_tab is not None and comparison_tab.cards:
+                    comp_index = min(index, len(comparison_tab.cards) - 1)
+                    image_store.prefetch_full(comparison_tab.cards[comp_index].image_path)
+    
+    def release_pixmaps(self):
+        """Never evicted while shown; once hidden the references are already dropped"""
+    
+    def done(self, result):
+        for ticket in (self.main_ticket, self.comparison_ticket):
+            if ticket is not None:
+                image_store.release(ticket)
+        self.main_ticket = self.comparison_ticket = None
+        self.main_pixmap = QPixmap()
+        self.comparison_pixmap = None
+        image_memory.unregister(self)
+        super().done(result)
+    
+    def paint_image(self, event):
+        if self.main_pixmap.isNull():
+            return
+        
+        painter = QPainter(self.image_container)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        
+        container_rect = self.image_container.rect()
+        
+        if not self.comparison_pixmap:
+            scaled = self.main_pixmap.scaled(
+                container_rect.size(),
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+            x = (container_rect.width() - scaled.width()) // 2
+            y = (container_rect.height() - scaled.height()) // 2
+            self.image_x_offset = x
+            self.image_width = scaled.width()
+            painter.drawPixmap(x, y, scaled)
+        else:
+            max_width = container_rect.width()
+            max_height = container_rect.height()
+            
+            scaled1 = self.main_pixmap.scaled(
+                max_width, max_height,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+            scaled2 = self.comparison_pixmap.scaled(
+                max_width, max_height,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+            
+            display_width = min(scaled1.width(), scaled2.width())
+            display_height = min(scaled1.height(), scaled2.height())
+            
+            x = (container_rect.width() - display_width) // 2
+            y = (container_rect.height() - display_height) // 2
+            
+            self.image_x_offset = x
+            self.image_width = display_width
+            
+            split_x = int(x + display_width * self.split_position)
+            
+            left_rect = QRect(0, 0, int(display_width * self.split_position), display_height)
+            painter.drawPixmap(x, y, scaled1, 0, 0, left_rect.width(), display_height)
+            
+            right_width = display_width - left_rect.width()
+            painter.drawPixmap(
+                split_x, y,
+                scaled2,
+                int(scaled2.width() * self.split_position), 0,
+                right_width, display_height
+            )
+            
+            painter.setPen(QPen(QColor(config.get_styles().COLORS['text_white']), 3))
+            painter.drawLine(split_x, y, split_x, y + display_height)
+            
+            handle_y = y + display_height // 2
+            painter.setBrush(QColor(config.get_styles().COLORS['blue']))
+            painter.drawEllipse(split_x - 15, handle_y - 15, 30, 30)
+            painter.setPen(QPen(QColor(config.get_styles().COLORS['text_white']), 2))
+            painter.drawLine(split_x - 8, handle_y, split_x + 8, handle_y)
+        
+        painter.end()
+    
+    def get_main_window(self):
+        widget = self.grid_tab
+        while widget:
+            if isinstance(widget, QMainWindow):
+                return widget
+            widget = widget.parent()
+        return None
+    
+    def on_grid_changed(self, index):
+        main_window = self.get_main_window()
+        if not main_window:
+            return
+        
+        selected_tab_index = self.grid_combo.itemData(index)
+        if selected_tab_index is None:
+            return
+            
+        selected_tab = main_window.tabs.widget(selected_tab_index)
+        current_tab_index = main_window.tabs.indexOf(self.grid_tab)
+        
+        if selected_tab is not None and hasattr(selected_tab, 'ensure_materialized'):
+            selected_tab.ensure_materialized()
+        
+        if selected_tab_index == current_tab_index or not selected_tab or not hasattr(selected_tab, 'cards'):
+            self.info_label2.setVisible(False)
+            self.comparison_card = None
+            self.set_comparison_image(None)
+            self.image_container.update()
+        else:
+            cards = selected_tab.cards
+            if cards:
+                self.comparison_card = cards[0]
+                
+                self.set_comparison_image(self.comparison_card.image_path)
+                
+                self.info_label2.setVisible(True)
+                self.update_info_label()
+                self.split_position = 0.5
+                self.image_container.update()
+    
+    def mouse_press_on_image(self, event):
+        if self.comparison_pixmap:
+            self.dragging_split = True
+            self.update_split_from_mouse(event.pos().x())
+    
+    def mouse_move_on_image(self, event):
+        if self.comparison_pixmap and (self.dragging_split or event.buttons() & Qt.MouseButton.LeftButton):
+            self.dragging_split = True
+            self.update_split_from_mouse(event.pos().x())
+    
+    def update_split_from_mouse(self, mouse_x):
+        if self.image_width > 0:
+            relative_x = mouse_x - self.image_x_offset
+            self.split_position = max(0.0, min(1.0, relative_x / self.image_width))
+            self.image_container.update()
+    
+    def mouseReleaseEvent(self, event):
+        self.dragging_split = False
+    
+    def update_info_label(self):
+        info1 = f"{self.card.checkpoint_name} - {os.path.basename(self.card.image_path)}"
+        self.info_label.setText(info1)
+        
+        if self.comparison_card:
+            info2 = f"{self.comparison_card.checkpoint_name} - {os.path.basename(self.comparison_card.image_path)}"
+            self.info_label2.setText(info2)
+    
+    def show_previous_image(self):
+        if self.current_card_index > 0:
+            self.current_card_index -= 1
+            self.load_card_at_index(self.current_card_index)
+            if self.comparison_card:
+                self.load_comparison_at_index(self.current_card_index)
+    
+    def show_next_image(self):
+        if self.current_card_index < len(self.grid_tab.cards) - 1:
+            self.current_card_index += 1
+            self.load_card_at_index(self.current_card_index)
+            if self.comparison_card:
+                self.load_comparison_at_index(self.current_card_index)
+    
+    def load_card_at_index(self, index):
+        if 0 <= index < len(self.grid_tab.cards):
+            self.card = self.grid_tab.cards[index]
+            
+            if self.set_main_image(self.card.image_path):
+                self.image_container.update()
+            
+            self.update_info_label()
+            self.prefetch_neighbors()
+    
+    def get_comparison_tab(self):
+        """Tab selected in the comparison combo (materialized), or None"""
+        main_window = self.get_main_window()
+        if not main_window:
+            return None
+        
+        selected_index = self.grid_combo.currentIndex()
+        selected_tab_index = self.grid_combo.itemData(selected_index)
+        if selected_tab_index is None:
+            return None
+        
+        selected_tab = main_window.tabs.widget(selected_tab_index)
+        if selected_tab is not None and hasattr(selected_tab, 'ensure_materialized'):
+            selected_tab.ensure_materialized()
+        return selected_tab
+    
+    def load_comparison_at_index(self, index):
+        selected_tab = self.get_comparison_tab()
+        if selected_tab and hasattr(selected_tab, 'cards') and selected_tab.cards:
+            comp_index = min(index, len(selected_tab.cards) - 1)
+            self.comparison_card = selected_tab.cards[comp_index]
+            
+            if self.set_comparison_image(self.comparison_card.image_path):
+                self.image_container.update()
+            
+            self.update_info_label()
+        
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_Escape:
+            self.close()
+        elif event.key() == Qt.Key.Key_Left:
+            self.show_previous_image()
+        elif event.key() == Qt.Key.Key_Right:
+            self.show_next_image()
+
+
+class PairwiseDialog(FullscreenDialog):
+    """
+    A/B voting on the fullscreen split view: the left image is A, the right one B.
+    Each vote updates the Elo ratings of both images and checkpoints, then the
+    next pair (already decoded in the background) is shown.
+    """
+    
+    def __init__(self, grid_tab, pair, parent=None):
+        self.ranker = grid_tab.pairwise
+        self.next_cards = None  # Pair scheduled while the current one is shown
+        self.ranking_label = None
+        super().__init__(pair[0], grid_tab, parent)
+        self.setWindowTitle(config.get_text('pairwise_title'))
+        self.grid_label.hide()
+        self.grid_combo.hide()
+        
+        self.ranking_label = QLabel()
+        self.ranking_label.setStyleSheet(config.get_styles().fullscreen_label())
+        self.top_bar.insertWidget(1, self.ranking_label)
+        self.show_pair(pair)
+    
+    def show_pair(self, pair):
+        self.card, self.comparison_card = pair
+        self.set_main_image(self.card.image_path)
+        self.set_comparison_image(self.comparison_card.image_path)
+        self.current_card_index = self.grid_tab.cards.index(self.card)
+        self.split_position = 0.5
+        self.info_label2.setVisible(True)
+        self.next_cards = self.ranker.next_pair(self.grid_tab.cards, exclude=pair)
+        self.prefetch_neighbors()
+        self.update_info_label()
+        self.image_container.update()
+    
+    def vote(self, winner, loser):
+        self.grid_tab.record_duel(winner, loser)
+        self.show_next_pair()
+    
+    def show_next_pair(self):
+        pair = self.next_cards
+        if pair is None or any(card not in self.grid_tab.cards for card in pair):
+            pair = self.ranker.next_pair(self.grid_tab.cards)
+        if pair is None:
+            self.close()
+            return
+        self.show_pair(pair)
+    
+    def prefetch_neighbors(self):
+        """Decode both images of the next pair in the background"""
+        for card in self.next_cards or ():
+            image_store.prefetch_full(card.image_path)
+    
+    def card_info(self, card):
+        rating = self.ranker.images.rating(card.image_path)
+        games = self.ranker.images.games.get(card.image_path, 0)
+        return f"{card.checkpoint_name} - {os.path.basename(card.image_path)} - Elo {rating:.0f} ({games})"
+    
+    def update_info_label(self):
+        self.info_label.setText("A: " + self.card_info(self.card))
+        if self.comparison_card:
+            self.info_label2.setText("B: " + self.card_info(self.comparison_card))
+        if self.ranking_label is None:
+            return
+        checkpoints = {card.checkpoint_name for card in self.grid_tab.cards}
+        target = self.ranker.comparisons_for_ranking(len(checkpoints) if len(checkpoints) > 1 else len(self.grid_tab.cards))
+        ranking = self.ranker.checkpoints.ranking(checkpoints) if len(checkpoints) > 1 else []
+        leaders = "   ".join(f"{i}. {name} {rating:.0f}" for i, (name, rating, _games) in enumerate(ranking[:5], 1))
+        self.ranking_label.setText(
+            f"{config.get_text('pairwise_votes')}: {self.ranker.votes} / ~{target}   {leaders}   "
+            f"({config.get_text('pairwise_hint')})"
+        )
+    
+    def keyPressEvent(self, event):
+        key = event.key()
+        if key == Qt.Key.Key_Escape:
+            self.close()
+        elif key in (Qt.Key.Key_Left, Qt.Key.Key_1, Qt.Key.Key_A):
+            self.vote(self.card, self.comparison_card)
+        elif key in (Qt.Key.Key_Right, Qt.Key.Key_2, Qt.Key.Key_B):
+            self.vote(self.comparison_card, self.card)
+        elif key in (Qt.Key.Key_Space, Qt.Key.Key_Down):
+            self.show_next_pair()
@@ -0,0 +1,98 @@
+"""
+Leaderboard Dialog - Checkpoint ranking computed from the session's score store
+"""
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import Qt, QTimer
+
+from config.settings import config
+
+
+class LeaderboardDialog(QDialog):
+    """
+    Non-modal table of per-checkpoint mean scores, counts and per-criterion means
+    Refreshes itself while ratings change
+    """
+
+    REFRESH_INTERVAL_MS = 500
+
+    def __init__(self, score_store, main_window, parent=None):
+        super().__init__(parent)
+        self.score_store = score_store
+        self.main_window = main_window
+        self.shown_state = None  # (store version, scope) currently displayed
+
+        self.setWindowTitle(config.get_text('leaderboard_title'))
+        self.setMinimumSize(700, 400)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+
+        self.setup_ui()
+        self.refresh()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(self.REFRESH_INTERVAL_MS)
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        scope_layout = QHBoxLayout()
+        self.scope_combo = QComboBox()
+        self.scope_combo.addItem(config.get_text('leaderboard_scope_all'), 'all')
+        self.scope_combo.addItem(config.get_text('leaderboard_scope_tab'), 'tab')
+        self.scope_combo.currentIndexChanged.connect(self.refresh)
+        self.summary_label = QLabel("")
+        scope_layout.addWidget(self.scope_combo)
+        scope_layout.addStretch()
+        scope_layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget()
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+
+        layout.addLayout(scope_layout)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+    def current_tab_id(self):
+        if self.scope_combo.currentData() != 'tab':
+            return None
+        tab = self.main_window.tabs.currentWidget()
+        return getattr(tab, 'session_id', None)
+
+    def refresh(self):
+        """Recompute the ranking if ratings or the scope changed"""
+        tab_id = self.current_tab_id()
+        state = (self.score_store.version, self.scope_combo.currentData(), tab_id)
+        if state == self.shown_state:
+            return
+        self.shown_state = state
+
+        board = self.score_store.leaderboard(tab_id)
+        criteria = self.score_store.criteria
+        headers = [
+            config.get_text('leaderboard_checkpoint'),
+            config.get_text('leaderboard_images'),
+            config.get_text('leaderboard_rated'),
+            config.get_text('leaderboard_mean'),
+        ] + list(criteria)
+
+        self.table.setUpdatesEnabled(False)
+        self.table.clear()
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setRowCount(len(board.names))
+        for row, name in enumerate(board.names):
+            values = [name, str(board.counts[row]), str(board.rated[row]), f"{board.means[row]:+.2f}"]
+            values += [f"{mean:+.2f}" for mean in board.criterion_means[row]]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.setUpdatesEnabled(True)
+
+        self.summary_label.setText(f"{int(board.rated.sum())} / {int(board.counts.sum())}")
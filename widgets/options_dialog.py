@@ -0,0 +1,207 @@
+"""
+Options Dialog - Language, theme, import mode, duplicate detection, scoring and performance settings
+"""
+
+from PyQt6.QtWidgets import (QDialog, QMainWindow, QVBoxLayout, QHBoxLayout, QGridLayout, QGroupBox,
+                             QCheckBox, QComboBox, QLabel, QPushButton, QDoubleSpinBox, QSpinBox)
+
+from config.settings import config, SETTINGS_SCHEMA
+from core import scoring
+
+
+class OptionsDialog(QDialog):
+    """Dialog for application options"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(config.get_text('options_title'))
+        self.setModal(True)
+        self.setMinimumSize(400, 300)
+        
+        layout = QVBoxLayout()
+        
+        # Language selection
+        lang_group = QGroupBox(config.get_text('options_language'))
+        lang_layout = QHBoxLayout()
+        
+        self.lang_fr = QCheckBox("Français")
+        self.lang_en = QCheckBox("English")
+        
+        # Set current language
+        current_lang = config.get('language')
+        if current_lang == 'fr':
+            self.lang_fr.setChecked(True)
+        else:
+            self.lang_en.setChecked(True)
+        
+        # Make them mutually exclusive
+        self.lang_fr.toggled.connect(lambda checked: self.lang_en.setChecked(not checked) if checked else None)
+        self.lang_en.toggled.connect(lambda checked: self.lang_fr.setChecked(not checked) if checked else None)
+        
+        lang_layout.addWidget(self.lang_fr)
+        lang_layout.addWidget(self.lang_en)
+        lang_layout.addStretch()
+        lang_group.setLayout(lang_layout)
+        
+        # Theme selection
+        theme_group = QGroupBox(config.get_text('options_theme'))
+        theme_layout = QHBoxLayout()
+        
+        self.theme_dark = QCheckBox(config.get_text('options_theme_dark'))
+        self.theme_light = QCheckBox(config.get_text('options_theme_light'))
+        
+        # Set current theme
+        try:
+            current_theme = config.get('theme')
+        except:
+            current_theme = 'dark'
+
+        if current_theme == 'dark':
+            self.theme_dark.setChecked(True)
+        else:
+            self.theme_light.setChecked(True)
+
+        # Make them mutually exclusive
+        self.theme_dark.toggled.connect(lambda checked: self.theme_light.setChecked(not checked) if checked else None)
+        self.theme_light.toggled.connect(lambda checked: self.theme_dark.setChecked(not checked) if checked else None)
+        
+        theme_layout.addWidget(self.theme_dark)
+        theme_layout.addWidget(self.theme_light)
+        theme_layout.addStretch()
+        theme_group.setLayout(theme_layout)
+        
+        # Import mode
+        import_group = QGroupBox(config.get_text('options_import_mode'))
+        import_layout = QHBoxLayout()
+        
+        self.import_replace = QCheckBox(config.get_text('options_import_replace'))
+        self.import_add = QCheckBox(config.get_text('options_import_add'))
+        
+        current_mode = config.get('import_mode')
+        if current_mode == 'add':
+            self.import_add.setChecked(True)
+        else:
+            self.import_replace.setChecked(True)
+        
+        # Make them mutually exclusive
+        self.import_replace.toggled.connect(lambda checked: self.import_add.setChecked(not checked) if checked else None)
+        self.import_add.toggled.connect(lambda checked: self.import_replace.setChecked(not checked) if checked else None)
+        
+        import_layout.addWidget(self.import_add)
+        import_layout.addWidget(self.import_replace)
+        import_layout.addStretch()
+        import_group.setLayout(import_layout)
+        
+        # Content duplicate detection
+        dedup_group = QGroupBox(config.get_text('options_dedup'))
+        dedup_layout = QHBoxLayout()
+        
+        self.dedup_combo = QComboBox()
+        for mode in ('off', 'skip', 'flag'):
+            self.dedup_combo.addItem(config.get_text(f'options_dedup_{mode}'), mode)
+        self.dedup_combo.setCurrentIndex(max(0, self.dedup_combo.findData(config.get('content_dedup'))))
+        
+        dedup_layout.addWidget(self.dedup_combo)
+        dedup_layout.addStretch()
+        dedup_group.setLayout(dedup_layout)
+        
+        # Scoring: weight and value range of each criterion
+        scoring_group = QGroupBox(config.get_text('options_scoring'))
+        scoring_layout = QGridLayout()
+        for column, key in enumerate(('options_criterion', 'options_weight', 'options_min', 'options_max')):
+            scoring_layout.addWidget(QLabel(config.get_text(key)), 0, column)
+        
+        self.criteria_inputs = []
+        for row, criterion in enumerate(scoring.to_settings(), 1):
+            weight = QDoubleSpinBox()
+            weight.setRange(-10.0, 10.0)
+            weight.setSingleStep(0.5)
+            weight.setValue(criterion['weight'])
+            low = QSpinBox()
+            low.setRange(-9, 0)
+            low.setValue(criterion['min'])
+            high = QSpinBox()
+            high.setRange(0, 9)
+            high.setValue(criterion['max'])
+            scoring_layout.addWidget(QLabel(criterion['name']), row, 0)
+            scoring_layout.addWidget(weight, row, 1)
+            scoring_layout.addWidget(low, row, 2)
+            scoring_layout.addWidget(high, row, 3)
+            self.criteria_inputs.append((criterion['name'], weight, low, high))
+        scoring_group.setLayout(scoring_layout)
+        
+        # Performance: memory budget, worker counts and card pool (ranges from the settings schema)
+        performance_group = QGroupBox(config.get_text('options_performance'))
+        performance_layout = QGridLayout()
+        self.performance_inputs = {}
+        performance_settings = (
+            ('pixmap_budget_mb', 'options_pixmap_budget'),
+            ('decode_workers', 'options_decode_workers'),
+            ('hash_workers', 'options_hash_workers'),
+            ('card_pool_size', 'options_card_pool'),
+        )
+        for row, (key, label) in enumerate(performance_settings):
+            spin = QSpinBox()
+            spin.setRange(*SETTINGS_SCHEMA[key][1])
+            spin.setValue(config.get(key))
+            performance_layout.addWidget(QLabel(config.get_text(label)), row, 0)
+            performance_layout.addWidget(spin, row, 1)
+            self.performance_inputs[key] = spin
+        performance_group.setLayout(performance_layout)
+        
+        # Close button
+        close_btn = QPushButton(config.get_text('options_close'))
+        close_btn.clicked.connect(self.save_and_close)
+        
+        layout.addWidget(lang_group)
+        layout.addWidget(theme_group)
+        layout.addWidget(import_group)
+        layout.addWidget(dedup_group)
+        layout.addWidget(scoring_group)
+        layout.addWidget(performance_group)
+        layout.addStretch()
+        layout.addWidget(close_btn)
+        
+        self.setLayout(layout)
+    
+    def save_and_close(self):
+        # All changes go to settings.json in a single write
+        with config.batch():
+            # Save language
+            if self.lang_fr.isChecked():
+                config.set_language('fr')
+            else:
+                config.set_language('en')
+            # Save theme
+            if self.theme_dark.isChecked():
+                config.set_theme('dark')
+            else:
+                config.set_theme('light')
+            # Save import mode
+            if self.import_replace.isChecked():
+                config.set_import_mode('replace')
+            else:
+                config.set_import_mode('add')
+            # Save duplicate detection
+            config.set_content_dedup(self.dedup_combo.currentData())
+            # Save scoring
+            criteria = [
+                {'name': name, 'weight': weight.value(), 'min': low.value(), 'max': high.value()}
+                for name, weight, low, high in self.criteria_inputs
+            ]
+            scoring_changed = criteria != scoring.to_settings()
+            if scoring_changed:
+                config.set_criteria(criteria)
+            # Save performance settings
+            for key, spin in self.performance_inputs.items():
+                config.set(key, spin.value())
+        
+        # Notify the main window to refresh its UI
+        main_window = self.parent()
+        if isinstance(main_window, QMainWindow):
+            if scoring_changed:
+                main_window.apply_scoring()
+            main_window.apply_performance_settings()
+            main_window.refresh_ui_texts()
+            main_window.apply_styles()  # Apply new theme styles
+        
+        self.accept()
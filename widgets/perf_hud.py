@@ -0,0 +1,113 @@
+"""
+Performance HUD - Live counters overlaid on the main window
+"""
+
+import time
+from collections import deque
+
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import Qt, QTimer
+
+from config.settings import config
+from core import image_store, image_memory
+
+MB = 1024 * 1024
+
+
+class PerfHud(QLabel):
+    """
+    Read-only overlay in the top-right corner of the main window: decode queue,
+    cache hit rate, pixmap memory, per-tab cards / pixmap bytes / last layout
+    time, fullscreen prefetch hits and event loop lag. Mouse events pass through.
+    """
+
+    REFRESH_INTERVAL_MS = 1000
+    LAG_PROBE_MS = 50  # A short timer notices stalls a slow refresh tick would miss
+    LAG_WINDOW = 100  # Probe ticks (5 s) over which the maximum lag is shown
+
+    def __init__(self, main_window):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.lags = deque(maxlen=self.LAG_WINDOW)
+        self.last_tick = None
+
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setTextFormat(Qt.TextFormat.PlainText)
+        self.apply_styles()
+        self.hide()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.lag_timer = QTimer(self)
+        self.lag_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.lag_timer.timeout.connect(self.probe_lag)
+
+    def apply_styles(self):
+        self.setStyleSheet(config.get_styles().perf_hud())
+
+    def toggle(self):
+        if self.isVisible():
+            self.refresh_timer.stop()
+            self.lag_timer.stop()
+            self.hide()
+        else:
+            self.lags.clear()
+            self.last_tick = None
+            self.refresh()
+            self.show()
+            self.raise_()
+            self.refresh_timer.start(self.REFRESH_INTERVAL_MS)
+            self.lag_timer.start(self.LAG_PROBE_MS)
+
+    def probe_lag(self):
+        # A timer firing late means the event loop was busy for that long
+        now = time.perf_counter()
+        if self.last_tick is not None:
+            self.lags.append(max(0.0, (now - self.last_tick) * 1000.0 - self.LAG_PROBE_MS))
+        self.last_tick = now
+
+    def reposition(self):
+        self.adjustSize()
+        self.move(self.main_window.width() - self.width() - 12, 40)
+
+    def tab_pixmap_bytes(self, tab):
+        """Bytes of the distinct thumbnails displayed by a tab's cards"""
+        tickets = {card.thumbnail_ticket for card in tab.cards if card.thumbnail_ticket is not None}
+        total = 0
+        for ticket in tickets:
+            entry = image_store.entries.get(ticket)
+            if entry is not None:
+                total += entry.nbytes
+        return total
+
+    def refresh(self):
+        lag = self.lags[-1] if self.lags else 0.0
+        max_lag = max(self.lags, default=0.0)
+
+        lookups = image_store.stats['hits'] + image_store.stats['misses']
+        lines = [
+            f"{config.get_text('hud_decode_queue')}: {image_store.pending}",
+            f"{config.get_text('hud_cache_hits')}: {image_store.hit_rate():.0%} ({image_store.stats['hits']}/{lookups})",
+            f"{config.get_text('hud_pixmaps')}: {image_memory.total_bytes / MB:.0f} / {image_memory.budget_bytes / MB:.0f} MB",
+            f"{config.get_text('hud_prefetch')}: {image_store.stats['prefetch_hits']}",
+            f"{config.get_text('hud_lag')}: {lag:.0f} ms (max {max_lag:.0f} ms)",
+        ]
+
+        tabs = self.main_window.tabs
+        for i in range(tabs.count()):
+            tab = tabs.widget(i)
+            if not hasattr(tab, 'cards'):
+                continue
+            marker = "▶" if i == tabs.currentIndex() else " "
+            if tab.dormant_images is not None:
+                lines.append(f"{marker} {tabs.tabText(i)}: {len(tab.dormant_images)} "
+                             f"{config.get_text('hud_cards')} ({config.get_text('hud_dormant')})")
+                continue
+            refresh = "-" if tab.last_refresh_ms is None else f"{tab.last_refresh_ms:.0f} ms"
+            lines.append(f"{marker} {tabs.tabText(i)}: {len(tab.cards)} {config.get_text('hud_cards')} · "
+                         f"{self.tab_pixmap_bytes(tab) / MB:.1f} MB · "
+                         f"{config.get_text('hud_refresh')} {refresh}")
+
+        self.setText("\n".join(lines))
+        self.reposition()
+        self.raise_()
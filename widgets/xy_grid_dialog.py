@@ -0,0 +1,292 @@
+"""
+XY Grid Dialog - Checkpoint x prompt/seed matrix of the images of some tabs
+"""
+
+import os
+from collections import OrderedDict
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSlider,
+                             QListWidget, QListWidgetItem, QTableView, QHeaderView, QAbstractItemView,
+                             QStyledItemDelegate, QFileDialog, QSplitter)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect
+from PyQt6.QtGui import QColor, QPen
+
+from config.settings import config
+from core import image_store, format_score, XYMatrixBuilder, XYSheetExporter
+
+CELL_SIZES = (80, 400)  # Zoom slider range (pixels per cell)
+
+
+class XYMatrixModel(QAbstractTableModel):
+    """
+    Table model over an XYMatrix. Thumbnails come from the shared image store
+    (cache hits for cards already shown in a tab) and are only requested for
+    the cells the view paints; the least recently painted ones are released
+    once more than MAX_HELD are referenced.
+    """
+
+    MAX_HELD = 600
+
+    def __init__(self, matrix, thumb_size, parent=None):
+        super().__init__(parent)
+        self.matrix = matrix
+        self.thumb_size = thumb_size
+        self.held = OrderedDict()  # (row, column) -> [ticket, callback, pixmap or None]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.matrix.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.matrix.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        cell = self.matrix.cell(index.row(), index.column())
+        if cell is None:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format_score(cell.score) + (f"  (+{cell.extra})" if cell.extra else "")
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.thumbnail(index.row(), index.column(), cell.path)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{os.path.basename(cell.path)}\n{self.matrix.columns[index.column()]}"
+        if role == Qt.ItemDataRole.UserRole:
+            return cell.border
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal:
+            if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+                return str(self.matrix.columns[section])
+            return None
+        label = self.matrix.row_label(section)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return label if len(label) <= 60 else label[:57] + "..."
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return label
+        return None
+
+    def thumbnail(self, row, column, path):
+        key = (row, column)
+        held = self.held.get(key)
+        if held is not None:
+            self.held.move_to_end(key)
+            return held[2]
+
+        def on_thumbnail(pixmap, key=key):
+            entry = self.held.get(key)
+            if entry is not None:
+                entry[2] = pixmap
+                if entry[0] is not None:  # Decoded later, not a cache hit answered right away
+                    index = self.index(*key)
+                    self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+        held = [None, on_thumbnail, None]
+        self.held[key] = held
+        held[0] = image_store.request_thumbnail(path, self.thumb_size, on_thumbnail)
+        while len(self.held) > self.MAX_HELD:
+            _, (ticket, callback, _) = self.held.popitem(last=False)
+            image_store.release(ticket, callback)
+        return held[2]
+
+    def release_all(self):
+        for ticket, callback, _ in self.held.values():
+            image_store.release(ticket, callback)
+        self.held.clear()
+
+
+class XYCellDelegate(QStyledItemDelegate):
+    """Thumbnail scaled into the cell, score below it, best/worst of the row outlined"""
+
+    def __init__(self, colors, parent=None):
+        super().__init__(parent)
+        self.colors = colors
+
+    def paint(self, painter, option, index):
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+        text = index.data(Qt.ItemDataRole.DisplayRole)
+        if text is None:
+            return  # No image for this checkpoint and prompt
+        border = index.data(Qt.ItemDataRole.UserRole)
+        painter.save()
+        painter.setPen(QPen(QColor(self.colors.get(border) or self.colors['border']), 4 if border else 1))
+        painter.setBrush(QColor(self.colors['tile']))
+        painter.drawRect(rect)
+        score_height = painter.fontMetrics().height() + 2
+        image_rect = rect.adjusted(4, 4, -4, -4 - score_height)
+        if pixmap is not None and not pixmap.isNull():
+            size = pixmap.size().scaled(image_rect.size(), Qt.AspectRatioMode.KeepAspectRatio)
+            target = QRect(0, 0, size.width(), size.height())
+            target.moveCenter(image_rect.center())
+            painter.drawPixmap(target, pixmap)
+        painter.setPen(QColor(self.colors['text']))
+        painter.drawText(QRect(rect.left(), rect.bottom() - score_height, rect.width(), score_height),
+                         Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+
+
+class XYGridDialog(QDialog):
+    """
+    Non-modal builder: pick tabs, lay their images out with one row per
+    prompt + seed and one column per checkpoint, then export the matrix
+    """
+
+    def __init__(self, main_window, thumb_size=210, parent=None):
+        super().__init__(parent)
+        self.main_window = main_window
+        self.thumb_size = thumb_size
+        self.builder = None
+        self.exporter = None
+        self.model = None
+        self.colors = self.matrix_colors()
+
+        self.setWindowTitle(config.get_text('xy_title'))
+        self.setMinimumSize(900, 600)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.setup_ui()
+        self.fill_tabs()
+
+    def matrix_colors(self):
+        colors = config.get_styles().COLORS
+        return {
+            'background': colors['bg_dark'],
+            'tile': colors['bg_med'],
+            'border': colors['border_dark'],
+            'text': colors['text_white'],
+            'green': colors['green'],
+            'red': colors['red_btn'],
+        }
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        self.tab_list = QListWidget()
+        self.tab_list.setMaximumWidth(220)
+
+        self.table = QTableView()
+        self.table.setItemDelegate(XYCellDelegate(self.colors, self.table))
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.table.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.table.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        for header in (self.table.horizontalHeader(), self.table.verticalHeader()):
+            header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setMaximumWidth(320)
+
+        splitter = QSplitter()
+        splitter.addWidget(self.tab_list)
+        splitter.addWidget(self.table)
+        splitter.setStretchFactor(1, 1)
+
+        controls = QHBoxLayout()
+        self.build_btn = QPushButton(config.get_text('xy_build'))
+        self.build_btn.clicked.connect(self.build)
+        self.export_btn = QPushButton(config.get_text('xy_export'))
+        self.export_btn.clicked.connect(self.export)
+        self.export_btn.setEnabled(False)
+        self.status_label = QLabel("")
+        self.zoom_slider = QSlider(Qt.Orientation.Horizontal)
+        self.zoom_slider.setRange(*CELL_SIZES)
+        self.zoom_slider.setValue(160)
+        self.zoom_slider.setFixedWidth(150)
+        self.zoom_slider.valueChanged.connect(self.set_cell_size)
+        controls.addWidget(self.build_btn)
+        controls.addWidget(self.export_btn)
+        controls.addWidget(self.status_label)
+        controls.addStretch()
+        controls.addWidget(QLabel(config.get_text('slider_label') + ":"))
+        controls.addWidget(self.zoom_slider)
+
+        layout.addLayout(controls)
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+        self.set_cell_size(self.zoom_slider.value())
+
+    def grid_tabs(self):
+        tabs = self.main_window.tabs
+        return [(tabs.tabText(i), tabs.widget(i)) for i in range(tabs.count()) if hasattr(tabs.widget(i), 'export_images')]
+
+    def fill_tabs(self):
+        current = self.main_window.tabs.currentWidget()
+        for name, tab in self.grid_tabs():
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked if tab is current else Qt.CheckState.Unchecked)
+            item.setData(Qt.ItemDataRole.UserRole, tab)
+            self.tab_list.addItem(item)
+
+    def set_cell_size(self, size):
+        self.table.horizontalHeader().setDefaultSectionSize(size)
+        self.table.verticalHeader().setDefaultSectionSize(size + self.table.fontMetrics().height())
+
+    def build(self):
+        images = []
+        for i in range(self.tab_list.count()):
+            item = self.tab_list.item(i)
+            if item.checkState() == Qt.CheckState.Checked:
+                images.extend(item.data(Qt.ItemDataRole.UserRole).export_images())
+        if not images:
+            self.status_label.setText(config.get_text('msg_no_images'))
+            return
+        if self.builder is not None:
+            self.builder.cancel()
+        self.builder = XYMatrixBuilder(images, config.get('decode_workers'))
+        self.builder.progress.connect(self.on_build_progress)
+        self.builder.finished.connect(self.on_built)
+        self.status_label.setText(f"{config.get_text('xy_reading')}: 0/{len(images)}")
+        self.builder.start()
+
+    def on_build_progress(self, builder, done, total):
+        if builder is self.builder:
+            self.status_label.setText(f"{config.get_text('xy_reading')}: {done}/{total}")
+
+    def on_built(self, builder, matrix):
+        if builder is not self.builder or matrix is None:
+            return
+        self.builder = None
+        if self.model is not None:
+            self.model.release_all()
+        self.model = XYMatrixModel(matrix, self.thumb_size, self)
+        self.table.setModel(self.model)
+        self.export_btn.setEnabled(bool(matrix.cells))
+        self.status_label.setText(
+            f"{len(matrix.rows)} {config.get_text('xy_rows')} × {len(matrix.columns)} "
+            f"{config.get_text('xy_columns')} ({matrix.image_count} {config.get_text('html_images')})"
+        )
+
+    def export(self):
+        if self.model is None or self.exporter is not None:
+            return
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, config.get_text('xy_export'), "xy-grid.png", config.get_text('file_filter_sheet')
+        )
+        if save_path:
+            self.write_image(save_path)
+
+    def write_image(self, save_path):
+        """Start rendering the current matrix to save_path in the background"""
+        self.exporter = XYSheetExporter(save_path, self.model.matrix, self.thumb_size, self.colors,
+                                        config.get('decode_workers'))
+        self.exporter.progress.connect(self.on_export_progress)
+        self.exporter.finished.connect(self.on_exported)
+        self.exporter.start()
+
+    def on_export_progress(self, exporter, done, total):
+        if exporter is self.exporter:
+            self.status_label.setText(f"{config.get_text('xy_rendering')}: {done}/{total}")
+
+    def on_exported(self, exporter, error):
+        if exporter is not self.exporter:
+            return
+        self.exporter = None
+        if error:
+            self.status_label.setText(f"{config.get_text('xy_export_error')}: {error}")
+        else:
+            self.status_label.setText(f"{config.get_text('xy_exported')}: {os.path.basename(exporter.path)}")
+
+    def done(self, result):
+        if self.builder is not None:
+            self.builder.cancel()
+        if self.model is not None:
+            self.model.release_all()
+        super().done(result)